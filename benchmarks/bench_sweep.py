@@ -0,0 +1,271 @@
+# Package/Modules
+import argparse
+import logging
+import os
+import resource
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Union
+
+# Local Package/Modules
+from stand_in import StandInServers, generate_certificates
+
+__author__ = "IncognitoCoding"
+__copyright__ = "Copyright 2023, bench_sweep"
+__credits__ = ["IncognitoCoding"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "IncognitoCoding"
+__status__ = "Beta"
+
+MODES = ("ssl_pull", "get_url_certificate_info", "cert_check")
+
+
+def _percentile(samples: list[float], percent: float) -> float:
+    """Gets the nearest-rank percentile of the samples."""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, max(0, round(percent / 100 * len(ordered)) - 1))]
+
+
+def _summarize(latencies: list[float]) -> Union[dict, None]:
+    """Gets the p50, p99, and mean of the per-host latencies."""
+    if not latencies:
+        return None
+    return {
+        "p50": _percentile(latencies, 50),
+        "p99": _percentile(latencies, 99),
+        "mean": statistics.fmean(latencies),
+    }
+
+
+def _histogram_percentile(buckets: tuple[float, ...], counts: list[int], percent: float) -> float:
+    """Estimates a percentile from histogram bucket counts by interpolating inside the bucket that holds the rank."""
+    rank = percent / 100 * sum(counts)
+    seen = 0
+    for index, count in enumerate(counts):
+        if count and seen + count >= rank:
+            # Samples past the last bucket are reported at the last bucket bound.
+            if index == len(buckets):
+                return buckets[-1]
+            lower = buckets[index - 1] if index else 0.0
+            return lower + (buckets[index] - lower) * (rank - seen) / count
+        seen += count
+    return 0.0
+
+
+def _measure(run: Callable[[], tuple[int, Union[dict, None]]]) -> dict:
+    """Runs one benchmark mode and measures the wall time and the peak traced memory."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    failures, latency_summary = run()
+    elapsed = time.perf_counter() - start
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"elapsed": elapsed, "failures": failures, "latency_summary": latency_summary, "peak_memory": peak_memory}
+
+
+def _run_per_host(call: Callable[[str], object], addresses: list[str]) -> tuple[int, Union[dict, None]]:
+    """Calls a single-host check for every address in order and times each call."""
+    failures = 0
+    latencies: list[float] = []
+    for address in addresses:
+        start = time.perf_counter()
+        try:
+            call(address)
+        except Exception:
+            failures += 1
+        latencies.append(time.perf_counter() - start)
+    return failures, _summarize(latencies)
+
+
+def _run_cert_check(addresses: list[str], smtp_port: int, args: argparse.Namespace) -> tuple[int, Union[dict, None]]:
+    """Runs one full single-run sweep. Alerts are sent as one digest to the local SMTP sink."""
+    from certmonitor.check.check import cert_check
+    from certmonitor.dataclasses.common import (
+        AlertSettings,
+        ApiSettings,
+        EmailSettings,
+        FileSettings,
+        InventorySettings,
+        MetricsSettings,
+        RetrySettings,
+        ScanSettings,
+        StartupSettings,
+        StoreSettings,
+    )
+    from certmonitor.metrics.registry import metrics
+
+    startup_settings = StartupSettings(
+        continuous_monitoring=False,
+        monitor_sleep=86400,
+        email_alerts=True,
+        alert_program_errors=False,
+        buffer_days=args.buffer_days,
+        time_zome="UTC",
+        site_urls=addresses,
+        email_settings=EmailSettings(
+            smtp=f"127.0.0.1:{smtp_port}",
+            authentication_required=False,
+            use_tls=False,
+            username="",
+            password="",
+            from_email="benchmark@localhost",
+            to_email="benchmark@localhost",
+        ),
+        scan_settings=ScanSettings(
+            concurrency=args.concurrency,
+            workers=args.workers,
+            dns_timeout=args.timeout,
+            connect_timeout=args.timeout,
+            handshake_timeout=args.timeout,
+            read_timeout=args.timeout,
+            sweep_deadline=0,
+            probe_mode=args.probe_mode,
+            session_cache=False,
+            session_max_age=3600,
+            dns_cache_ttl=0,
+            ip_rate=0,
+            ip_burst=1,
+            network_rate=args.network_rate,
+            network_burst=max(int(args.network_rate), 1),
+            domain_rate=0,
+            domain_burst=1,
+        ),
+        store_settings=StoreSettings(enabled=False, path="", recheck_after=0, skip_margin_days=0),
+        alert_settings=AlertSettings(
+            digest=True, digest_max_entries=500, dedupe=False, renotify_interval=0, state_path=""
+        ),
+        metrics_settings=MetricsSettings(enabled=False, host="127.0.0.1", port=0),
+        file_settings=FileSettings(
+            paths=[], extensions=[], workers=1, index_path="", pkcs12_password="", report_count=1
+        ),
+        # Every sweep checks every address, so the measured work does not depend on earlier runs.
+        retry_settings=RetrySettings(enabled=False, failure_threshold=1, base_delay=1, max_delay=1, state_path=""),
+        inventory_settings=InventorySettings(paths=[], csv_column="site_url", chunk_size=1, interval=0),
+        api_settings=ApiSettings(enabled=False, host="127.0.0.1", port=0, socket_path=""),
+    )
+    # The per-host latencies and outcomes are read from the metrics, which include the worker processes.
+    metrics.reset()
+    cert_check(startup_settings)
+    recorded = metrics.snapshot()
+    failures = sum(
+        int(value)
+        for (name, labels), value in recorded["counters"].items()
+        if name == "certmonitor_host_checks_total" and dict(labels)["outcome"] not in ("ok", "cached")
+    )
+    histogram = recorded["histograms"].get(("certmonitor_host_check_seconds", ()))
+    if histogram is None:
+        return failures, None
+    buckets, counts, total, count = histogram
+    return failures, {
+        "p50": _histogram_percentile(buckets, counts, 50),
+        "p99": _histogram_percentile(buckets, counts, 99),
+        "mean": total / count,
+    }
+
+
+def _report(mode: str, host_count: int, result: dict) -> None:
+    """Prints the benchmark results for one mode."""
+    latency_summary: Union[dict, None] = result["latency_summary"]
+    line = (
+        f"{mode:<26} hosts={host_count:<6} failures={result['failures']:<5} "
+        f"elapsed={result['elapsed']:.3f}s hosts/s={host_count / result['elapsed']:.1f} "
+    )
+    if latency_summary:
+        line += (
+            f"p50={latency_summary['p50'] * 1000:.1f}ms p99={latency_summary['p99'] * 1000:.1f}ms "
+            f"mean={latency_summary['mean'] * 1000:.1f}ms "
+        )
+    line += f"peak_traced={result['peak_memory'] / 1024 / 1024:.1f}MiB"
+    print(line)
+
+
+def main(argv: Union[list[str], None] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Measures CertMonitor sweep throughput against local stand-in TLS listeners. No network access is used."
+    )
+    parser.add_argument("--hosts", type=int, default=200, help="Number of stand-in TLS listeners.")
+    parser.add_argument(
+        "--expiry-days",
+        default="5,20,365",
+        help="Comma separated days until the served certificates expire. Hosts are assigned round-robin. "
+        "Expired certificates fail verification and are reported as expired alerts. Negative days serve expired certificates.",
+    )
+    parser.add_argument("--latency-ms", type=float, default=0, help="Milliseconds added before every TLS handshake.")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="Maximum random milliseconds added to the latency.")
+    parser.add_argument(
+        "--failure-rate", type=float, default=0, help="Share of connections dropped before the handshake (0.0-1.0)."
+    )
+    parser.add_argument("--modes", default=",".join(MODES), help=f"Comma separated modes to run: {', '.join(MODES)}.")
+    parser.add_argument("--concurrency", type=int, default=100, help="cert_check scan concurrency.")
+    parser.add_argument("--workers", type=int, default=1, help="cert_check worker processes. 0 uses one per CPU core.")
+    parser.add_argument(
+        "--network-rate",
+        type=float,
+        default=0,
+        help="cert_check new connections per second to each /24 network. The listeners share one /24 per 256 hosts. 0 disables the limit.",
+    )
+    parser.add_argument(
+        "--probe-mode",
+        action="store_true",
+        help="cert_check fetches the chains with handshake-only probes and verifies them in batch after the sweep.",
+    )
+    parser.add_argument("--timeout", type=float, default=10, help="cert_check per-phase timeout in seconds.")
+    parser.add_argument("--buffer-days", type=int, default=45, help="Buffer days before certificate warnings start.")
+    parser.add_argument(
+        "--cert-dir", default=None, help="Directory for the generated certificates. Defaults to a temp dir."
+    )
+    parser.add_argument("--log-level", default="CRITICAL", help="CertMonitor log level while the benchmark runs.")
+    args = parser.parse_args(argv)
+
+    modes = [mode.strip() for mode in args.modes.split(",") if mode.strip()]
+    for mode in modes:
+        if mode not in MODES:
+            parser.error(f"Unknown mode '{mode}'. Choose from {', '.join(MODES)}.")
+    expiration_days = [int(days) for days in args.expiry_days.split(",")]
+
+    logging.basicConfig(level=args.log_level.upper(), format="%(levelname)s %(name)s %(message)s")
+
+    cert_directory = args.cert_dir or tempfile.mkdtemp(prefix="certmonitor-benchmark-")
+    print(f"Generating {args.hosts} stand-in certificate assignment(s) in '{cert_directory}'")
+    ca_cert, hosts = generate_certificates(cert_directory, expiration_days, args.hosts)
+    # The scanner trusts the benchmark CA through the default verify paths. Worker processes inherit the variable.
+    os.environ["SSL_CERT_FILE"] = ca_cert
+    addresses = [host.address for host in hosts]
+
+    # Imported after SSL_CERT_FILE is set, so the shared SSL context trusts the benchmark CA.
+    from certmonitor.check.check import get_url_certificate_info, ssl_pull
+
+    with StandInServers(
+        hosts=hosts,
+        key_path=os.path.join(cert_directory, "leaf.key"),
+        latency=args.latency_ms / 1000,
+        jitter=args.jitter_ms / 1000,
+        failure_rate=args.failure_rate,
+    ) as servers:
+        print(
+            f"Serving {len(hosts)} listener(s). latency={args.latency_ms}ms jitter={args.jitter_ms}ms "
+            f"failure_rate={args.failure_rate}"
+        )
+        for mode in modes:
+            if mode == "ssl_pull":
+                result = _measure(lambda: _run_per_host(ssl_pull, addresses))
+            elif mode == "get_url_certificate_info":
+                result = _measure(
+                    lambda: _run_per_host(
+                        lambda address: get_url_certificate_info(address, args.buffer_days, "UTC"), addresses
+                    )
+                )
+            else:
+                result = _measure(lambda: _run_cert_check(addresses, servers.smtp_port, args))
+            _report(mode, len(addresses), result)
+
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"Peak resident memory of the benchmark process: {max_rss / 1024:.1f}MiB")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
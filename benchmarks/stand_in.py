@@ -0,0 +1,343 @@
+# Package/Modules
+import asyncio
+import ipaddress
+import logging
+import multiprocessing
+import os
+import random
+import ssl
+import subprocess
+import time
+from dataclasses import dataclass
+from typing import Union
+
+__author__ = "IncognitoCoding"
+__copyright__ = "Copyright 2023, stand_in"
+__credits__ = ["IncognitoCoding"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "IncognitoCoding"
+__status__ = "Beta"
+
+# The loopback network used for the stand-in listeners. Linux routes all of 127.0.0.0/8 to the loopback interface.
+# The range starts away from 127.0.0.1, so local services are not hit.
+LISTENER_NETWORK_START = ipaddress.IPv4Address("127.77.0.1")
+# The scanner always connects to port 443.
+LISTENER_PORT = 443
+# Maximum number of IP addresses listed in the subject alternative name of one generated certificate.
+ADDRESSES_PER_CERTIFICATE = 64
+
+_CA_CONFIG = """
+[ca]
+default_ca = benchmark_ca
+
+[benchmark_ca]
+database = {directory}/index.txt
+new_certs_dir = {directory}
+serial = {directory}/serial
+default_md = sha256
+policy = policy_any
+unique_subject = no
+copy_extensions = none
+
+[policy_any]
+commonName = supplied
+"""
+
+
+@dataclass
+class StandInHost(object):
+    """A stand-in TLS listener.
+
+    Parameters
+    ----------
+    address : str
+        `summary`: The loopback IP address the listener is bound to.
+    expiration_days : int
+        `summary`: The days until the served certificate expires. Negative days serve an expired certificate.
+    cert_path : str
+        `summary`: The PEM certificate the listener serves.
+    """
+
+    __slots__ = "address", "expiration_days", "cert_path"
+
+    address: str
+    expiration_days: int
+    cert_path: str
+
+
+def _openssl(*args: str) -> None:
+    """Runs an openssl command and raises the openssl output on failure."""
+    result = subprocess.run(["openssl", *args], capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"openssl {args[0]} failed: {result.stderr.strip()}")
+
+
+def _openssl_time(epoch: float) -> str:
+    """Formats epoch seconds in the openssl ca date format."""
+    return time.strftime("%Y%m%d%H%M%SZ", time.gmtime(epoch))
+
+
+def generate_certificates(directory: str, expiration_days: list[int], host_count: int) -> tuple[str, list[StandInHost]]:
+    """Generates a benchmark CA and the stand-in certificates with the chosen expiration days.
+
+    The openssl command line tool is used, so no extra Python packages are needed. Hosts are assigned the expiration
+    days round-robin. Each certificate lists up to ADDRESSES_PER_CERTIFICATE listener addresses.
+
+    Parameters
+    ----------
+    directory : str
+        `summary`: The directory the keys and certificates are written to.
+    expiration_days : list[int]
+        `summary`: The days until expiration handed out to the hosts. Negative days create expired certificates.
+    host_count : int
+        `summary`: The number of stand-in hosts.
+
+    Returns
+    -------
+    tuple[str, list[StandInHost]]
+        `summary`: The CA certificate path and the stand-in hosts.
+    """
+    logger = logging.getLogger(__name__)
+
+    os.makedirs(directory, exist_ok=True)
+    ca_key = os.path.join(directory, "ca.key")
+    ca_cert = os.path.join(directory, "ca.pem")
+    leaf_key = os.path.join(directory, "leaf.key")
+    leaf_csr = os.path.join(directory, "leaf.csr")
+    config_path = os.path.join(directory, "ca.cnf")
+
+    # Creates the benchmark CA. The scanner trusts it through SSL_CERT_FILE.
+    _openssl(
+        "req",
+        "-x509",
+        "-newkey",
+        "rsa:2048",
+        "-nodes",
+        "-keyout",
+        ca_key,
+        "-out",
+        ca_cert,
+        "-days",
+        "3650",
+        "-subj",
+        "/CN=CertMonitor Benchmark CA",
+    )
+    # One leaf key is shared by every stand-in certificate. Only the dates and addresses differ.
+    _openssl(
+        "req",
+        "-newkey",
+        "rsa:2048",
+        "-nodes",
+        "-keyout",
+        leaf_key,
+        "-out",
+        leaf_csr,
+        "-subj",
+        "/CN=certmonitor-benchmark",
+    )
+    with open(config_path, "w") as config_file:
+        config_file.write(_CA_CONFIG.format(directory=directory))
+    with open(os.path.join(directory, "index.txt"), "w"):
+        pass
+    with open(os.path.join(directory, "serial"), "w") as serial_file:
+        serial_file.write("1000\n")
+
+    # Groups the hosts by expiration days, so hosts with the same dates share a certificate.
+    grouped_addresses: dict[int, list[str]] = {}
+    for index in range(host_count):
+        address = str(LISTENER_NETWORK_START + index)
+        grouped_addresses.setdefault(expiration_days[index % len(expiration_days)], []).append(address)
+
+    now = time.time()
+    hosts: list[StandInHost] = []
+    for days, addresses in grouped_addresses.items():
+        not_after = now + days * 86400
+        # Expired certificates start one year before they expire. Valid certificates started yesterday.
+        not_before = min(now - 86400, not_after - 365 * 86400)
+        for index in range(0, len(addresses), ADDRESSES_PER_CERTIFICATE):
+            chunk = addresses[index : index + ADDRESSES_PER_CERTIFICATE]
+            cert_path = os.path.join(directory, f"leaf_{days}_{index}.pem")
+            extension_path = os.path.join(directory, f"leaf_{days}_{index}.ext")
+            with open(extension_path, "w") as extension_file:
+                extension_file.write("subjectAltName = " + ",".join(f"IP:{address}" for address in chunk) + "\n")
+            _openssl(
+                "ca",
+                "-batch",
+                "-config",
+                config_path,
+                "-in",
+                leaf_csr,
+                "-out",
+                cert_path,
+                "-notext",
+                "-cert",
+                ca_cert,
+                "-keyfile",
+                ca_key,
+                "-extfile",
+                extension_path,
+                "-startdate",
+                _openssl_time(not_before),
+                "-enddate",
+                _openssl_time(not_after),
+            )
+            hosts.extend(StandInHost(address=address, expiration_days=days, cert_path=cert_path) for address in chunk)
+    logger.debug(f"Generated certificates for {len(hosts)} stand-in host(s) in '{directory}'")
+    return ca_cert, hosts
+
+
+class _StandInProtocol(asyncio.Protocol):
+    """Serves one stand-in connection with the injected handshake latency or failure.
+
+    Reading is paused as soon as the connection is made, so the ClientHello stays in the socket until the TLS layer
+    is started after the latency.
+    """
+
+    def __init__(self, context: ssl.SSLContext, latency: float, jitter: float, failure_rate: float) -> None:
+        self._context = context
+        self._latency = latency
+        self._jitter = jitter
+        self._failure_rate = failure_rate
+        self._task: Union[asyncio.Task, None] = None
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        # The TLS layer calls connection_made again with the TLS transport once the handshake completes.
+        if self._task is not None:
+            return
+        transport.pause_reading()  # type: ignore
+        self._task = asyncio.ensure_future(self._start_tls(transport))
+
+    async def _start_tls(self, transport: asyncio.BaseTransport) -> None:
+        delay = self._latency + random.uniform(0, self._jitter)
+        if delay:
+            await asyncio.sleep(delay)
+        if random.random() < self._failure_rate:
+            # Drops the connection before the handshake, the same as a server that resets the connection.
+            transport.abort()  # type: ignore
+            return
+        try:
+            await asyncio.get_running_loop().start_tls(transport, self, self._context, server_side=True)  # type: ignore
+        except (ConnectionError, ssl.SSLError, OSError):
+            transport.abort()  # type: ignore
+
+    def data_received(self, data: bytes) -> None:
+        pass
+
+
+async def _handle_smtp(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """Accepts and discards the alert emails, so cert_check never reaches a real mail server."""
+    try:
+        writer.write(b"220 certmonitor-benchmark ESMTP\r\n")
+        in_data = False
+        while line := await reader.readline():
+            if in_data:
+                if line in (b".\r\n", b".\n"):
+                    in_data = False
+                    writer.write(b"250 OK\r\n")
+            elif line[:4].upper() == b"DATA":
+                in_data = True
+                writer.write(b"354 End data with <CR><LF>.<CR><LF>\r\n")
+            elif line[:4].upper() == b"QUIT":
+                writer.write(b"221 Bye\r\n")
+                break
+            elif line[:4].upper() == b"EHLO":
+                writer.write(b"250-certmonitor-benchmark\r\n250 8BITMIME\r\n")
+            else:
+                writer.write(b"250 OK\r\n")
+            await writer.drain()
+        await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def _serve(
+    hosts: list[StandInHost],
+    key_path: str,
+    latency: float,
+    jitter: float,
+    failure_rate: float,
+    ready: multiprocessing.Queue,
+) -> None:
+    """Starts every stand-in listener and the SMTP sink, then serves until the process is stopped."""
+    contexts: dict[str, ssl.SSLContext] = {}
+    servers = []
+    for host in hosts:
+        if host.cert_path not in contexts:
+            context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+            context.load_cert_chain(host.cert_path, key_path)
+            contexts[host.cert_path] = context
+        context = contexts[host.cert_path]
+        servers.append(
+            await asyncio.get_running_loop().create_server(
+                lambda context=context: _StandInProtocol(context, latency, jitter, failure_rate),
+                host=host.address,
+                port=LISTENER_PORT,
+                backlog=1024,
+            )
+        )
+    smtp_server = await asyncio.start_server(_handle_smtp, host="127.0.0.1", port=0)
+    ready.put(smtp_server.sockets[0].getsockname()[1])
+    await asyncio.Event().wait()
+
+
+def _run_servers(
+    hosts: list[StandInHost],
+    key_path: str,
+    latency: float,
+    jitter: float,
+    failure_rate: float,
+    ready: multiprocessing.Queue,
+) -> None:
+    """Runs the stand-in listeners in their own process, so the server work is not measured with the scanner."""
+    try:
+        asyncio.run(_serve(hosts, key_path, latency, jitter, failure_rate, ready))
+    except Exception as exc:
+        ready.put(exc)
+
+
+class StandInServers(object):
+    """Runs the stand-in TLS listeners and the SMTP sink in a child process.
+
+    Binding port 443 needs root or the CAP_NET_BIND_SERVICE capability. On Linux, lowering
+    net.ipv4.ip_unprivileged_port_start also works.
+
+    Parameters
+    ----------
+    hosts : list[StandInHost]
+        `summary`: The stand-in hosts to serve.
+    key_path : str
+        `summary`: The private key shared by the stand-in certificates.
+    latency : float
+        `summary`: Seconds added before every TLS handshake.
+    jitter : float
+        `summary`: Maximum random seconds added on top of the latency.
+    failure_rate : float
+        `summary`: The share of connections that are dropped before the handshake. 0.0 to 1.0.
+    """
+
+    def __init__(
+        self, hosts: list[StandInHost], key_path: str, latency: float, jitter: float, failure_rate: float
+    ) -> None:
+        self._ready: multiprocessing.Queue = multiprocessing.Queue()
+        self._process = multiprocessing.Process(
+            target=_run_servers,
+            args=(hosts, key_path, latency, jitter, failure_rate, self._ready),
+            daemon=True,
+        )
+        self.smtp_port: Union[int, None] = None
+
+    def __enter__(self) -> "StandInServers":
+        self._process.start()
+        ready = self._ready.get(timeout=120)
+        if isinstance(ready, Exception):
+            self._process.join()
+            raise RuntimeError(f"The stand-in listeners failed to start: {ready}")
+        self.smtp_port = ready
+        return self
+
+    def __exit__(self, *args) -> None:
+        self._process.terminate()
+        self._process.join()
@@ -0,0 +1,203 @@
+# Package/Modules
+import json
+import logging
+import os
+import socketserver
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Union
+from urllib.parse import parse_qs, urlsplit
+
+# Exceptions
+from fexception import FCustomException
+
+# Local Package/Modules
+from certmonitor.check.ondemand import OnDemandQueue
+from certmonitor.store.records import build_record
+from certmonitor.store.snapshot import ResultSnapshot
+
+# Local Exceptions
+from certmonitor.exceptions.exceptions import CertMonitorError
+
+__author__ = "IncognitoCoding"
+__copyright__ = "Copyright 2023, server"
+__credits__ = ["IncognitoCoding"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "IncognitoCoding"
+__status__ = "Beta"
+
+# The seconds an on-demand check waits for its result when the request does not set the wait.
+DEFAULT_WAIT_SECONDS = 30
+# The most seconds an on-demand check can hold the request open.
+MAX_WAIT_SECONDS = 300
+
+
+class _APIHTTPServer(ThreadingHTTPServer):
+    """Serves the API over TCP."""
+
+    daemon_threads = True
+    snapshot: ResultSnapshot
+    on_demand: OnDemandQueue
+
+
+# Unix sockets are not available on Windows, so the Unix socket server is only defined where they are.
+if hasattr(socketserver, "UnixStreamServer"):
+
+    class _APIUnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):  # type: ignore
+        """Serves the API over a Unix socket. The socket file is removed when the server is closed."""
+
+        daemon_threads = True
+        snapshot: ResultSnapshot
+        on_demand: OnDemandQueue
+
+        def server_close(self) -> None:
+            super().server_close()
+            try:
+                os.remove(self.server_address)  # type: ignore
+            except OSError:
+                pass
+
+
+class _APIHandler(BaseHTTPRequestHandler):
+    """Serves the latest results from the snapshot and queues on-demand checks.
+
+    GET /results returns the result count by severity. GET /results?site_url=<url> returns the latest record of one
+    URL, and GET /results?expiring_days=<days> adds the records that expire within the days. POST /check?site_url=<url>
+    checks a URL ahead of its schedule and returns the new record, or 202 when the check takes longer than the wait.
+    """
+
+    server: Union[_APIHTTPServer, "_APIUnixServer"]
+
+    def _send_json(self, status: int, body: dict) -> None:
+        encoded_body = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(encoded_body)))
+        self.end_headers()
+        self.wfile.write(encoded_body)
+
+    def _get_query(self) -> tuple[str, dict[str, str]]:
+        """Splits the request path into the path and the last value of each query parameter."""
+        url_parts = urlsplit(self.path)
+        return url_parts.path.rstrip("/") or "/", {key: values[-1] for key, values in parse_qs(url_parts.query).items()}
+
+    def do_GET(self) -> None:
+        path, query = self._get_query()
+        if path not in ("/results", "/"):
+            self._send_json(404, {"error": f"Unknown path '{path}'. Use /results or POST /check."})
+            return
+        snapshot = self.server.snapshot
+        site_url = query.get("site_url")
+        if site_url:
+            scan_result = snapshot.get(site_url)
+            if scan_result is None:
+                self._send_json(404, {"error": f"No result is cached for '{site_url}'."})
+            else:
+                self._send_json(200, build_record(scan_result))
+            return
+        body: dict = {"results": len(snapshot), "severities": snapshot.count_by_severity()}
+        if "expiring_days" in query:
+            try:
+                expiring_days = float(query["expiring_days"])
+            except ValueError:
+                self._send_json(400, {"error": "The expiring_days value must be a number."})
+                return
+            body["expiring"] = [
+                build_record(scan_result)
+                for scan_result in map(snapshot.get, snapshot.get_expiring(time.time() + expiring_days * 86400))
+                if scan_result is not None
+            ]
+        self._send_json(200, body)
+
+    def do_POST(self) -> None:
+        path, query = self._get_query()
+        if path != "/check":
+            self._send_json(404, {"error": f"Unknown path '{path}'. Use POST /check?site_url=<url>."})
+            return
+        site_url = query.get("site_url")
+        if not site_url:
+            self._send_json(400, {"error": "The site_url parameter is required."})
+            return
+        try:
+            wait = min(max(float(query.get("wait", DEFAULT_WAIT_SECONDS)), 0), MAX_WAIT_SECONDS)
+        except ValueError:
+            self._send_json(400, {"error": "The wait value must be a number of seconds."})
+            return
+        on_demand = self.server.on_demand
+        ticket = on_demand.request(site_url)
+        completed, scan_result = on_demand.wait_for(site_url, ticket, wait)
+        if not completed:
+            self._send_json(202, {"status": "queued", "site_url": site_url})
+        elif scan_result is None:
+            self._send_json(404, {"error": f"'{site_url}' is not in the site_urls of the YAML file."})
+        else:
+            self._send_json(200, build_record(scan_result))
+
+    def address_string(self) -> str:
+        # Unix socket clients do not have an address.
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "unix socket"
+
+    def log_message(self, format: str, *args) -> None:
+        logging.getLogger(__name__).debug(f"API request from {self.address_string()}: {format % args}")
+
+
+def start_api_server(
+    host: str, port: int, socket_path: str, snapshot: ResultSnapshot, on_demand: OnDemandQueue
+) -> Union[_APIHTTPServer, "_APIUnixServer"]:
+    """Starts the local API in a daemon thread.
+
+    Parameters
+    ----------
+    host : str
+        `summary`: The address the API listens on. Not used when the socket path is set.
+    port : int
+        `summary`: The port the API listens on. Not used when the socket path is set.
+    socket_path : str
+        `summary`: The Unix socket file the API listens on instead of TCP. TCP is used when empty.
+    snapshot : ResultSnapshot
+        `summary`: The snapshot that holds the latest results.
+    on_demand : OnDemandQueue
+        `summary`: The queue that passes on-demand checks to the sweep loop.
+
+    Returns
+    -------
+    Union[_APIHTTPServer, _APIUnixServer]
+        `summary`: The running API server. Call shutdown() and server_close() to stop it.
+
+    Raises
+    ------
+    CertMonitorError : fexception
+        `summary`: The API could not be started.
+    """
+    logger = logging.getLogger(__name__)
+
+    server: Union[_APIHTTPServer, "_APIUnixServer"]
+    try:
+        if socket_path:
+            if not hasattr(socketserver, "UnixStreamServer"):
+                raise OSError("Unix sockets are not supported on this platform")
+            # Removes the socket file left by a process that did not stop cleanly.
+            if os.path.exists(socket_path):
+                os.remove(socket_path)
+            server = _APIUnixServer(socket_path, _APIHandler)
+            # Limits the socket to the owner and group, so other local users cannot queue checks.
+            os.chmod(socket_path, 0o660)
+            address = f"unix:{socket_path}"
+        else:
+            server = _APIHTTPServer((host, port), _APIHandler)
+            address = f"http://{host}:{server.server_address[1]}"
+    except OSError as exc:
+        exc_args = {
+            "main_message": f"The API could not be started on {socket_path or f'{host}:{port}'}.",
+            "custom_type": CertMonitorError,
+            "returned_result": {exc},
+            "suggested_resolution": "Please verify the 'host', 'port', and 'socket_path' values in the 'api' section of the YAML file.",
+        }
+        raise CertMonitorError(FCustomException(message_args=exc_args))
+    server.snapshot = snapshot
+    server.on_demand = on_demand
+    threading.Thread(target=server.serve_forever, name="certmonitor-api", daemon=True).start()
+    logger.info(f"Serving the API on {address}")
+    return server
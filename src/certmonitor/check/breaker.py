@@ -0,0 +1,222 @@
+# Package/Modules
+import logging
+import os
+import sqlite3
+from typing import Union
+
+# Exceptions
+from fexception import FCustomException
+
+# Local Dataclasses
+from certmonitor.dataclasses.common import RetrySettings
+
+# Local Exceptions
+from certmonitor.exceptions.exceptions import CertMonitorError
+
+__author__ = "IncognitoCoding"
+__copyright__ = "Copyright 2023, breaker"
+__credits__ = ["IncognitoCoding"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "IncognitoCoding"
+__status__ = "Beta"
+
+_CREATE_TABLE = """
+CREATE TABLE IF NOT EXISTS host_failures (
+    site_url TEXT PRIMARY KEY,
+    failures INTEGER NOT NULL,
+    opened_at REAL,
+    next_retry REAL NOT NULL,
+    last_error TEXT
+)
+"""
+
+
+class CircuitBreaker(object):
+    """Tracks the failed checks of each site URL in a local SQLite database and backs off sites that keep failing.
+
+    Each failure in a row doubles the delay before the next retry, up to the max delay. After the failure threshold,
+    the circuit opens. Open sites are not checked until a cheap connection probe succeeds, and only the change to
+    open and the recovery are reported, so a dead site sends one alert instead of one per loop.
+
+    The state survives restarts, so one-shot runs back off the same as continuous monitoring. Changes are kept in
+    memory and written when the breaker is closed.
+
+    Parameters
+    ----------
+    retry_settings : RetrySettings
+        `summary`: The retry and circuit breaker settings.
+
+    Raises
+    ------
+    CertMonitorError : fexception
+        `summary`: The host failure state could not be opened.
+    """
+
+    def __init__(self, retry_settings: RetrySettings) -> None:
+        logger = logging.getLogger(__name__)
+
+        self._retry_settings = retry_settings
+        try:
+            parent_path = os.path.dirname(os.path.abspath(retry_settings.state_path))
+            if not os.path.exists(parent_path):
+                os.makedirs(parent_path)
+            self._connection = sqlite3.connect(retry_settings.state_path)
+            self._connection.execute(_CREATE_TABLE)
+            self._connection.commit()
+            # Only failing sites have an entry, so the state is loaded once and looked up in memory for the sweep.
+            self._failures: dict[str, tuple[int, Union[float, None], float, Union[str, None]]] = {
+                site_url: (failures, opened_at, next_retry, last_error)
+                for site_url, failures, opened_at, next_retry, last_error in self._connection.execute(
+                    "SELECT * FROM host_failures"
+                )
+            }
+        except Exception as exc:
+            exc_args = {
+                "main_message": f"The host failure state could not be opened at '{retry_settings.state_path}'.",
+                "custom_type": CertMonitorError,
+                "returned_result": {exc},
+                "suggested_resolution": "Please verify the 'state_path' value in the 'retry' section of the YAML file.",
+            }
+            raise CertMonitorError(FCustomException(message_args=exc_args))
+        self._changed: set[str] = set()
+        logger.debug(f"Opened the host failure state with {len(self._failures)} failing site(s)")
+
+    def __enter__(self) -> "CircuitBreaker":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Writes the changed site URLs and closes the SQLite connection."""
+        try:
+            with self._connection:
+                self._connection.executemany(
+                    "DELETE FROM host_failures WHERE site_url = ?",
+                    [(site_url,) for site_url in self._changed if site_url not in self._failures],
+                )
+                self._connection.executemany(
+                    "INSERT OR REPLACE INTO host_failures VALUES (?, ?, ?, ?, ?)",
+                    [(site_url, *self._failures[site_url]) for site_url in self._changed if site_url in self._failures],
+                )
+            self._changed.clear()
+        finally:
+            self._connection.close()
+
+    @property
+    def open_count(self) -> int:
+        """The number of site URLs with an open circuit."""
+        return sum(1 for _, opened_at, _, _ in self._failures.values() if opened_at is not None)
+
+    def get_failures(self, site_url: str) -> int:
+        """Gets the number of failed checks in a row for a site URL.
+
+        Parameters
+        ----------
+        site_url : str
+            `summary`: The site URL.
+
+        Returns
+        -------
+        int
+            `summary`: The failed checks in a row. 0 is returned for healthy sites.
+        """
+        entry = self._failures.get(site_url)
+        return entry[0] if entry else 0
+
+    def _get_delay(self, failures: int) -> int:
+        """Gets the backoff delay in seconds after the number of failures in a row."""
+        # Caps the exponent, so a site that failed for years cannot overflow the delay.
+        return min(self._retry_settings.base_delay * 2 ** min(failures - 1, 32), self._retry_settings.max_delay)
+
+    def split_due(self, site_urls: list[str], now: float) -> tuple[list[str], list[str], dict[str, float]]:
+        """Splits the due site URLs by what the circuit allows.
+
+        Parameters
+        ----------
+        site_urls : list[str]
+            `summary`: The site URLs that are due.
+        now : float
+            `summary`: The current epoch time.
+
+        Returns
+        -------
+        tuple[list[str], list[str], dict[str, float]]
+            `summary`: The site URLs to check, the open site URLs to probe, and the waiting site URLs with their retry time.
+        """
+        check_urls: list[str] = []
+        probe_urls: list[str] = []
+        waiting: dict[str, float] = {}
+        for site_url in site_urls:
+            entry = self._failures.get(site_url)
+            if entry is None:
+                check_urls.append(site_url)
+            elif entry[2] > now:
+                waiting[site_url] = entry[2]
+            elif entry[1] is not None:
+                probe_urls.append(site_url)
+            else:
+                check_urls.append(site_url)
+        return check_urls, probe_urls, waiting
+
+    def record_failure(self, site_url: str, error: str, now: float) -> tuple[bool, float]:
+        """Records a failed check or probe and sets the next retry time.
+
+        Parameters
+        ----------
+        site_url : str
+            `summary`: The site URL that failed.
+        error : str
+            `summary`: The failure message.
+        now : float
+            `summary`: The epoch time of the failure.
+
+        Returns
+        -------
+        tuple[bool, float]
+            `summary`: True when this failure opened the circuit, and the epoch time of the next retry.
+        """
+        failures, opened_at, _, _ = self._failures.get(site_url, (0, None, now, None))
+        failures += 1
+        opened = opened_at is None and failures >= self._retry_settings.failure_threshold
+        if opened:
+            opened_at = now
+        next_retry = now + self._get_delay(failures)
+        self._failures[site_url] = (failures, opened_at, next_retry, error)
+        self._changed.add(site_url)
+        return opened, next_retry
+
+    def record_success(self, site_url: str) -> Union[tuple[int, float], None]:
+        """Records a successful check and closes the circuit.
+
+        Parameters
+        ----------
+        site_url : str
+            `summary`: The site URL that was checked.
+
+        Returns
+        -------
+        Union[tuple[int, float], None]
+            `summary`: The failures in a row and the epoch time the circuit opened when an open circuit was closed. None is returned otherwise.
+        """
+        entry = self._failures.pop(site_url, None)
+        if entry is None:
+            return None
+        self._changed.add(site_url)
+        failures, opened_at, _, _ = entry
+        return (failures, opened_at) if opened_at is not None else None
+
+    def prune(self, site_urls: list[str]) -> None:
+        """Drops the failure state for site URLs that are no longer configured.
+
+        Parameters
+        ----------
+        site_urls : list[str]
+            `summary`: The configured site URLs.
+        """
+        configured = set(site_urls)
+        for site_url in [site_url for site_url in self._failures if site_url not in configured]:
+            del self._failures[site_url]
+            # Marks the site URL changed, so close() deletes its saved row.
+            self._changed.add(site_url)
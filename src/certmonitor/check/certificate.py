@@ -0,0 +1,236 @@
+# Package/Modules
+import logging
+import ssl
+import time
+from typing import Union
+
+# Exceptions
+from fexception import FCustomException
+
+# Local Dataclasses
+from certmonitor.dataclasses.common import SSLReturn, ExpirationMsg, Severity
+
+# Local Exceptions
+from certmonitor.exceptions.exceptions import CertMonitorError
+
+__author__ = "IncognitoCoding"
+__copyright__ = "Copyright 2023, certificate"
+__credits__ = ["IncognitoCoding"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "IncognitoCoding"
+__status__ = "Beta"
+
+# Running time zones supported in the settings file. Certificate dates are always compared in UTC.
+SUPPORTED_TIME_ZONES = frozenset({"CST", "UTC", "EST", "MST", "PST"})
+# Seconds in one day.
+SECONDS_IN_DAY = 86400
+
+
+def build_ssl_return(raw_ssl_info: dict) -> Union[SSLReturn, None]:
+    """Converts the raw peer certificate dictionary into the SSL return dataclass.
+
+    Parameters
+    ----------
+    raw_ssl_info : dict
+        `summary`: The peer certificate dictionary returned from getpeercert().
+
+    Returns
+    -------
+    Union[SSLReturn, None]
+        `summary`: The SSL certificate return information. None is returned if no certificate information exists.
+    """
+    if not raw_ssl_info:
+        return None
+
+    return SSLReturn(
+        subject=raw_ssl_info.get("subject"),
+        issuer=raw_ssl_info.get("issuer"),
+        version=raw_ssl_info.get("version"),
+        notBefore=raw_ssl_info.get("notBefore"),
+        notAfter=raw_ssl_info.get("notAfter"),
+        subjectAltName=raw_ssl_info.get("subjectAltName"),
+        ocsp=raw_ssl_info.get("OCSP"),
+        caIssuers=raw_ssl_info.get("caIssuers"),
+        crlDistributionPoints=raw_ssl_info.get("crlDistributionPoints"),
+    )
+
+
+def _validate_time_zone(time_zone: str) -> None:
+    """Validates the running time zone.
+
+    Raises
+    ------
+    ValueError : fexception
+        `summary`: An incorrect time zone format was sent.
+    """
+    if time_zone.upper() not in SUPPORTED_TIME_ZONES:
+        exc_args = {
+            "main_message": "An incorrect time zone format was sent.",
+            "custom_type": CertMonitorError,
+            "suggested_resolution": "Please verify you entered the correct timezone abbreviation. Currently supported timezones are CST, UTC, EST, MST, and PST.",
+        }
+        raise ValueError(FCustomException(message_args=exc_args))
+
+
+def _get_severity(expiration_days_away: int, buffer_days: int) -> Severity:
+    """Gets the severity for the days until the certificate expires."""
+    # Checks if the certificate expiration date has been met.
+    if expiration_days_away < 0:
+        return Severity.EXPIRED
+    # Checks if the expiration days away has reached the buffer alert days. The day it expires is always a warning.
+    elif expiration_days_away <= buffer_days or expiration_days_away == 0:
+        return Severity.WARNING
+    return Severity.INFO
+
+
+def evaluate_expiration_epochs(
+    site_urls: list[str],
+    not_after_epochs: list[float],
+    buffer_days: int,
+    time_zone: str,
+    now: Union[float, None] = None,
+) -> list[ExpirationMsg]:
+    """Calculates the expiration messages for many certificates from their expiration epoch seconds.
+
+    One shared current time is used for the whole batch, so every certificate is compared against the same moment.
+
+    Parameters
+    ----------
+    site_urls : list[str]
+        `summary`: The website URLs used in the status messages.
+    not_after_epochs : list[float]
+        `summary`: The certificate expiration as epoch seconds. The order matches the site URLs.
+    buffer_days : int
+        `summary`: Days to buffer certificate expiring before notifying.
+    time_zone : str
+        `summary`: Time zone the program is running.
+        `extra1`: time_zone = CST, UTC, EST, MST, or PST
+    now : Union[float, None], optional
+        `summary`: The current epoch time. The current system time is used when not set. Defaults to None.
+
+    Returns
+    -------
+    list[ExpirationMsg]
+        `summary`: The certificate expiration messages in the same order as the site URLs.
+
+    Raises
+    ------
+    ValueError : fexception
+        `summary`: An incorrect time zone format was sent.
+    """
+    logger = logging.getLogger(__name__)
+
+    _validate_time_zone(time_zone)
+
+    # The certificate dates are in UTC, so whole seconds since the epoch compare the same as the formatted dates did.
+    current_epoch = int(time.time() if now is None else now)
+    # Floors to whole days. Expired certificates count a partly passed day as a full day, the same as timedelta.days.
+    expiration_days = [(int(not_after_epoch) - current_epoch) // SECONDS_IN_DAY for not_after_epoch in not_after_epochs]
+    logger.debug(f"Calculated the expiration days for {len(expiration_days)} certificate(s)")
+
+    # Only the severity is set here. The message text is rendered when a log line or notification reads it.
+    return [
+        ExpirationMsg(
+            site_url=site_url,
+            severity=_get_severity(expiration_days_away, buffer_days),
+            expiration_days_away=expiration_days_away,
+        )
+        for site_url, expiration_days_away in zip(site_urls, expiration_days)
+    ]
+
+
+def evaluate_expirations(
+    site_urls: list[str],
+    ssl_outputs: list[Union[SSLReturn, None]],
+    buffer_days: int,
+    time_zone: str,
+    now: Union[float, None] = None,
+) -> list[ExpirationMsg]:
+    """Calculates the expiration messages for many certificates at once. No network connection is made.
+
+    Each notAfter date is converted to epoch seconds one time, and the days until expiration are calculated for the whole
+    batch with one shared current time.
+
+    Parameters
+    ----------
+    site_urls : list[str]
+        `summary`: The website URLs used in the status messages.
+    ssl_outputs : list[Union[SSLReturn, None]]
+        `summary`: The SSL certificate return information. The order matches the site URLs.
+    buffer_days : int
+        `summary`: Days to buffer certificate expiring before notifying.
+    time_zone : str
+        `summary`: Time zone the program is running.
+        `extra1`: time_zone = CST, UTC, EST, MST, or PST
+    now : Union[float, None], optional
+        `summary`: The current epoch time. The current system time is used when not set. Defaults to None.
+
+    Returns
+    -------
+    list[ExpirationMsg]
+        `summary`: The certificate expiration messages in the same order as the site URLs.
+
+    Raises
+    ------
+    ValueError : fexception
+        `summary`: Failed to get the certificate expiration date for URL '{site_url}'.
+    ValueError : fexception
+        `summary`: An incorrect time zone format was sent.
+    """
+    _validate_time_zone(time_zone)
+
+    not_after_epochs: list[float] = []
+    for site_url, ssl_output in zip(site_urls, ssl_outputs):
+        # Gets the raw certificate expiration date from the class.
+        if not ssl_output or not ssl_output.notAfter:
+            exc_args = {
+                "main_message": f"Failed to get the certificate expiration date for URL '{site_url}'.",
+                "custom_type": CertMonitorError,
+                "suggested_resolution": "Please report this error to the developer.",
+            }
+            raise ValueError(FCustomException(message_args=exc_args))
+        not_after_epochs.append(ssl.cert_time_to_seconds(str(ssl_output.notAfter)))
+
+    return evaluate_expiration_epochs(
+        site_urls=site_urls, not_after_epochs=not_after_epochs, buffer_days=buffer_days, time_zone=time_zone, now=now
+    )
+
+
+def get_certificate_expiration(
+    site_url: str, ssl_output: Union[SSLReturn, None], buffer_days: int, time_zone: str
+) -> ExpirationMsg:
+    """Calculates if the pulled certificate is expiring. Alerts are triggered based on the buffer_days.
+
+    Parameters
+    ----------
+    site_url :str
+        `summary`: A website URL.
+    ssl_output : Union[SSLReturn, None]
+        `summary`: The SSL certificate return information.
+    buffer_days : int
+        `summary`: Days to buffer certificate expiring before notifying.
+    time_zone : str
+        `summary`: Time zone the program is running. The time zone is used for cleaner logging. If your time zone is not listed, choose any and convert log output manually.
+        `extra1`: time_zone = CST, UTC, EST, MST, or PST
+
+    Returns
+    -------
+    ExpirationMsg
+        `summary`: The certificate expiration message
+
+    Raises
+    ------
+    ValueError : fexception
+        `summary`: Failed to get the certificate expiration date for URL '{site_url}'.
+    ValueError : fexception
+        `summary`: An incorrect time zone format was sent.
+    """
+    logger = logging.getLogger(__name__)
+
+    expiration_msg = evaluate_expirations(
+        site_urls=[site_url], ssl_outputs=[ssl_output], buffer_days=buffer_days, time_zone=time_zone
+    )[0]
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"Returning the expiration status message. Message = {expiration_msg.status_message}")
+    return expiration_msg
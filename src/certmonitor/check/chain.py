@@ -0,0 +1,156 @@
+# Package/Modules
+import hashlib
+import logging
+import ssl
+from collections import OrderedDict
+from typing import Union
+
+# Local Package/Modules
+from certmonitor.check.certificate import evaluate_expiration_epochs, get_certificate_expiration
+from certmonitor.files.der import parse_certificate
+from certmonitor.metrics.registry import metrics
+
+# Local Dataclasses
+from certmonitor.dataclasses.common import ExpirationMsg, SSLReturn
+
+__author__ = "IncognitoCoding"
+__copyright__ = "Copyright 2023, chain"
+__credits__ = ["IncognitoCoding"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "IncognitoCoding"
+__status__ = "Beta"
+
+# Maximum number of parsed chain certificates kept per process. Sites share a small set of intermediates, so the
+# least recently used certificate is rarely dropped.
+CHAIN_CACHE_SIZE = 2000
+
+# Parsed chain certificates keyed by the SHA-256 fingerprint of the DER encoded certificate.
+_chain_certificates: "OrderedDict[str, tuple[dict, float, str]]" = OrderedDict()
+
+
+def get_presented_chain(ssl_object: Union[ssl.SSLObject, ssl.SSLSocket]) -> list[bytes]:
+    """Gets the DER encoded certificates the site sent in the handshake, starting with the site certificate.
+
+    Python 3.13 added get_unverified_chain() to the SSL objects. Python 3.10 to 3.12 only have it on the internal
+    SSL object. Older versions return an empty list, so only the site certificate is checked.
+
+    Parameters
+    ----------
+    ssl_object : Union[ssl.SSLObject, ssl.SSLSocket]
+        `summary`: The SSL object after a completed handshake.
+
+    Returns
+    -------
+    list[bytes]
+        `summary`: The presented certificates in the order the site sent them.
+    """
+    get_chain = getattr(ssl_object, "get_unverified_chain", None)
+    if get_chain is not None:
+        return list(get_chain() or [])
+    get_chain = getattr(getattr(ssl_object, "_sslobj", None), "get_unverified_chain", None)
+    if get_chain is None:
+        return []
+    return [certificate.public_bytes(ssl._ssl.ENCODING_DER) for certificate in get_chain() or []]  # type: ignore
+
+
+def parse_chain(der_chain: list[bytes]) -> tuple[tuple[dict, float, str], ...]:
+    """Parses the certificates sent after the site certificate.
+
+    The certificates are cached by fingerprint, so an intermediate shared by thousands of sites is parsed once.
+    Certificates that cannot be parsed are skipped, so an unusual intermediate never fails the site check.
+
+    Parameters
+    ----------
+    der_chain : list[bytes]
+        `summary`: The presented certificates from get_presented_chain().
+
+    Returns
+    -------
+    tuple[tuple[dict, float, str], ...]
+        `summary`: The certificate in the getpeercert() dictionary format, the notAfter epoch, and the SHA-256 fingerprint of each chain certificate.
+    """
+    logger = logging.getLogger(__name__)
+
+    chain: list[tuple[dict, float, str]] = []
+    for der_certificate in der_chain[1:]:
+        fingerprint = hashlib.sha256(der_certificate).hexdigest()
+        parsed = _chain_certificates.get(fingerprint)
+        if parsed is not None:
+            _chain_certificates.move_to_end(fingerprint)
+            metrics.increment("certmonitor_chain_cache_total", result="hit")
+        else:
+            metrics.increment("certmonitor_chain_cache_total", result="miss")
+            try:
+                parsed = parse_certificate(der_certificate)
+            except ValueError as exc:
+                logger.debug(f"Skipping the chain certificate {fingerprint} that could not be parsed. {exc}")
+                continue
+            _chain_certificates[fingerprint] = parsed
+            if len(_chain_certificates) > CHAIN_CACHE_SIZE:
+                _chain_certificates.popitem(last=False)
+        chain.append(parsed)
+    return tuple(chain)
+
+
+def _get_common_name(certificate: dict, fingerprint: str) -> str:
+    """Gets the subject common name used to name a chain certificate in messages."""
+    for relative_name in certificate.get("subject", ()):
+        for attribute, value in relative_name:
+            if attribute == "commonName":
+                return value
+    return f"SHA-256 {fingerprint[:16]}"
+
+
+def evaluate_chain_expiration(
+    site_url: str,
+    ssl_output: Union[SSLReturn, None],
+    chain: tuple[tuple[dict, float, str], ...],
+    buffer_days: int,
+    time_zone: str,
+) -> tuple[ExpirationMsg, float]:
+    """Calculates the expiration of the site certificate and the chain presented with it.
+
+    The certificate that expires first is reported. A chain certificate that expires before the site certificate is
+    named in the message, such as "www.example.com (chain certificate 'Example CA')".
+
+    Parameters
+    ----------
+    site_url : str
+        `summary`: The site URL used in the status message.
+    ssl_output : Union[SSLReturn, None]
+        `summary`: The SSL certificate return information of the site certificate.
+    chain : tuple[tuple[dict, float, str], ...]
+        `summary`: The parsed chain certificates from parse_chain().
+    buffer_days : int
+        `summary`: Days to buffer certificate expiring before notifying.
+    time_zone : str
+        `summary`: Time zone the program is running.
+
+    Returns
+    -------
+    tuple[ExpirationMsg, float]
+        `summary`: The expiration message and the notAfter epoch of the certificate that expires first.
+
+    Raises
+    ------
+    ValueError : fexception
+        `summary`: Failed to get the certificate expiration date for URL '{site_url}'.
+    ValueError : fexception
+        `summary`: An incorrect time zone format was sent.
+    """
+    expiration_msg = get_certificate_expiration(
+        site_url=site_url, ssl_output=ssl_output, buffer_days=buffer_days, time_zone=time_zone
+    )
+    not_after_epoch = float(ssl.cert_time_to_seconds(str(ssl_output.notAfter)))  # type: ignore
+    if chain:
+        certificate, chain_not_after_epoch, fingerprint = min(chain, key=lambda item: item[1])
+        if chain_not_after_epoch < not_after_epoch:
+            not_after_epoch = chain_not_after_epoch
+            expiration_msg = evaluate_expiration_epochs(
+                site_urls=[f"{site_url} (chain certificate '{_get_common_name(certificate, fingerprint)}')"],
+                not_after_epochs=[chain_not_after_epoch],
+                buffer_days=buffer_days,
+                time_zone=time_zone,
+            )[0]
+    return expiration_msg, not_after_epoch
@@ -1,18 +1,39 @@
 # Package/Modules
-from dataclasses import asdict
 import logging
 import time
-import ssl
 import socket
 import datetime
-from typing import Union
-from ictoolkit.directors.email_director import send_email
+import itertools
+from typing import Iterator, Union
 
 # Exceptions
 from fexception import FCustomException
 
+# Local Package/Modules
+from certmonitor.check.breaker import CircuitBreaker
+from certmonitor.check.certificate import build_ssl_return
+from certmonitor.check.chain import evaluate_chain_expiration, get_presented_chain, parse_chain
+from certmonitor.check.context import get_ssl_context
+from certmonitor.check.inventory import iter_chunks, iter_inventories
+from certmonitor.check.ondemand import OnDemandQueue
+from certmonitor.check.pool import scan_sites_pooled
+from certmonitor.check.scan import probe_sites
+from certmonitor.check.scheduler import HostScheduler, get_check_interval, sleep_until
+from certmonitor.check.targets import parse_target
+from certmonitor.files.source import scan_certificate_files
+from certmonitor.metrics.registry import get_phase_averages, metrics
+from certmonitor.notify.digest import AlertDispatcher
+from certmonitor.notify.state import AlertState
+from certmonitor.store.results import (
+    ResultStore,
+    build_cached_results,
+    get_changed_certificate,
+    get_reusable_results,
+)
+from certmonitor.store.snapshot import ResultSnapshot
+
 # Local Dataclasses
-from certmonitor.dataclasses.common import StartupSettings, SSLReturn, ExpirationMsg
+from certmonitor.dataclasses.common import StartupSettings, SSLReturn, ExpirationMsg, Severity, ScanResult, StoredResult
 
 # Local Exceptions
 from certmonitor.exceptions.exceptions import CertMonitorError
@@ -26,13 +47,30 @@ __maintainer__ = "IncognitoCoding"
 __status__ = "Beta"
 
 
-def ssl_pull(site_url: str) -> Union[SSLReturn, None]:
+def ssl_pull(
+    site_url: str,
+    connect_timeout: Union[float, None] = None,
+    handshake_timeout: Union[float, None] = None,
+    read_timeout: Union[float, None] = None,
+    port: int = 443,
+    server_name: Union[str, None] = None,
+) -> Union[SSLReturn, None]:
     """Pulls the SSL website certificate expiration date.
 
     Parameters
     ----------
     site_url : str
-        `summary`: The site URL
+        `summary`: The site host name or IP address.
+    connect_timeout : Union[float, None], optional
+        `summary`: Seconds to wait for the TCP connection. None or 0 waits without a limit. Defaults to None.
+    handshake_timeout : Union[float, None], optional
+        `summary`: Seconds to wait for the TLS handshake. None or 0 waits without a limit. Defaults to None.
+    read_timeout : Union[float, None], optional
+        `summary`: Seconds to wait for reads after the TLS handshake. None or 0 waits without a limit. Defaults to None.
+    port : int, optional
+        `summary`: The TCP port the site is checked on. Defaults to 443.
+    server_name : Union[str, None], optional
+        `summary`: The TLS server name sent and verified. Defaults to None, which uses the site host.
 
     Returns
     -------
@@ -49,15 +87,62 @@ def ssl_pull(site_url: str) -> Union[SSLReturn, None]:
     >>> site_url = "www.google.com"
     >>> ssl_pull(site_url=site_url)
     SSLReturn(subject=((('commonName', 'www.google.com'),),), issuer=((('countryName', 'US'),), (('organizationName', 'Google Trust Services LLC'),), (('commonName', 'GTS CA 1C3'),)), version=3, notBefore='Mar  2 04:23:01 2023 GMT', notAfter='May 25 04:23:00 2023 GMT', subjectAltName=(('DNS', 'www.google.com'),), OCSP=('http://ocsp.pki.goog/gts1c3',), caIssuers=('http://pki.goog/repo/certs/gts1c3.der',), crlDistributionPoints=('http://crls.pki.goog/gts1c3/fVJxbV-Ktmk.crl',))
+    """
+    return ssl_pull_chain(site_url, connect_timeout, handshake_timeout, read_timeout, port, server_name)[0]
+
+
+def ssl_pull_chain(
+    site_url: str,
+    connect_timeout: Union[float, None] = None,
+    handshake_timeout: Union[float, None] = None,
+    read_timeout: Union[float, None] = None,
+    port: int = 443,
+    server_name: Union[str, None] = None,
+) -> tuple[Union[SSLReturn, None], tuple[tuple[dict, float, str], ...]]:
+    """Pulls the SSL website certificate and the chain the site presented in the same handshake.
+
+    Parameters
+    ----------
+    site_url : str
+        `summary`: The site host name or IP address.
+    connect_timeout : Union[float, None], optional
+        `summary`: Seconds to wait for the TCP connection. None or 0 waits without a limit. Defaults to None.
+    handshake_timeout : Union[float, None], optional
+        `summary`: Seconds to wait for the TLS handshake. None or 0 waits without a limit. Defaults to None.
+    read_timeout : Union[float, None], optional
+        `summary`: Seconds to wait for reads after the TLS handshake. None or 0 waits without a limit. Defaults to None.
+    port : int, optional
+        `summary`: The TCP port the site is checked on. Defaults to 443.
+    server_name : Union[str, None], optional
+        `summary`: The TLS server name sent and verified. Defaults to None, which uses the site host.
+
+    Returns
+    -------
+    tuple[Union[SSLReturn, None], tuple[tuple[dict, float, str], ...]]
+        `summary`: The SSL certificate return information and the parsed chain certificates from parse_chain().
+
+    Raises
+    ------
+    CertMonitorError : fexception
+        `summary`: A failure occurred while getting SSL information for {site_url}.
+
     """
     logger = logging.getLogger(__name__)
 
     ssl_info: Union[SSLReturn, None] = None
-    context = ssl.create_default_context()
+    chain: tuple[tuple[dict, float, str], ...] = ()
+    context = get_ssl_context()
     try:
 
-        with socket.create_connection((site_url, 443)) as sock:
-            with context.wrap_socket(sock, server_hostname=site_url) as ssock:
+        with metrics.time("certmonitor_phase_seconds", phase="connect"):
+            sock = socket.create_connection((site_url, port), timeout=connect_timeout or None)
+        with sock:
+            # The socket timeout is switched per phase, so a blackholed site cannot block past the configured limits.
+            sock.settimeout(handshake_timeout or None)
+            with metrics.time("certmonitor_phase_seconds", phase="handshake"):
+                ssock = context.wrap_socket(sock, server_hostname=server_name or site_url)
+            with ssock:
+                ssock.settimeout(read_timeout or None)
                 logger.debug("Getting the SSL certificate information from the site_url")
                 # Gets SSL certificate information from the site_url.
                 """
@@ -78,23 +163,14 @@ def ssl_pull(site_url: str) -> Union[SSLReturn, None]:
                     "crlDistributionPoints": ("http://crls.pki.goog/gts1c3/fVJxbV-Ktmk.crl",),
                 }
                 """
-                raw_ssl_info = ssock.getpeercert()
-                logger.debug(f"SSL certificate info = {ssl_info}")
-
-                if raw_ssl_info:
-                    ssl_info = SSLReturn(
-                        subject=raw_ssl_info.get("subject"),
-                        issuer=raw_ssl_info.get("issuer"),
-                        version=raw_ssl_info.get("version"),
-                        notBefore=raw_ssl_info.get("notBefore"),
-                        notAfter=raw_ssl_info.get("notAfter"),
-                        subjectAltName=raw_ssl_info.get("subjectAltName"),
-                        ocsp=raw_ssl_info.get("OCSP"),
-                        caIssuers=raw_ssl_info.get("caIssuers"),
-                        crlDistributionPoints=raw_ssl_info.get("crlDistributionPoints"),
-                    )
+                with metrics.time("certmonitor_phase_seconds", phase="parse"):
+                    raw_ssl_info = ssock.getpeercert()
+                    logger.debug(f"SSL certificate info = {ssl_info}")
+
+                    ssl_info = build_ssl_return(raw_ssl_info)
+                    chain = parse_chain(get_presented_chain(ssock))
         logger.debug("Returning the SSL certificate value objects")
-        return ssl_info
+        return ssl_info, chain
     except Exception as exc:
         exc_args = {
             "main_message": f"A failure occurred while getting SSL information for {site_url}.",
@@ -111,7 +187,7 @@ def get_url_certificate_info(site_url: str, buffer_days: int, time_zone: str) ->
     Parameters
     ----------
     site_url :str
-        `summary`: A website URL.
+        `summary`: A website URL. Supported formats are host, host:port, and https://host:port/path.
     buffer_days : int
         `summary`: Days to buffer certificate expiring before notifying.
     time_zone : str
@@ -125,6 +201,8 @@ def get_url_certificate_info(site_url: str, buffer_days: int, time_zone: str) ->
 
     Raises
     ------
+    CertMonitorError : fexception
+        `summary`: The site URL '{site_url}' is not a valid HTTPS target.
     ValueError : fexception
         `summary`: A failure occurred while getting SSL information for {site_url}.
     ValueError : fexception
@@ -133,207 +211,517 @@ def get_url_certificate_info(site_url: str, buffer_days: int, time_zone: str) ->
     logger = logging.getLogger(__name__)
     try:
         logger.debug(f"Checking site {site_url} for SSL information")
-        # Strips https if it exists.
-        site_url = site_url.replace("https://", "")
+        # Parses the host, port, and server name. The scheme and path are ignored.
+        target = parse_target(site_url)
         # Makes call to pull ssl.
-        ssl_output = ssl_pull(site_url)
+        ssl_output, chain = ssl_pull_chain(target.host, port=target.port, server_name=target.server_name)
     except Exception as exc:
         raise exc
 
-    ##########################################################
-    #######Sets The Date Format Based On Running Timezone#####
-    ##########################################################
-    logger.debug("Setting the date format based on the running time zone")
-    if "cst" == time_zone or "CST" == time_zone:
-        date_format = "%a, %d %b %Y %H:%M:%S CST"
-    elif "utc" == time_zone or "UTC" == time_zone:
-        date_format = "%a, %d %b %Y %H:%M:%S UTC"
-    elif "est" == time_zone or "EST" == time_zone:
-        date_format = "%a, %d %b %Y %H:%M:%S EST"
-    elif "mst" == time_zone or "MST" == time_zone:
-        date_format = "%a, %d %b %Y %H:%M:%S MST"
-    elif "pst" == time_zone or "PST" == time_zone:
-        date_format = "%a, %d %b %Y %H:%M:%S PST"
-    else:
-        exc_args = {
-            "main_message": "An incorrect time zone format was sent.",
-            "custom_type": CertMonitorError,
-            "suggested_resolution": "Please verify you entered the correct timezone abbreviation. Currently supported timezones are CST, UTC, EST, MST, and PST.",
-        }
-        raise ValueError(FCustomException(message_args=exc_args))
-
-    logger.debug(f"Time zone is '{time_zone}'. date_format set to '{date_format}'")
-
-    ##########################################################
-    ###########Sets Expiration Date From SSL Output###########
-    ##########################################################
-    logger.debug("Setting the expiration date from SSL output")
-    # Converts the certificate date from the class to an easily compareable format and sets to central time.
-    ssl_date_fmt = r"%b %d %H:%M:%S %Y %Z"
-    # Gets the raw certificate expiration date from the class.
-    if ssl_output and ssl_output.notAfter:
-        certificate_expiration = str(ssl_output.notAfter)
-    else:
-        exc_args = {
-            "main_message": f"Failed to get the certificate expiration date for URL '{site_url}'.",
-            "custom_type": CertMonitorError,
-            "suggested_resolution": "Please report this error to the developer.",
-        }
-        raise ValueError(FCustomException(message_args=exc_args))
-    # Gets the certral certificate expriation using the customized format.
-    certificate_expiration1 = (datetime.datetime.strptime(certificate_expiration, ssl_date_fmt)).strftime(date_format)
-    # Converts the string formatted expiration date back into a string parse time. Required for comparison.
-    certificate_expiration = datetime.datetime.strptime(certificate_expiration1, date_format)
-    logger.debug(f"Certificate expiration date is {certificate_expiration}")
-
-    #############################################
-    ################Sets Current Date############
-    #############################################
-    logger.debug("Setting the current date")
-    # Sets the current date with central format
-    current_datetime1 = datetime.datetime.now(datetime.timezone.utc).strftime(date_format)
-    # Converts the string formatted date back into a string parse time. Required for comparison.
-    current_datetime = datetime.datetime.strptime(current_datetime1, date_format)
-    logger.debug(f"Current date is {current_datetime}")
-
-    logger.debug("Calculating how many days remain before the certificate expires")
-    # Gets how many days remain before the certificate expires.
-    expiration_days_away = (certificate_expiration - current_datetime).days
-    logger.debug(f"Expiration days away is {expiration_days_away}")
-    # Checks if the certificate expiration showing the day it expires.
-    if expiration_days_away == 0:
-        logger.debug(
-            f"Returning the expiration status message. Message = Warning: Certificate for {site_url} is expiring soon. The certificate will expire tomorrow"
-        )
-        status_message = f"Warning: Certificate for {site_url} is expring soon. The certificate will expire tomorrow."
-        expiration_days_away = 0
-        return ExpirationMsg(status_message=status_message, expiration_days_away=expiration_days_away)
-    # Checks if the certificate expiration date has been met.
-    elif expiration_days_away < 0:
-        # Removes the negative sign.
-        days_expired = str(expiration_days_away).replace("-", "")
-        logger.debug(
-            f"Returning the expiration status message. Message = Error: Certificate for {site_url} has expired! The certificate has been expired for {days_expired} days."
-        )
-        status_message = (
-            f"Error: Certificate for {site_url} has expired! The certificate has been expired for {days_expired} days."
-        )
-        return ExpirationMsg(status_message=status_message, expiration_days_away=expiration_days_away)
-    # Checks if the expiration days away has reached the buffer alert days.
-    elif expiration_days_away <= buffer_days:
-        logger.debug(
-            f"Returning the expiration status message. Message = Warning: Certificate for {site_url} is expring soon. The certificate will expire in {expiration_days_away} days."
-        )
-        status_message = f"Warning: Certificate for {site_url} is expring soon. The certificate will expire in {expiration_days_away} days."
-        return ExpirationMsg(status_message=status_message, expiration_days_away=expiration_days_away)
-    else:
-        logger.debug(
-            f"Returning the expiration status message. Message = Info: Certificate for {site_url} is good. The certificate does not expire for {expiration_days_away} days."
+    # Reports the certificate that expires first across the site certificate and the presented chain.
+    return evaluate_chain_expiration(
+        site_url=target.name, ssl_output=ssl_output, chain=chain, buffer_days=buffer_days, time_zone=time_zone
+    )[0]
+
+
+def get_outcome(scan_result: ScanResult) -> str:
+    """Gets the outcome label of a scan result.
+
+    The label is used by the host check counters and the streamed scan records.
+
+    Parameters
+    ----------
+    scan_result : ScanResult
+        `summary`: The scan result.
+
+    Returns
+    -------
+    str
+        `summary`: not_checked, cached, ok, dns_failure, timeout, or error.
+    """
+    if not scan_result.checked:
+        return "not_checked"
+    elif scan_result.cached:
+        return "cached"
+    elif not scan_result.error:
+        return "ok"
+    elif not scan_result.resolved:
+        return "dns_failure"
+    elif "timed out after" in scan_result.error:
+        return "timeout"
+    return "error"
+
+
+def _apply_circuit_breaker(
+    due_urls: list[str], breaker: CircuitBreaker, scheduler: HostScheduler, startup_settings: StartupSettings
+) -> list[str]:
+    """Removes the failing URLs that are waiting for a retry and probes the URLs with an open circuit.
+
+    Waiting and failed probe URLs are scheduled for their next retry. Open URLs that accept a connection get a full check.
+
+    Returns
+    -------
+    list[str]
+        `summary`: The due URLs that need a full certificate check.
+    """
+    logger = logging.getLogger(__name__)
+
+    check_urls, probe_urls, waiting = breaker.split_due(due_urls, time.time())
+    for url, next_retry in waiting.items():
+        scheduler.schedule(url, next_retry)
+    passed_probes = 0
+    if probe_urls:
+        # The probe only opens a TCP connection, so dead sites do not cost a TLS handshake on every sweep.
+        for url, failure in probe_sites(probe_urls, startup_settings.scan_settings).items():
+            if failure is None:
+                check_urls.append(url)
+                passed_probes += 1
+            else:
+                _, next_retry = breaker.record_failure(url, failure, time.time())
+                scheduler.schedule(url, next_retry)
+                logger.debug(f"The connection probe for the paused URL '{url}' failed. {failure}")
+    if waiting or probe_urls:
+        logger.info(
+            f"Skipping {len(waiting)} failing URL(s) until their next retry. "
+            f"{passed_probes} of {len(probe_urls)} paused URL(s) passed the connection probe"
         )
-        status_message = f"Info: Certificate for {site_url} is good. The certificate does not expire for {expiration_days_away} days."
-        return ExpirationMsg(status_message=status_message, expiration_days_away=expiration_days_away)
+    return check_urls
+
 
+def _iter_inventory_results(startup_settings: StartupSettings) -> Iterator[ScanResult]:
+    """Reads the inventory files one chunk at a time and checks each chunk as the results are read.
 
-def cert_check(startup_settings: StartupSettings) -> None:
+    Only one chunk of site URLs and scan results is held in memory. Invalid inventory entries are logged and skipped.
+    """
+    logger = logging.getLogger(__name__)
+
+    inventory_settings = startup_settings.inventory_settings
+    site_urls = iter_inventories(inventory_settings.paths, inventory_settings.csv_column)
+    for chunk_number, chunk in enumerate(iter_chunks(site_urls, inventory_settings.chunk_size), 1):
+        valid_urls: list[str] = []
+        for site_url in chunk:
+            try:
+                parse_target(site_url)
+            except CertMonitorError as exc:
+                logger.error(exc)
+                continue
+            valid_urls.append(site_url)
+        logger.info(f"Checking {len(valid_urls)} site URL(s) from inventory chunk {chunk_number}")
+        for scan_result in scan_sites_pooled(
+            site_urls=valid_urls,
+            buffer_days=startup_settings.buffer_days,
+            time_zone=startup_settings.time_zome,
+            scan_settings=startup_settings.scan_settings,
+        ):
+            scan_result.source = "inventory"
+            yield scan_result
+
+
+def cert_check(
+    startup_settings: StartupSettings,
+    scheduler: Union[HostScheduler, None] = None,
+    snapshot: Union[ResultSnapshot, None] = None,
+    on_demand: Union[OnDemandQueue, None] = None,
+) -> None:
     """Checks and provides the URL certificate expiration date.
 
+    Only the URLs that are due in the scheduler are checked. Each checked URL gets its own next check time based on
+    its certificate expiration, so healthy certificates are not re-checked every time one certificate is expiring.
+
+    The site URLs from the inventory files are read and checked in chunks after the scheduled URLs when the inventory
+    interval has passed. They are not scheduled one by one, stored, or paused by the circuit breaker, so the inventory
+    size does not grow the state kept in memory.
+
     Parameters
     ----------
     startup_settings : StartupSettings
         `summary`: The startup settings from the YAML.
+    scheduler : Union[HostScheduler, None], optional
+        `summary`: The scheduler that keeps the next check time of each URL between loops. All URLs are checked when not set. Defaults to None.
+    snapshot : Union[ResultSnapshot, None], optional
+        `summary`: The compact snapshot that keeps the latest result of every URL and certificate file between loops. Defaults to None.
+    on_demand : Union[OnDemandQueue, None], optional
+        `summary`: The queue of on-demand checks from the API. The requested URLs are checked ahead of their schedule, and a request wakes the continuous monitoring sleep. Defaults to None.
     """
     logger = logging.getLogger(__name__)
 
-    # Override created to change user defined sleep if a certificate expires within the time the program would sleep.
-    # This will reset each loop and if a certificate expires within the sleep the override will be enabled and the program will loop every 24 hours.
-    # For example: Alerts for certificates expring set at 15 days, but the program sleeps 30 days.
-    override_sleep_seconds = None
+    sweep_start = time.perf_counter()
+    phase_totals_before = metrics.get_histogram_totals("certmonitor_phase_seconds")
+
+    if scheduler is None:
+        scheduler = HostScheduler()
+
+    # Adds new URLs as due now and drops URLs that were removed from the YAML file.
+    scheduler.sync(startup_settings.site_urls, time.time())
+    due_urls = scheduler.pop_due(time.time())
+    logger.info(f"Checking {len(due_urls)} of {len(due_urls) + len(scheduler)} URL(s) that are due")
+    # The inventory files are swept together on their own interval, so a due URL does not re-read the whole inventory.
+    inventory_start = time.time()
+    inventory_due = bool(startup_settings.inventory_settings.paths) and scheduler.is_inventory_due(inventory_start)
+    if not startup_settings.inventory_settings.paths:
+        scheduler.schedule_inventory(None)
+    elif not inventory_due:
+        next_inventory = datetime.timedelta(seconds=round(scheduler.next_inventory_time() - inventory_start))
+        logger.info(f"Skipping the inventory files until the next inventory sweep in {next_inventory}")
+    # Takes the on-demand checks from the API. Requested URLs jump the queue and skip the circuit breaker and stored results.
+    requested_urls: dict[str, None] = {}
+    if on_demand is not None:
+        due_set = set(due_urls)
+        for url in on_demand.take():
+            if url in due_set:
+                requested_urls[url] = None
+            elif url in scheduler:
+                scheduler.remove(url)
+                requested_urls[url] = None
+            else:
+                # The URL is not in the YAML file, so the request is answered without a check.
+                on_demand.complete(url, None)
+        if requested_urls:
+            logger.info(f"Checking {len(requested_urls)} on-demand URL(s) ahead of their schedule")
+            due_urls = [url for url in due_urls if url not in requested_urls]
+    # The breaker is opened once per sweep and closed after the alerts are sent.
+    breaker: Union[CircuitBreaker, None] = None
+    if startup_settings.retry_settings.enabled:
+        # Failing URLs back off, and URLs with an open circuit only get a connection probe.
+        breaker = CircuitBreaker(startup_settings.retry_settings)
+        breaker.prune(startup_settings.site_urls)
+        due_urls = _apply_circuit_breaker(due_urls, breaker, scheduler, startup_settings)
+    due_urls.extend(requested_urls)
+
+    stored_results: dict[str, StoredResult] = {}
+    result_store: Union[ResultStore, None] = None
+    if startup_settings.store_settings.enabled:
+        result_store = ResultStore(startup_settings.store_settings.path)
+    try:
+        scan_urls = due_urls
+        reusable_results: dict[str, StoredResult] = {}
+        if result_store:
+            # Skips URLs with a recent stored result that is far from expiration. The stored certificate is re-evaluated instead.
+            stored_results = result_store.get_many(due_urls)
+            reusable_results = get_reusable_results(
+                stored_results=stored_results,
+                now=time.time(),
+                buffer_days=startup_settings.buffer_days,
+                recheck_after=startup_settings.store_settings.recheck_after,
+                skip_margin_days=startup_settings.store_settings.skip_margin_days,
+            )
+            for url in requested_urls:
+                reusable_results.pop(url, None)
+            scan_urls = [url for url in due_urls if url not in reusable_results]
+            logger.info(f"Using the stored result for {len(reusable_results)} URL(s) that were checked recently")
+
+        # Checks all due URLs concurrently. Large URL lists can be split across worker processes.
+        # The results are merged, so alerting runs once over the whole sweep.
+        scan_results = scan_sites_pooled(
+            site_urls=scan_urls,
+            buffer_days=startup_settings.buffer_days,
+            time_zone=startup_settings.time_zome,
+            scan_settings=startup_settings.scan_settings,
+        )
+        checked_time = time.time()
+
+        if result_store:
+            result_store.save_many(scan_results, checked_time)
+            scan_results.extend(
+                build_cached_results(
+                    stored_results=list(reusable_results.values()),
+                    buffer_days=startup_settings.buffer_days,
+                    time_zone=startup_settings.time_zome,
+                )
+            )
+    finally:
+        if result_store:
+            result_store.close()
+
+    # Checks the local certificate files. Unchanged files are evaluated from the file index without reading them.
+    file_paths: list[str] = []
+    if startup_settings.file_settings.paths:
+        file_results = scan_certificate_files(
+            file_settings=startup_settings.file_settings,
+            buffer_days=startup_settings.buffer_days,
+            time_zone=startup_settings.time_zome,
+        )
+        file_paths = [file_result.site_url for file_result in file_results]
+        scan_results.extend(file_results)
+
+    alert_state: Union[AlertState, None] = None
+    if startup_settings.alert_settings.dedupe:
+        alert_state = AlertState(
+            path=startup_settings.alert_settings.state_path,
+            renotify_interval=startup_settings.alert_settings.renotify_interval,
+        )
+    # Gets the sent alerts for URLs, certificate files, and inventory entries that were removed. The inventory entries
+    # are only known once the inventory is read, so the alerts are only cleared on sweeps that read it. The inventory
+    # entries the sweep sees are dropped from the set, so the set never grows past the sent alerts.
+    unlisted_alert_urls: set[str] = set()
+    if alert_state and (inventory_due or not startup_settings.inventory_settings.paths):
+        unlisted_alert_urls = alert_state.get_unlisted(itertools.chain(startup_settings.site_urls, file_paths))
+    # Sends each alert right away or collects them for the digest emails. Alerts that were already sent are skipped.
+    alert_dispatcher = AlertDispatcher(startup_settings.email_settings, startup_settings.alert_settings, alert_state)
+    outcome_counts: dict[str, int] = {}
+    if snapshot is not None:
+        snapshot.start_sweep()
+    try:
+        # Loops through each URL result. The inventory chunks are checked as the loop reaches them.
+        inventory_results = _iter_inventory_results(startup_settings) if inventory_due else ()
+        for scan_result in itertools.chain(scan_results, inventory_results):
+            url = scan_result.site_url
+            unlisted_alert_urls.discard(url)
+            if snapshot is not None:
+                snapshot.add(scan_result)
+            if on_demand is not None and url in requested_urls and scan_result.source == "url":
+                on_demand.complete(url, scan_result)
+
+            # Counts the host outcome and certificate severity for the metrics and the sweep summary.
+            outcome = get_outcome(scan_result)
+            outcome_counts[outcome] = outcome_counts.get(outcome, 0) + 1
+            metrics.increment("certmonitor_host_checks_total", outcome=outcome)
+            if scan_result.expiration_msg:
+                metrics.increment("certmonitor_certificates_total", severity=scan_result.expiration_msg.severity.value)
+
+            # Flags certificate changes by comparing the stored fingerprint with the new fingerprint.
+            changed_certificate = get_changed_certificate(stored_results.get(url), scan_result)
+            if changed_certificate:
+                logger.info(
+                    f"The certificate for {url} changed. Previous fingerprint = {changed_certificate[0]}, new fingerprint = {changed_certificate[1]}"
+                )
 
-    # Loops through each URL.
-    for url in startup_settings.site_urls:
+            # Schedules the next check for the URL. URLs skipped by the sweep deadline are due again right away.
+            # Certificate files are checked on every loop, so they are not scheduled.
+            if scan_result.source == "url":
+                if scan_result.checked:
+                    check_interval = get_check_interval(
+                        expiration_days_away=(
+                            scan_result.expiration_msg.expiration_days_away if scan_result.expiration_msg else None
+                        ),
+                        buffer_days=startup_settings.buffer_days,
+                        monitor_sleep=startup_settings.monitor_sleep,
+                    )
+                    logger.debug(f"The next check for {url} is in {datetime.timedelta(seconds=check_interval)}")
+                    scheduler.schedule(url, checked_time + check_interval)
+                else:
+                    scheduler.schedule(url, checked_time)
+
+            # Collapses the connection failures of a URL into one alert when its circuit opens and one when it recovers.
+            # Only DNS, connect, and timeout failures count toward the circuit. Other failures mean the site responded,
+            # so they close the circuit and are alerted below.
+            if breaker and scan_result.source == "url" and scan_result.checked and not scan_result.cached:
+                if not scan_result.reachable:
+                    opened, next_retry = breaker.record_failure(url, scan_result.error, checked_time)
+                    scheduler.schedule(url, next_retry)
+                    failures = breaker.get_failures(url)
+                    retry_in = datetime.timedelta(seconds=round(next_retry - checked_time))
+                    if not opened:
+                        logger.warning(
+                            f"The URL '{url}' failed {failures} check(s) in a row. The next retry is in {retry_in}. {scan_result.error}"
+                        )
+                        continue
+                    metrics.increment("certmonitor_circuit_changes_total", state="open")
+                    # Checks if program error alerts should be emailed.
+                    if startup_settings.alert_program_errors:
+                        subject = "Website Certificate Checks Paused"
+                        body = (
+                            f"The URL '{url}' failed {failures} checks in a row. The URL will only get a connection probe"
+                            f" until it responds, and no more alerts are sent until it recovers. The next probe is in {retry_in}."
+                            f" Last failure: {scan_result.error}"
+                        )
 
-        try:
+                        alert_dispatcher.add(subject=subject, body=body, site_url=url, severity="paused")
+
+                    exc_args = {
+                        "main_message": "Website Certificate Checks Paused",
+                        "custom_type": CertMonitorError,
+                        "returned_result": f"The URL '{url}' failed {failures} checks in a row. {scan_result.error}",
+                        "suggested_resolution": "If the website is no longer available, you will want to remove this URL from the configuration file.",
+                    }
+                    logger.error(CertMonitorError(FCustomException(message_args=exc_args, tb_limit=0)))
+                    continue
+                recovered = breaker.record_success(url)
+                if recovered:
+                    metrics.increment("certmonitor_circuit_changes_total", state="closed")
+                    paused_for = datetime.timedelta(seconds=round(checked_time - recovered[1]))
+                    body = f"The URL '{url}' responded again after {recovered[0]} failed checks in a row over {paused_for}."
+                    logger.info(body)
+                    # Checks if program error alerts should be emailed.
+                    if startup_settings.alert_program_errors:
+                        alert_dispatcher.add(
+                            subject="Website Certificate Checks Resumed", body=body, site_url=url, severity="resumed"
+                        )
+
+            # Checks if the sweep deadline was reached before the URL was checked.
+            if not scan_result.checked:
+                # Checks if program error alerts should be emailed.
+                if startup_settings.alert_program_errors:
+                    subject = "Website Certificate Validation Skipped"
+                    body = f"The URL '{url}' was not checked because the sweep deadline was reached. The URL will be checked on the next sweep."
+
+                    alert_dispatcher.add(subject=subject, body=body, site_url=url, severity="skipped")
+
+                exc_args = {
+                    "main_message": "Website Certificate Validation Skipped",
+                    "custom_type": CertMonitorError,
+                    "returned_result": f"The URL '{url}' was not checked because the sweep deadline was reached.",
+                    "suggested_resolution": "Increase the 'sweep_deadline' value in the 'scan' section of the YAML file or lower the per-phase timeouts.",
+                }
+                logger.warning(CertMonitorError(FCustomException(message_args=exc_args, tb_limit=0)))
+                continue
+
+            # Failed checks return the failure message instead of the certificate info status.
+            if scan_result.error:
+                # Checks if a certificate file could not be read. One bad file does not stop the sweep.
+                if scan_result.source == "file":
+                    # Checks if program error alerts should be emailed.
+                    if startup_settings.alert_program_errors:
+                        subject = "Certificate File Validation Skipped"
+                        body = f"The certificate file '{url}' could not be read. {scan_result.error}"
+
+                        alert_dispatcher.add(subject=subject, body=body, site_url=url, severity="skipped")
+
+                    exc_args = {
+                        "main_message": "Certificate File Validation Skipped",
+                        "custom_type": CertMonitorError,
+                        "returned_result": f"The certificate file '{url}' could not be read. {scan_result.error}",
+                        "suggested_resolution": "Please verify the file is a PEM, DER, or PKCS#12 certificate file, or remove it from the 'certificate_files' paths.",
+                    }
+                    logger.error(CertMonitorError(FCustomException(message_args=exc_args, tb_limit=0)))
+                # Checks if the DNS resolution failed. DNS failures are reported separately from TLS failures.
+                elif not scan_result.resolved:
+                    # Checks if program error alerts should be emailed.
+                    if startup_settings.alert_program_errors:
+                        subject = "Website Certificate Validation Skipped"
+                        body = f"The URL '{url}' is not reachable. This website may be offline or decommissioned. If the website is no longer available,"
+                        " you will want to remove this URL from the configuration file to avoid these alerts from continuing."
+
+                        alert_dispatcher.add(subject=subject, body=body, site_url=url, severity="skipped")
+
+                    exc_args = {
+                        "main_message": "Website Certificate Validation Skipped",
+                        "custom_type": CertMonitorError,
+                        "returned_result": f"The URL '{url}' is not reachable. This website may be offline or decommissioned.",
+                        "suggested_resolution": "If the website is no longer available, you will want to remove this URL from the configuration file to avoid these alerts from continuing.",
+                    }
+                    logger.error(CertMonitorError(FCustomException(message_args=exc_args, tb_limit=0)))
+                # Checks for error specifics for notification.
+                # The per-phase timeouts from the scan settings report a blackholed site the same as an unreachable site.
+                elif "timed out after" in scan_result.error:
+                    # Checks if program error alerts should be emailed.
+                    if startup_settings.alert_program_errors:
+                        subject = "Website Certificate Validation Skipped"
+                        body = f"The URL '{url}' did not respond before the scan timeout. This website may be offline or blocking the connection."
+
+                        alert_dispatcher.add(subject=subject, body=body, site_url=url, severity="skipped")
+
+                    exc_args = {
+                        "main_message": "Website Certificate Validation Skipped",
+                        "custom_type": CertMonitorError,
+                        "returned_result": f"The URL '{url}' did not respond before the scan timeout.",
+                        "suggested_resolution": "Please verify the website is online or increase the timeouts in the 'scan' section of the YAML file.",
+                    }
+                    logger.error(CertMonitorError(FCustomException(message_args=exc_args, tb_limit=0)))
+                # Checks if the verified handshake failed because the certificate expired.
+                # The certificate is not returned, so the expiration is alerted from the failure message.
+                elif "certificate has expired" in scan_result.error:
+                    subject = "Website Certificate Expired"
+                    body = f"The URL '{url}' certificate has expired. The certificate verification failed during the TLS handshake."
+                    logger.error(body)
+
+                    alert_dispatcher.add(subject=subject, body=body, site_url=url, severity=Severity.EXPIRED.value)
+                # Checks for error specifics for notification.
+                elif "unable to get local issuer certificate" in scan_result.error:
+                    # Checks if program error alerts should be emailed.
+                    if startup_settings.alert_program_errors:
+                        subject = "Website Certificate Validation Skipped"
+                        body = f"The URL '{url}' certificate verification failed. CertMonitor could not get the local issuer certificate."
+
+                        alert_dispatcher.add(subject=subject, body=body, site_url=url, severity="skipped")
+
+                    exc_args = {
+                        "main_message": "Website Certificate Validation Skipped",
+                        "custom_type": CertMonitorError,
+                        "returned_result": f"The URL '{url}' certificate verification failed. CertMonitor could not get the local issuer certificate.",
+                        "suggested_resolution": "Please check the local issuer certificate",
+                    }
+                    logger.error(CertMonitorError(FCustomException(message_args=exc_args, tb_limit=0)))
+                # Inventory URLs are not paused by the circuit breaker, so other failures are reported without stopping the sweep.
+                elif scan_result.source == "inventory":
+                    # Checks if program error alerts should be emailed.
+                    if startup_settings.alert_program_errors:
+                        subject = "Website Certificate Validation Skipped"
+                        body = f"The inventory URL '{url}' could not be checked. {scan_result.error}"
+
+                        alert_dispatcher.add(subject=subject, body=body, site_url=url, severity="skipped")
+
+                    exc_args = {
+                        "main_message": "Website Certificate Validation Skipped",
+                        "custom_type": CertMonitorError,
+                        "returned_result": f"The inventory URL '{url}' could not be checked. {scan_result.error}",
+                        "suggested_resolution": "Please validate that the website is an HTTPS supported website or remove it from the inventory file.",
+                    }
+                    logger.error(CertMonitorError(FCustomException(message_args=exc_args, tb_limit=0)))
+                # Other failures are reported without stopping the sweep, so one bad URL does not hide the rest.
+                else:
+                    # Checks if program error alerts should be emailed.
+                    if startup_settings.alert_program_errors:
+                        subject = "Website Certificate Validation Skipped"
+                        body = f"The URL '{url}' could not be checked. {scan_result.error}"
+
+                        alert_dispatcher.add(subject=subject, body=body, site_url=url, severity="skipped")
+
+                    exc_args = {
+                        "main_message": f"A failure occurred while checking the URL '{url}'.",
+                        "custom_type": CertMonitorError,
+                        "returned_result": scan_result.error,
+                        "suggested_resolution": "Please validate that the website is an HTTPS supported website.",
+                    }
+                    logger.error(CertMonitorError(FCustomException(message_args=exc_args, tb_limit=0)))
+                continue
 
             # Gets the certificate info status.
-            url_certificate_output = get_url_certificate_info(
-                url, startup_settings.buffer_days, startup_settings.time_zome
+            url_certificate_output = scan_result.expiration_msg
+            # Probe mode reports the expiration of chains that failed verification, so the failure is added to the alert.
+            chain_note = (
+                f" The certificate chain failed verification. {scan_result.chain_error}"
+                if scan_result.chain_error
+                else ""
             )
-            # Checks return output for specific strings to create email specific messages.
-            # The return output will contain "Info:, Warning:, or Error:" when returning.
-            if "Warning:" in str(url_certificate_output.status_message):
+            # Checks the severity to create email specific messages.
+            # The message text is only rendered for the log line or notification that needs it.
+            if url_certificate_output.severity is Severity.WARNING:
                 subject = "Website Certificate Expiring Soon"
-                # Removes the warning part at the beginning of the return output.
-                body = str(url_certificate_output.status_message).replace("Warning: ", "")
+                body = url_certificate_output.message + chain_note
                 logger.warning(body)
 
-                # Converts the dataclass to a dictionary.
-                email_settings_asdict: dict = asdict(startup_settings.email_settings)
-                send_email(
-                    email_settings=email_settings_asdict,
-                    subject=subject,
-                    body=body,
-                )
-
-                if override_sleep_seconds:
-                    logger.info("24-hour sleep override is already set from the previous certificate check")
-                elif not override_sleep_seconds:
-                    # Sets the sleep override because the certificate expires soon. The override will override the user's pre-defined sleep and change the sleep to only sleep for 24 hours.
-                    override_sleep_seconds = 86400
-                    logger.info("Setting sleep override to 24 hour because the certificate expires soon")
-            elif "Error:" in str(url_certificate_output.status_message):
+                alert_dispatcher.add(subject=subject, body=body, site_url=url, severity=Severity.WARNING.value)
+            elif url_certificate_output.severity is Severity.EXPIRED:
                 subject = "Website Certificate Expired"
-                # Removes the warning part at the beginning of the return output.
-                body = str(url_certificate_output.status_message).replace("Error: ", "")
+                body = url_certificate_output.message + chain_note
                 logger.error(body)
 
-                # Converts the dataclass to a dictionary.
-                email_settings_asdict: dict = asdict(startup_settings.email_settings)
-                send_email(
-                    email_settings=email_settings_asdict,
-                    subject=subject,
-                    body=body,
-                )
+                alert_dispatcher.add(subject=subject, body=body, site_url=url, severity=Severity.EXPIRED.value)
+            elif url_certificate_output.severity is Severity.INFO and scan_result.chain_error:
+                subject = "Website Certificate Chain Untrusted"
+                body = f"The URL '{url}' certificate is not expiring, but the certificate chain failed verification. {scan_result.chain_error}"
+                logger.warning(body)
 
-                if override_sleep_seconds:
-                    logger.info("24-hour sleep override is already set from the previous certificate check")
-                elif not override_sleep_seconds:
-                    # Sets the sleep override because the certificate expired. The override will override the user's pre-defined sleep and change the sleep to only sleep for 24 hours.
-                    override_sleep_seconds = 86400
-                    logger.info("Setting sleep override to 24 hour because the certificate expired")
-            elif "Info:" in str(url_certificate_output.status_message):
-                # Checks if the program should continue to loop and sleep based on the "monitoring_sleep" value and no sleep override has been set from a different certificate expring.
-                # A certificate expiring or expired will override at 24 hours, which will be a quicker then the time delta below.
-                if startup_settings.continuous_monitoring and not override_sleep_seconds:
-                    # Converts seconds to full time output for clean log output.
-                    sleep_time = datetime.timedelta(seconds=startup_settings.monitor_sleep)
-                    # Checks if the sleep days exceeds the certificates expiration date to set override.
-                    if sleep_time.days >= url_certificate_output.expiration_days_away:
-                        # Gets the amount of days between the sleep time and certificate expiration.
-                        sleep_time_to_expiration_delta = sleep_time.days - url_certificate_output.expiration_days_away
-                        logger.info(
-                            f"The user-defined sleep exceeds the certificate expiration. Enabling override to {sleep_time_to_expiration_delta} seconds."
-                        )
-                        override_sleep_seconds = sleep_time_to_expiration_delta
-                logger.info(str(url_certificate_output.status_message).replace("Info: ", ""))
+                alert_dispatcher.add(subject=subject, body=body, site_url=url, severity="untrusted")
+            elif url_certificate_output.severity is Severity.INFO:
+                # Healthy certificates are the bulk of a sweep, so the message is skipped when INFO is not logged.
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info(url_certificate_output.message)
+                # Clears the sent alerts, so the next problem with the URL is alerted right away.
+                alert_dispatcher.resolve(url)
             else:
                 # Checks if program error alerts should be emailed.
                 if startup_settings.alert_program_errors:
                     subject = "certmonitor failed to validate returned SSL check"
-                    body = f"The URL '{url}' failed to be checked because certmonitor failed to validate returned SSL check value. Return value = {url_certificate_output.status_message}"
+                    body = f"The URL '{url}' failed to be checked because certmonitor failed to validate returned SSL check value. Return value = {url_certificate_output.severity}"
 
-                    # Converts the dataclass to a dictionary.
-                    email_settings_asdict: dict = asdict(startup_settings.email_settings)
-
-                    send_email(
-                        email_settings=email_settings_asdict,
-                        subject=subject,
-                        body=body,
-                    )
+                    alert_dispatcher.add(subject=subject, body=body, site_url=url, severity="invalid")
 
                     exc_args = {
                         "main_message": f"CertMonitor failed to validate returned SSL check for URL {url}.",
                         "custom_type": CertMonitorError,
-                        "returned_result": {url_certificate_output.status_message},
+                        "returned_result": {url_certificate_output.severity},
                         "suggested_resolution": "Please report this error to the developer.",
                     }
                     logger.error(CertMonitorError(FCustomException(message_args=exc_args)))
@@ -341,92 +729,67 @@ def cert_check(startup_settings: StartupSettings) -> None:
                     exc_args = {
                         "main_message": f"CertMonitor failed to validate returned SSL check for URL {url}.",
                         "custom_type": CertMonitorError,
-                        "returned_result": {url_certificate_output.status_message},
+                        "returned_result": {url_certificate_output.severity},
                         "suggested_resolution": "Please report this error to the developer.",
                     }
                     logger.error(CertMonitorError(FCustomException(message_args=exc_args)))
-        except Exception as exc:
-            # Checks for error specifics for notification.
-            if "getaddrinfo failed" in str(exc):
-                # Checks if program error alerts should be emailed.
-                if startup_settings.alert_program_errors:
-                    subject = "Website Certificate Validation Skipped"
-                    body = f"The URL '{url}' is not reachable. This website may be offline or decommissioned. If the website is no longer available,"
-                    " you will want to remove this URL from the configuration file to avoid these alerts from continuing."
-
-                    # Converts the dataclass to a dictionary.
-                    email_settings_asdict: dict = asdict(startup_settings.email_settings)
-
-                    send_email(
-                        email_settings=email_settings_asdict,
-                        subject=subject,
-                        body=body,
-                    )
 
-                exc_args = {
-                    "main_message": "Website Certificate Validation Skipped",
-                    "custom_type": CertMonitorError,
-                    "returned_result": f"The URL '{url}' is not reachable. This website may be offline or decommissioned.",
-                    "suggested_resolution": "If the website is no longer available, you will want to remove this URL from the configuration file to avoid these alerts from continuing.",
-                }
-                logger.error(CertMonitorError(FCustomException(message_args=exc_args, tb_limit=0)))
-            # Checks for error specifics for notification.
-            elif "unable to get local issuer certificate" in str(exc):
-                # Checks if program error alerts should be emailed.
-                if startup_settings.alert_program_errors:
-                    subject = "Website Certificate Validation Skipped"
-                    body = f"The URL '{url}' certificate verification failed. CertMonitor could not get the local issuer certificate."
-
-                    # Converts the dataclass to a dictionary.
-                    email_settings_asdict: dict = asdict(startup_settings.email_settings)
-
-                    send_email(
-                        email_settings=email_settings_asdict,
-                        subject=subject,
-                        body=body,
-                    )
-
-                exc_args = {
-                    "main_message": "Website Certificate Validation Skipped",
-                    "custom_type": CertMonitorError,
-                    "returned_result": f"The URL '{url}' certificate verification failed. CertMonitor could not get the local issuer certificate.",
-                    "suggested_resolution": "Please check the local issuer certificate",
-                }
-                logger.error(CertMonitorError(FCustomException(message_args=exc_args, tb_limit=0)))
-            else:
-                raise
+        if alert_state:
+            alert_state.clear_many(list(unlisted_alert_urls))
+        if inventory_due:
+            interval = startup_settings.inventory_settings.interval
+            scheduler.schedule_inventory(inventory_start + interval if interval else None)
+    finally:
+        if on_demand is not None:
+            # Answers the on-demand checks that an unknown failure stopped before the loop reached them.
+            on_demand.finish()
+        # Sends the digest even when an unknown failure stops the sweep, so collected alerts are not lost.
+        try:
+            alert_dispatcher.flush()
+        finally:
+            if alert_state:
+                alert_state.close()
+            if breaker:
+                metrics.set_gauge("certmonitor_open_circuits", breaker.open_count)
+                breaker.close()
+
+    if snapshot is not None:
+        # Drops removed URLs and the certificate files and inventory entries that were not reported in this sweep.
+        # The inventory entries are kept between inventory sweeps.
+        snapshot.remove_stale(
+            startup_settings.site_urls,
+            inventory_swept=inventory_due or not startup_settings.inventory_settings.paths,
+        )
+        logger.debug(
+            f"The result snapshot holds {len(snapshot)} result(s) with {snapshot.interned_count} interned value(s)"
+        )
 
-    # Checks if the program should continue to loop and sleep based on the "monitoring_sleep" value.
+    # Records the sweep and logs a one line summary, so slow sweeps can be traced to a phase.
+    sweep_duration = time.perf_counter() - sweep_start
+    metrics.increment("certmonitor_sweeps_total")
+    metrics.observe("certmonitor_sweep_duration_seconds", sweep_duration)
+    metrics.set_gauge("certmonitor_last_sweep_duration_seconds", sweep_duration)
+    metrics.set_gauge("certmonitor_last_sweep_timestamp_seconds", time.time())
+    phase_averages = get_phase_averages(phase_totals_before, metrics.get_histogram_totals("certmonitor_phase_seconds"))
+    logger.info(
+        f"Sweep summary: {sum(outcome_counts.values())} result(s) in {sweep_duration:.2f}s. "
+        + ", ".join(f"{outcome} {count}" for outcome, count in sorted(outcome_counts.items()))
+        + f". Alerts sent {alert_dispatcher.sent}, skipped {alert_dispatcher.suppressed}. Average phase latency: "
+        + (", ".join(f"{phase} {average * 1000:.1f}ms" for phase, average in phase_averages.items()) or "none")
+    )
+
+    # Checks if the program should continue to loop and sleep until the next URL is due.
     if startup_settings.continuous_monitoring:
-        try:
-            # Checks if sleep override has been set by the program.
-            # Override is only enabled if the user sets a sleep larger than the expiration alert threshold or the expriation date is within the alert threshold.
-            if override_sleep_seconds:
-                # Sets seconds in days.
-                seconds_in_day = 60 * 60 * 24
-                # Gets how many days are in the sleep seconds.
-                override_days = override_sleep_seconds // seconds_in_day
-                logger.info(
-                    f"The program has continuous monitoring enabled, and the override time has been set to alert every {override_sleep_seconds} seconds [{override_days} day(s)] because a certificate is expiring or is expired"
-                )
-                # Sleeps for adjusted override.
-                time.sleep(override_sleep_seconds)
-            else:
-                # Converts seconds to full time output for clean log output.
-                sleep_time = datetime.timedelta(seconds=startup_settings.monitor_sleep)
-                logger.info(f"The program has continuous monitoring enabled. Waiting {sleep_time} until next check")
-                # Sleeps based on the monitor sleep seconds entry.
-                time.sleep(startup_settings.monitor_sleep)
-        except Exception as exc:
-            exc_args = {
-                "main_message": "An error has occurred while putting the program to sleep.",
-                "custom_type": CertMonitorError,
-                "returned_result": {exc},
-                "suggested_resolution": "Please make sure your time is not set past '49 days, 17:02:47' or 4,294,968 seconds.",
-            }
-            logger.error(CertMonitorError(FCustomException(message_args=exc_args)))
-            exit()
+        next_check_time = scheduler.next_check_time()
+        if next_check_time is None:
+            # No URLs are configured, so the program waits the user-defined sleep before reading the YAML file again.
+            next_check_time = time.time() + startup_settings.monitor_sleep
+        # Converts seconds to full time output for clean log output.
+        sleep_time = datetime.timedelta(seconds=round(max(next_check_time - time.time(), 0)))
+        logger.info(f"The program has continuous monitoring enabled. Waiting {sleep_time} until the next URL is due")
+        # Sleeps until the next URL is due. Long sleeps are split, so there is no sleep length limit.
+        # An on-demand check from the API wakes the sleep early.
+        sleep_until(next_check_time, on_demand.wake_event if on_demand is not None else None)
     else:
+        # Returns to the caller, which stops because the program is a single run.
         logger.info(f"Website SSL validation check has completed")
-        # Exits because the program is a single run.
-        exit()
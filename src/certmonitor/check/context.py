@@ -0,0 +1,137 @@
+# Package/Modules
+import logging
+import ssl
+import time
+from collections import OrderedDict
+from typing import Union
+
+__author__ = "IncognitoCoding"
+__copyright__ = "Copyright 2023, context"
+__credits__ = ["IncognitoCoding"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "IncognitoCoding"
+__status__ = "Beta"
+
+# Maximum number of TLS sessions kept per process. The least recently used session is dropped first.
+SESSION_CACHE_SIZE = 10000
+
+# The SSL context is built once per process. Building a context loads and parses the system CA store.
+_ssl_context: Union[ssl.SSLContext, None] = None
+# The SSL context for handshake-only probes. The chain is verified after the handshake, so no CA store is loaded.
+_probe_context: Union[ssl.SSLContext, None] = None
+# Cached TLS sessions and the parsed chain from the handshake that created them, keyed by site.
+_tls_sessions: "OrderedDict[str, tuple[ssl.SSLSession, tuple]]" = OrderedDict()
+
+
+def get_ssl_context() -> ssl.SSLContext:
+    """Gets the SSL context shared by every certificate check in this process.
+
+    The context is created on the first call, so worker processes each build their own copy once.
+
+    Returns
+    -------
+    ssl.SSLContext
+        `summary`: The shared default SSL context.
+    """
+    global _ssl_context
+
+    if _ssl_context is None:
+        logger = logging.getLogger(__name__)
+        logger.debug("Creating the shared SSL context")
+        _ssl_context = ssl.create_default_context()
+    return _ssl_context
+
+
+def get_probe_context() -> ssl.SSLContext:
+    """Gets the SSL context shared by every handshake-only probe in this process.
+
+    The context does not verify the chain or the host name, so the handshake completes for any certificate the site
+    presents. The chain must be verified separately with verify_chains().
+
+    Returns
+    -------
+    ssl.SSLContext
+        `summary`: The shared unverified SSL context.
+    """
+    global _probe_context
+
+    if _probe_context is None:
+        logger = logging.getLogger(__name__)
+        logger.debug("Creating the shared probe SSL context")
+        _probe_context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+        _probe_context.check_hostname = False
+        _probe_context.verify_mode = ssl.CERT_NONE
+    return _probe_context
+
+
+def get_tls_session(site: str, max_age: int) -> Union[ssl.SSLSession, None]:
+    """Gets a cached TLS session that can be resumed for the site.
+
+    A resumed session does not resend the server certificate. The certificate from the original handshake is reported
+    until the cached session is dropped, so max_age bounds how long a renewed certificate can go unnoticed.
+
+    Parameters
+    ----------
+    site : str
+        `summary`: The site the session belongs to.
+    max_age : int
+        `summary`: Maximum age in seconds of a session that can be resumed.
+
+    Returns
+    -------
+    Union[ssl.SSLSession, None]
+        `summary`: The cached session. None is returned when no usable session is cached.
+    """
+    entry = _tls_sessions.get(site)
+    if entry is None:
+        return None
+    session = entry[0]
+    # Drops sessions that are too old to trust or that the server no longer accepts.
+    if time.time() - session.time >= min(max_age, session.timeout):
+        del _tls_sessions[site]
+        return None
+    _tls_sessions.move_to_end(site)
+    return session
+
+
+def get_tls_session_chain(site: str) -> tuple:
+    """Gets the parsed chain stored with the cached TLS session of the site.
+
+    A resumed handshake does not resend the chain, so the chain from the original handshake is reported with it.
+
+    Parameters
+    ----------
+    site : str
+        `summary`: The site the session belongs to.
+
+    Returns
+    -------
+    tuple
+        `summary`: The parsed chain certificates. An empty tuple is returned when no session is cached.
+    """
+    entry = _tls_sessions.get(site)
+    return entry[1] if entry else ()
+
+
+def store_tls_session(site: str, session: Union[ssl.SSLSession, None], chain: tuple = ()) -> None:
+    """Stores the TLS session from a full handshake so the next check of the site can resume it.
+
+    Sessions from a resumed handshake must not be stored. They carry the certificate from the original handshake,
+    and storing them would restart the max age check.
+
+    Parameters
+    ----------
+    site : str
+        `summary`: The site the session belongs to.
+    session : Union[ssl.SSLSession, None]
+        `summary`: The TLS session from the handshake.
+    chain : tuple, optional
+        `summary`: The parsed chain certificates from the handshake. Defaults to ().
+    """
+    if session is None or not session.has_ticket and not session.id:
+        return
+    _tls_sessions[site] = (session, chain)
+    _tls_sessions.move_to_end(site)
+    if len(_tls_sessions) > SESSION_CACHE_SIZE:
+        _tls_sessions.popitem(last=False)
@@ -0,0 +1,148 @@
+# Package/Modules
+import bz2
+import csv
+import gzip
+import io
+import itertools
+import logging
+import lzma
+import os
+import sys
+from typing import Iterable, Iterator, TextIO
+
+__author__ = "IncognitoCoding"
+__copyright__ = "Copyright 2023, inventory"
+__credits__ = ["IncognitoCoding"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "IncognitoCoding"
+__status__ = "Beta"
+
+# Compressed inventory files are decompressed while they are read, keyed by the lowercase file extension.
+_DECOMPRESSORS = {".gz": gzip.open, ".bz2": bz2.open, ".xz": lzma.open}
+
+
+def _open_inventory(path: str) -> TextIO:
+    """Opens an inventory file as text. Compressed files are decompressed while read, and "-" reads stdin."""
+    if path == "-":
+        return io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8-sig", errors="replace", newline="")
+    decompress = _DECOMPRESSORS.get(os.path.splitext(path)[1].lower())
+    if decompress:
+        return decompress(path, "rt", encoding="utf-8-sig", errors="replace", newline="")  # type: ignore
+    return open(path, "r", encoding="utf-8-sig", errors="replace", newline="")
+
+
+def _is_csv(path: str) -> bool:
+    """Checks if an inventory file is a CSV file. The compression extension is ignored."""
+    root, extension = os.path.splitext(path.lower())
+    if extension in _DECOMPRESSORS:
+        extension = os.path.splitext(root)[1]
+    return extension == ".csv"
+
+
+def _iter_csv_column(inventory_file: TextIO, csv_column: str) -> Iterator[str]:
+    """Reads one column from a CSV inventory. The first row is a site URL when it does not have the column header."""
+    rows = csv.reader(inventory_file)
+    header = next(rows, None)
+    if header is None:
+        return
+    column_index = 0
+    if csv_column in header:
+        column_index = header.index(csv_column)
+    else:
+        rows = itertools.chain([header], rows)  # type: ignore
+    for row in rows:
+        if len(row) > column_index:
+            yield row[column_index]
+
+
+def iter_inventory(path: str, csv_column: str) -> Iterator[str]:
+    """Reads the site URLs from one inventory file one line at a time.
+
+    Text files hold one site URL per line. CSV files read the csv_column column when the first row has that header
+    and the first column otherwise. Blank entries and entries starting with # are skipped.
+
+    Parameters
+    ----------
+    path : str
+        `summary`: The inventory file path. Files ending with .gz, .bz2, or .xz are decompressed while read. "-" reads stdin.
+    csv_column : str
+        `summary`: The CSV header of the site URL column.
+
+    Yields
+    ------
+    str
+        `summary`: Each site URL in file order.
+
+    Raises
+    ------
+    OSError
+        `summary`: The inventory file could not be opened or read.
+    """
+    inventory_file = _open_inventory(path)
+    try:
+        entries = _iter_csv_column(inventory_file, csv_column) if _is_csv(path) else inventory_file
+        for entry in entries:
+            site_url = entry.strip()
+            if site_url and not site_url.startswith("#"):
+                yield site_url
+    finally:
+        if path == "-":
+            # Closing the wrapper around stdin would also close sys.stdin.buffer, so the wrapper is detached instead.
+            inventory_file.detach()  # type: ignore
+        else:
+            inventory_file.close()
+
+
+def iter_inventories(paths: list[str], csv_column: str) -> Iterator[str]:
+    """Reads the site URLs from every inventory file in order.
+
+    Files that cannot be read are logged and skipped, so one missing inventory does not stop the others.
+
+    Parameters
+    ----------
+    paths : list[str]
+        `summary`: The inventory file paths.
+    csv_column : str
+        `summary`: The CSV header of the site URL column.
+
+    Yields
+    ------
+    str
+        `summary`: Each site URL in file order.
+    """
+    logger = logging.getLogger(__name__)
+
+    for path in paths:
+        site_url_count = 0
+        try:
+            for site_url in iter_inventory(path, csv_column):
+                site_url_count += 1
+                yield site_url
+        except (OSError, EOFError, csv.Error, lzma.LZMAError) as exc:
+            logger.error(f"The inventory file '{path}' could not be read after {site_url_count} site URL(s). {exc}")
+            continue
+        logger.debug(f"Read {site_url_count} site URL(s) from the inventory file '{path}'")
+
+
+def iter_chunks(site_urls: Iterable[str], chunk_size: int) -> Iterator[list[str]]:
+    """Splits the site URLs into lists of up to chunk_size entries without reading ahead.
+
+    Parameters
+    ----------
+    site_urls : Iterable[str]
+        `summary`: The site URLs.
+    chunk_size : int
+        `summary`: The most site URLs in each list.
+
+    Yields
+    ------
+    list[str]
+        `summary`: The next chunk of site URLs.
+    """
+    site_url_iterator = iter(site_urls)
+    while True:
+        chunk = list(itertools.islice(site_url_iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
@@ -0,0 +1,114 @@
+# Package/Modules
+import threading
+from typing import Union
+
+# Local Dataclasses
+from certmonitor.dataclasses.common import ScanResult
+
+__author__ = "IncognitoCoding"
+__copyright__ = "Copyright 2023, ondemand"
+__credits__ = ["IncognitoCoding"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "IncognitoCoding"
+__status__ = "Beta"
+
+
+class OnDemandQueue(object):
+    """Passes on-demand check requests from the API threads to the next sweep.
+
+    A request wakes the sleeping sweep loop. The next sweep takes every queued site URL, checks it ahead of its
+    schedule, and completes the request with the scan result, so the API thread waiting on it can answer right away.
+    The wake event stays set while requests are queued.
+    """
+
+    def __init__(self) -> None:
+        self._condition = threading.Condition()
+        self._pending: dict[str, None] = {}
+        self._taken: dict[str, None] = {}
+        # The number of sweeps that took requests. A request is answered by a sweep that started after it.
+        self._sweep_number = 0
+        # The sweep number and scan result of the last on-demand check for each site URL.
+        self._completed: dict[str, tuple[int, Union[ScanResult, None]]] = {}
+        self.wake_event = threading.Event()
+
+    def request(self, site_url: str) -> int:
+        """Queues a site URL for the next sweep and wakes the sweep loop.
+
+        Parameters
+        ----------
+        site_url : str
+            `summary`: The site URL to check.
+
+        Returns
+        -------
+        int
+            `summary`: The ticket passed to wait_for().
+        """
+        with self._condition:
+            self._pending[site_url] = None
+            self.wake_event.set()
+            return self._sweep_number
+
+    def wait_for(self, site_url: str, ticket: int, timeout: float) -> tuple[bool, Union[ScanResult, None]]:
+        """Waits until a sweep that started after the request checked the site URL.
+
+        Parameters
+        ----------
+        site_url : str
+            `summary`: The requested site URL.
+        ticket : int
+            `summary`: The ticket from request().
+        timeout : float
+            `summary`: The most seconds to wait.
+
+        Returns
+        -------
+        tuple[bool, Union[ScanResult, None]]
+            `summary`: True when the request was completed before the timeout, and the scan result. None is returned when the site URL is not configured or the sweep stopped before the check finished.
+        """
+        with self._condition:
+            done = self._condition.wait_for(
+                lambda: self._completed.get(site_url, (ticket, None))[0] > ticket, timeout=timeout
+            )
+            return (True, self._completed[site_url][1]) if done else (False, None)
+
+    def take(self) -> list[str]:
+        """Takes every queued site URL for the sweep that is starting.
+
+        Returns
+        -------
+        list[str]
+            `summary`: The requested site URLs in request order.
+        """
+        with self._condition:
+            self._sweep_number += 1
+            self._taken.update(self._pending)
+            taken = list(self._pending)
+            self._pending.clear()
+            self.wake_event.clear()
+            return taken
+
+    def complete(self, site_url: str, scan_result: Union[ScanResult, None]) -> None:
+        """Completes a taken request and wakes the waiting API threads.
+
+        Parameters
+        ----------
+        site_url : str
+            `summary`: The requested site URL.
+        scan_result : Union[ScanResult, None]
+            `summary`: The scan result. None is sent when the site URL is not configured.
+        """
+        with self._condition:
+            if site_url in self._taken:
+                del self._taken[site_url]
+                self._completed[site_url] = (self._sweep_number, scan_result)
+                self._condition.notify_all()
+
+    def finish(self) -> None:
+        """Completes the taken requests that the sweep did not reach, so the waiting API threads do not wait for the timeout."""
+        with self._condition:
+            for site_url in self._taken:
+                self._completed[site_url] = (self._sweep_number, None)
+            self._taken.clear()
+            self._condition.notify_all()
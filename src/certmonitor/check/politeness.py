@@ -0,0 +1,240 @@
+# Package/Modules
+import asyncio
+import dataclasses
+import ipaddress
+from typing import Union
+
+# Optional Package/Modules
+try:
+    # Only needed to find the registered domain of hosts under multi-label and shared public suffixes.
+    from publicsuffixlist import PublicSuffixList
+except ImportError:
+    PublicSuffixList = None
+
+# Local Package/Modules
+from certmonitor.metrics.registry import metrics
+
+# Local Dataclasses
+from certmonitor.dataclasses.common import ScanSettings
+
+__author__ = "IncognitoCoding"
+__copyright__ = "Copyright 2023, politeness"
+__credits__ = ["IncognitoCoding"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "IncognitoCoding"
+__status__ = "Beta"
+
+# Second-level labels that country code registries sell names under, such as example.co.uk.
+# Used when publicsuffixlist is not installed. Other multi-label suffixes are grouped by their last two labels.
+_SECOND_LEVEL_LABELS = frozenset({"ac", "co", "com", "edu", "go", "gob", "gov", "ltd", "mil", "ne", "net", "or", "org"})
+
+# The public suffix list is loaded once per process on the first lookup. None until it is loaded.
+_public_suffix_list = None
+
+# The network prefix each address is grouped by. Providers usually hand out IPv4 /24 and IPv6 /64 networks.
+_NETWORK_PREFIXES = {4: 24, 6: 64}
+
+
+def get_registered_domain(host: str) -> Union[str, None]:
+    """Gets the registered domain of a host name, such as example.com for www.example.com.
+
+    The public suffix list is used when publicsuffixlist is installed, so hosts under shared suffixes such as
+    user.github.io or app.herokuapp.com each get their own domain. Without it, a heuristic groups hosts by their last
+    two labels, or their last three labels when the second-level label is a common registry label under a two-letter
+    country code, such as example.co.uk. The heuristic groups every host under a shared suffix into one domain, such
+    as github.io, so those hosts share one domain limit.
+
+    Parameters
+    ----------
+    host : str
+        `summary`: The host name or IP address.
+
+    Returns
+    -------
+    Union[str, None]
+        `summary`: The registered domain. None is returned for IP addresses.
+    """
+    global _public_suffix_list
+
+    try:
+        ipaddress.ip_address(host)
+        return None
+    except ValueError:
+        pass
+    host = host.rstrip(".").lower()
+    if PublicSuffixList is not None:
+        if _public_suffix_list is None:
+            _public_suffix_list = PublicSuffixList()
+        # Hosts that are public suffixes themselves, such as github.io, have no registered domain above them.
+        return _public_suffix_list.privatesuffix(host) or host
+    labels = host.split(".")
+    if len(labels) > 2 and len(labels[-1]) == 2 and labels[-2] in _SECOND_LEVEL_LABELS:
+        return ".".join(labels[-3:])
+    return ".".join(labels[-2:])
+
+
+def get_network(ip: str) -> str:
+    """Gets the IPv4 /24 or IPv6 /64 network of an address.
+
+    Parameters
+    ----------
+    ip : str
+        `summary`: The resolved IP address.
+
+    Returns
+    -------
+    str
+        `summary`: The network in CIDR notation. The address is returned unchanged when it cannot be parsed.
+    """
+    try:
+        address = ipaddress.ip_address(ip.split("%")[0])
+    except ValueError:
+        return ip
+    return str(ipaddress.ip_network(f"{address}/{_NETWORK_PREFIXES[address.version]}", strict=False))
+
+
+def split_limits(scan_settings: ScanSettings, worker_count: int) -> ScanSettings:
+    """Splits the politeness limits across worker processes, so the workers together stay within the limits.
+
+    Parameters
+    ----------
+    scan_settings : ScanSettings
+        `summary`: The scan engine settings.
+    worker_count : int
+        `summary`: The number of worker processes that scan at the same time.
+
+    Returns
+    -------
+    ScanSettings
+        `summary`: A copy of the scan settings with the rates and bursts of one worker process.
+    """
+    if worker_count <= 1:
+        return scan_settings
+    return dataclasses.replace(
+        scan_settings,
+        ip_rate=scan_settings.ip_rate / worker_count,
+        ip_burst=max(scan_settings.ip_burst // worker_count, 1),
+        network_rate=scan_settings.network_rate / worker_count,
+        network_burst=max(scan_settings.network_burst // worker_count, 1),
+        domain_rate=scan_settings.domain_rate / worker_count,
+        domain_burst=max(scan_settings.domain_burst // worker_count, 1),
+    )
+
+
+class PolitenessLimiter(object):
+    """Spaces out the new connections with token buckets per resolved IP, per network, and per registered domain.
+
+    Each bucket refills at its rate in connections per second and holds up to its burst. A connection waits until
+    every bucket it belongs to has a token, so checks against other destinations keep running at the full
+    concurrency while one load balancer or provider edge only sees its own rate.
+
+    The buckets are kept as the time each bucket is full again, so a reservation costs a few dictionary lookups and
+    waiting connections sleep once instead of polling. The limiter is used by one event loop and is not thread-safe.
+
+    Parameters
+    ----------
+    scan_settings : ScanSettings
+        `summary`: The scan engine settings. A rate of 0 disables that limit.
+    """
+
+    def __init__(self, scan_settings: ScanSettings) -> None:
+        # The (rate, burst) of each enabled scope.
+        self._limits: dict[str, tuple[float, int]] = {
+            scope: (rate, max(burst, 1))
+            for scope, rate, burst in (
+                ("ip", scan_settings.ip_rate, scan_settings.ip_burst),
+                ("network", scan_settings.network_rate, scan_settings.network_burst),
+                ("domain", scan_settings.domain_rate, scan_settings.domain_burst),
+            )
+            if rate > 0
+        }
+        # The time each bucket is full again, keyed by (scope, key). Buckets that refilled are dropped.
+        self._full_times: dict[tuple[str, str], float] = {}
+        self._prune_size = 1024
+
+    def _prune(self, now: float) -> None:
+        """Drops the buckets that refilled, so the memory use follows the active destinations."""
+        self._full_times = {key: full_time for key, full_time in self._full_times.items() if full_time > now}
+        self._prune_size = max(2 * len(self._full_times), 1024)
+
+    def reserve(
+        self, ip: str, host: str, now: float, deadline: Union[float, None] = None
+    ) -> tuple[Union[float, None], Union[str, None]]:
+        """Takes a token from every bucket of a connection and gets how long the connection must wait for them.
+
+        Parameters
+        ----------
+        ip : str
+            `summary`: The resolved IP address the connection opens.
+        host : str
+            `summary`: The site host name. IP addresses do not have a domain bucket.
+        now : float
+            `summary`: The current event loop time.
+        deadline : Union[float, None], optional
+            `summary`: The event loop time the connection must start by. No tokens are taken when the wait would pass it. Defaults to None.
+
+        Returns
+        -------
+        tuple[Union[float, None], Union[str, None]]
+            `summary`: The seconds to wait before connecting, and the scope that set the wait. None is returned for the wait when it would pass the deadline, and for the scope when the connection does not wait.
+        """
+        if len(self._full_times) > self._prune_size:
+            self._prune(now)
+
+        keys = {
+            "ip": ip,
+            "network": get_network(ip) if "network" in self._limits else None,
+            "domain": get_registered_domain(host) if "domain" in self._limits else None,
+        }
+        buckets: list[tuple[tuple[str, str], float, float]] = []
+        start = now
+        limiting_scope: Union[str, None] = None
+        for scope, (rate, burst) in self._limits.items():
+            key = keys[scope]
+            if key is None:
+                continue
+            bucket = (scope, key)
+            interval = 1 / rate
+            full_time = max(self._full_times.get(bucket, now), now)
+            # The bucket has a token once it is at most burst - 1 intervals from full.
+            allowed_time = full_time - (burst - 1) * interval
+            if allowed_time > start:
+                start = allowed_time
+                limiting_scope = scope
+            buckets.append((bucket, full_time, interval))
+        if deadline is not None and start > deadline:
+            return None, limiting_scope
+        # The tokens are taken at the same start time from every bucket, so a connection never holds one bucket
+        # while it waits for another.
+        for bucket, full_time, interval in buckets:
+            self._full_times[bucket] = max(full_time, start) + interval
+        return start - now, limiting_scope
+
+    async def acquire(self, ip: str, host: str, deadline: Union[float, None] = None) -> bool:
+        """Waits until the connection to an address is allowed by every bucket.
+
+        Parameters
+        ----------
+        ip : str
+            `summary`: The resolved IP address the connection opens.
+        host : str
+            `summary`: The site host name.
+        deadline : Union[float, None], optional
+            `summary`: The event loop time the connection must start by. Defaults to None.
+
+        Returns
+        -------
+        bool
+            `summary`: True when the connection can start. False is returned right away when the wait would pass the deadline.
+        """
+        if not self._limits:
+            return True
+        delay, limiting_scope = self.reserve(ip, host, asyncio.get_running_loop().time(), deadline)
+        if delay is None:
+            return False
+        if delay > 0:
+            metrics.increment("certmonitor_rate_limit_waits_total", scope=limiting_scope or "")
+            metrics.observe("certmonitor_rate_limit_wait_seconds", delay)
+            await asyncio.sleep(delay)
+        return True
@@ -0,0 +1,188 @@
+# Package/Modules
+import logging
+import os
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+# Exceptions
+from fexception import FCustomException
+
+# Local Package/Modules
+from certmonitor.check.politeness import split_limits
+from certmonitor.check.scan import scan_targets
+from certmonitor.check.targets import canonicalize_targets, expand_results
+from certmonitor.metrics.registry import metrics
+
+# Local Dataclasses
+from certmonitor.dataclasses.common import ScanResult, ScanSettings, ScanTarget
+
+# Local Exceptions
+from certmonitor.exceptions.exceptions import CertMonitorError
+
+__author__ = "IncognitoCoding"
+__copyright__ = "Copyright 2023, pool"
+__credits__ = ["IncognitoCoding"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "IncognitoCoding"
+__status__ = "Beta"
+
+# The worker processes are kept between sweeps, so the TLS session, DNS, and chain caches in each worker stay warm.
+# Each pool has one worker process, and a target always goes to the same pool, so it finds its cached entries again.
+_worker_pools: list[ProcessPoolExecutor] = []
+
+
+def _scan_chunk(
+    targets: list[ScanTarget], buffer_days: int, time_zone: str, scan_settings: ScanSettings
+) -> tuple[list[ScanResult], dict]:
+    """Runs the asyncio scan engine for one chunk of scan targets inside a worker process.
+
+    The metrics recorded by the chunk are returned with the results, so the parent process can merge them.
+    """
+    # Forked workers start with a copy of the parent metrics, so only the chunk metrics are sent back.
+    metrics.reset()
+    scan_results = scan_targets(
+        targets=targets, buffer_days=buffer_days, time_zone=time_zone, scan_settings=scan_settings
+    )
+    return scan_results, metrics.snapshot()
+
+
+def get_worker_count(workers: int) -> int:
+    """Gets the number of worker processes to start.
+
+    Parameters
+    ----------
+    workers : int
+        `summary`: The configured worker process count. 0 uses one worker process per CPU core.
+
+    Returns
+    -------
+    int
+        `summary`: The worker process count.
+
+    Raises
+    ------
+    CertMonitorError : fexception
+        `summary`: The scan worker count must be zero or greater.
+    """
+    if workers < 0:
+        exc_args = {
+            "main_message": "The scan worker count must be zero or greater.",
+            "custom_type": CertMonitorError,
+            "returned_result": workers,
+            "suggested_resolution": "Please verify the 'workers' value in the 'scan' section of the YAML file.",
+        }
+        raise CertMonitorError(FCustomException(message_args=exc_args))
+    if workers == 0:
+        return os.cpu_count() or 1
+    return workers
+
+
+def _get_worker_pools(worker_count: int) -> list[ProcessPoolExecutor]:
+    """Gets the kept worker process pools and starts the missing ones."""
+    logger = logging.getLogger(__name__)
+
+    while len(_worker_pools) < worker_count:
+        logger.debug(f"Starting scan worker process {len(_worker_pools) + 1}")
+        _worker_pools.append(ProcessPoolExecutor(max_workers=1))
+    return _worker_pools[:worker_count]
+
+
+def shutdown_worker_pools() -> None:
+    """Stops the worker processes kept between sweeps.
+
+    The next pooled sweep starts new worker processes with empty caches. Call this when a settings reload changes
+    the scan settings, so the workers do not keep caches built with the old scan settings.
+    """
+    logger = logging.getLogger(__name__)
+
+    if _worker_pools:
+        logger.debug(f"Stopping {len(_worker_pools)} scan worker process(es)")
+    while _worker_pools:
+        _worker_pools.pop().shutdown(wait=True, cancel_futures=True)
+
+
+def scan_sites_pooled(
+    site_urls: list[str], buffer_days: int, time_zone: str, scan_settings: ScanSettings
+) -> list[ScanResult]:
+    """Splits the site URLs across a pool of worker processes and merges the results back into one sweep.
+
+    Each worker process runs its own asyncio scan engine, so TLS handshakes and certificate parsing are spread across CPU cores.
+    Duplicate site URLs are collapsed into one target before the split, so a duplicate is never checked twice.
+    The worker processes are kept between sweeps, and the targets are split by host, so each host is checked by the
+    same worker process every sweep and reuses the TLS sessions, DNS answers, and parsed chains cached there.
+
+    Parameters
+    ----------
+    site_urls : list[str]
+        `summary`: The site URLs that need to be checked.
+    buffer_days : int
+        `summary`: Days to buffer certificate expiring before notifying.
+    time_zone : str
+        `summary`: Time zone the program is running.
+    scan_settings : ScanSettings
+        `summary`: The scan engine settings. The worker count and per-worker concurrency are set here.
+
+    Returns
+    -------
+    list[ScanResult]
+        `summary`: The merged scan results in the same order as the site URLs.
+
+    Raises
+    ------
+    CertMonitorError : fexception
+        `summary`: The site URL '{site_url}' is not a valid HTTPS target.
+    """
+    logger = logging.getLogger(__name__)
+
+    targets, target_indexes = canonicalize_targets(site_urls)
+    if len(targets) < len(site_urls):
+        logger.info(f"Checking {len(targets)} unique target(s) for {len(site_urls)} URL(s)")
+
+    worker_count = get_worker_count(scan_settings.workers)
+    # A single worker does not need the process pool overhead. The caches stay in this process.
+    if worker_count == 1 or len(targets) <= 1:
+        scan_results = scan_targets(
+            targets=targets, buffer_days=buffer_days, time_zone=time_zone, scan_settings=scan_settings
+        )
+        return expand_results(site_urls, target_indexes, scan_results)
+
+    # Splits the targets by a stable hash of the host, so a host goes to the same worker process on every sweep.
+    # The split does not depend on the target count, so a short sweep does not move the hosts to other workers.
+    chunk_indexes: list[list[int]] = [[] for _ in range(worker_count)]
+    for index, target in enumerate(targets):
+        chunk_indexes[zlib.crc32(target.host.encode()) % worker_count].append(index)
+    used_workers = [worker for worker, indexes in enumerate(chunk_indexes) if indexes]
+    logger.debug(f"Scanning {len(targets)} target(s) across {len(used_workers)} worker process(es)")
+    # The worker processes scan at the same time, so each one gets its share of the politeness limits.
+    worker_settings = split_limits(scan_settings, len(used_workers))
+
+    pools = _get_worker_pools(worker_count)
+    try:
+        futures = [
+            (
+                chunk_indexes[worker],
+                pools[worker].submit(
+                    _scan_chunk,
+                    [targets[index] for index in chunk_indexes[worker]],
+                    buffer_days,
+                    time_zone,
+                    worker_settings,
+                ),
+            )
+            for worker in used_workers
+        ]
+        # Puts the chunk results back in the target order.
+        scan_results: list = [None] * len(targets)
+        for indexes, future in futures:
+            chunk_results, chunk_metrics = future.result()
+            for index, scan_result in zip(indexes, chunk_results):
+                scan_results[index] = scan_result
+            metrics.merge(chunk_metrics)
+    except BrokenProcessPool:
+        # A worker process died, so the kept pools are stopped and new worker processes are started on the next sweep.
+        shutdown_worker_pools()
+        raise
+
+    return expand_results(site_urls, target_indexes, scan_results)
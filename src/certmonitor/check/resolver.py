@@ -0,0 +1,119 @@
+# Package/Modules
+import asyncio
+import logging
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Union
+
+# Local Package/Modules
+from certmonitor.metrics.registry import metrics
+
+# Local Dataclasses
+from certmonitor.dataclasses.common import ScanSettings
+
+__author__ = "IncognitoCoding"
+__copyright__ = "Copyright 2023, resolver"
+__credits__ = ["IncognitoCoding"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "IncognitoCoding"
+__status__ = "Beta"
+
+# Maximum number of resolver threads. getaddrinfo blocks, so each in-flight lookup holds one thread.
+RESOLVER_THREADS_MAX = 64
+
+# Resolved addresses keyed by host. Each entry holds the monotonic expiration time and the getaddrinfo results.
+# The cache lives for the whole process, so continuous monitoring loops reuse the answers until the TTL runs out.
+_dns_cache: dict[str, tuple[float, list]] = {}
+
+
+def _release_thread(loop: asyncio.AbstractEventLoop, threads: asyncio.Semaphore) -> None:
+    """Frees a resolver thread slot from the thread that finished the lookup."""
+    try:
+        loop.call_soon_threadsafe(threads.release)
+    except RuntimeError:
+        # The event loop closed before a timed out lookup returned.
+        pass
+
+
+async def _resolve(
+    loop: asyncio.AbstractEventLoop,
+    executor: ThreadPoolExecutor,
+    threads: asyncio.Semaphore,
+    host: str,
+    timeout: Union[float, None],
+) -> list:
+    """Resolves a single host in the resolver thread pool under the DNS timeout.
+
+    The timeout starts once a resolver thread is free, so hosts queued behind other lookups are not timed out early.
+    """
+    await threads.acquire()
+    lookup = executor.submit(socket.getaddrinfo, host, None, 0, socket.SOCK_STREAM)
+    # A timed out lookup keeps its thread until getaddrinfo returns, so the slot is freed with the thread.
+    lookup.add_done_callback(lambda _: _release_thread(loop, threads))
+    try:
+        with metrics.time("certmonitor_phase_seconds", phase="dns"):
+            return await asyncio.wait_for(asyncio.wrap_future(lookup, loop=loop), timeout or None)
+    except asyncio.TimeoutError:
+        raise TimeoutError(f"The DNS resolution timed out after {timeout} seconds.") from None
+
+
+async def resolve_hosts(hosts: list[str], scan_settings: ScanSettings) -> dict[str, Union[list, Exception]]:
+    """Resolves every host in bulk before the TLS phase starts.
+
+    Cached answers are reused until the DNS cache TTL runs out. Failed lookups are returned as the raised exception
+    and are not cached, so they are retried on the next sweep. The DNS timeout of each host starts when a resolver
+    thread picks up its lookup.
+
+    Parameters
+    ----------
+    hosts : list[str]
+        `summary`: The host names that need to be resolved. Duplicates are resolved once.
+    scan_settings : ScanSettings
+        `summary`: The scan engine settings. The DNS timeout and cache TTL are set here.
+
+    Returns
+    -------
+    dict[str, Union[list, Exception]]
+        `summary`: The getaddrinfo results or the lookup failure for each host. Addresses carry port 0.
+    """
+    logger = logging.getLogger(__name__)
+
+    loop = asyncio.get_running_loop()
+    now = time.monotonic()
+
+    # Removes expired answers, so hosts dropped from the YAML file do not stay cached.
+    for host in [host for host, (expires, _) in _dns_cache.items() if expires <= now]:
+        del _dns_cache[host]
+
+    resolutions: dict[str, Union[list, Exception]] = {}
+    pending: list[str] = []
+    for host in dict.fromkeys(hosts):
+        if host in _dns_cache:
+            resolutions[host] = _dns_cache[host][1]
+        else:
+            pending.append(host)
+    logger.debug(f"Resolving {len(pending)} host(s). {len(resolutions)} host(s) were answered from the DNS cache")
+
+    if pending:
+        thread_count = min(len(pending), scan_settings.concurrency, RESOLVER_THREADS_MAX)
+        executor = ThreadPoolExecutor(max_workers=thread_count, thread_name_prefix="certmonitor-resolver")
+        # Limits the in-flight lookups to the thread count, so no lookup waits for a thread under its timeout.
+        threads = asyncio.Semaphore(thread_count)
+        try:
+            answers = await asyncio.gather(
+                *(_resolve(loop, executor, threads, host, scan_settings.dns_timeout) for host in pending),
+                return_exceptions=True,
+            )
+        finally:
+            # Timed out lookups can still hold a thread. The sweep does not wait for them.
+            executor.shutdown(wait=False)
+
+        expires = time.monotonic() + scan_settings.dns_cache_ttl
+        for host, answer in zip(pending, answers):
+            resolutions[host] = answer
+            if not isinstance(answer, BaseException) and scan_settings.dns_cache_ttl > 0:
+                _dns_cache[host] = (expires, answer)
+
+    return resolutions
@@ -0,0 +1,803 @@
+# Package/Modules
+import asyncio
+import hashlib
+import logging
+import socket
+import ssl
+from itertools import islice
+from typing import Callable, Iterable, Union
+
+# Exceptions
+from fexception import FCustomException
+
+# Local Package/Modules
+from certmonitor.check.certificate import build_ssl_return
+from certmonitor.check.chain import evaluate_chain_expiration, get_presented_chain, parse_chain
+from certmonitor.check.context import (
+    get_probe_context,
+    get_ssl_context,
+    get_tls_session,
+    get_tls_session_chain,
+    store_tls_session,
+)
+from certmonitor.check.politeness import PolitenessLimiter
+from certmonitor.check.resolver import resolve_hosts
+from certmonitor.check.targets import canonicalize_targets, expand_results
+from certmonitor.check.verify import ChainCheck, verify_chains
+from certmonitor.files.der import parse_certificate
+from certmonitor.metrics.registry import metrics
+
+# Local Dataclasses
+from certmonitor.dataclasses.common import SSLReturn, ScanResult, ScanSettings, ScanTarget
+
+# Local Exceptions
+from certmonitor.exceptions.exceptions import CertMonitorError
+
+__author__ = "IncognitoCoding"
+__copyright__ = "Copyright 2023, scan"
+__credits__ = ["IncognitoCoding"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "IncognitoCoding"
+__status__ = "Beta"
+
+# Number of targets resolved and queued at a time by stream_targets(). One batch waits behind the running checks,
+# so large target lists are checked with bounded memory while DNS for the next batch overlaps the handshakes.
+STREAM_BATCH_SIZE = 1000
+
+# The metric label recorded for each connection phase.
+_PHASE_LABELS = {"TCP connect": "connect", "TLS handshake": "handshake", "TLS read": "read", "TLS close": "close"}
+
+
+async def _run_phase(phase: str, awaitable, timeout: Union[float, None]):
+    """Awaits a single connection phase and converts a timeout into a message that names the phase.
+
+    A timeout of 0 or None waits without a limit. The phase latency is recorded, including failed and timed out phases.
+    """
+    try:
+        with metrics.time("certmonitor_phase_seconds", phase=_PHASE_LABELS.get(phase, phase)):
+            return await asyncio.wait_for(awaitable, timeout or None)
+    except asyncio.TimeoutError:
+        raise TimeoutError(f"The {phase} timed out after {timeout} seconds.") from None
+
+
+async def _flush(loop: asyncio.AbstractEventLoop, sock: socket.socket, outgoing: ssl.MemoryBIO) -> None:
+    """Sends the pending TLS records from the outgoing memory buffer."""
+    data = outgoing.read()
+    if data:
+        await loop.sock_sendall(sock, data)
+
+
+async def _fill(loop: asyncio.AbstractEventLoop, sock: socket.socket, incoming: ssl.MemoryBIO) -> None:
+    """Receives TLS records from the site into the incoming memory buffer."""
+    data = await loop.sock_recv(sock, 16384)
+    if not data:
+        raise ConnectionResetError("The site closed the connection during the TLS exchange.")
+    incoming.write(data)
+
+
+async def _tls_handshake(
+    loop: asyncio.AbstractEventLoop,
+    sock: socket.socket,
+    ssl_object: ssl.SSLObject,
+    incoming: ssl.MemoryBIO,
+    outgoing: ssl.MemoryBIO,
+) -> None:
+    """Runs the TLS handshake for the SSL object over the non-blocking socket."""
+    while True:
+        try:
+            ssl_object.do_handshake()
+            break
+        except ssl.SSLWantReadError:
+            await _flush(loop, sock, outgoing)
+            await _fill(loop, sock, incoming)
+    # Sends the final handshake records.
+    await _flush(loop, sock, outgoing)
+
+
+async def _open_connection(
+    loop: asyncio.AbstractEventLoop, site_url: str, address_info: list, port: int, connect_timeout: float
+) -> socket.socket:
+    """Connects to the first resolved address that accepts the connection, the same as socket.create_connection."""
+    connect_exc: Union[Exception, None] = None
+    for family, sock_type, proto, _, address in address_info:
+        sock = socket.socket(family, sock_type, proto)
+        sock.setblocking(False)
+        # The resolver returns addresses without a port.
+        address = (address[0], port, *address[2:])
+        try:
+            await _run_phase("TCP connect", loop.sock_connect(sock, address), connect_timeout)
+            return sock
+        except BaseException as exc:
+            sock.close()
+            # Cancellations from the sweep deadline are not connect failures.
+            if not isinstance(exc, Exception):
+                raise
+            connect_exc = exc
+    raise connect_exc or OSError(f"No address was resolved for {site_url}.")
+
+
+async def _read_session_ticket(
+    loop: asyncio.AbstractEventLoop, sock: socket.socket, ssl_object: ssl.SSLObject, incoming: ssl.MemoryBIO
+) -> None:
+    """Reads the post-handshake records until a TLS 1.3 session ticket is received."""
+    while not ssl_object.session or not ssl_object.session.has_ticket:
+        try:
+            ssl_object.read(1)
+        except ssl.SSLWantReadError:
+            await _fill(loop, sock, incoming)
+
+
+async def pull_peer_certificate(
+    site_url: str,
+    context: ssl.SSLContext,
+    scan_settings: ScanSettings,
+    address_info: Union[list, None] = None,
+    port: int = 443,
+    server_name: Union[str, None] = None,
+) -> tuple[dict, bytes, tuple[tuple[dict, float, str], ...]]:
+    """Pulls the peer certificate and the presented chain from the site without blocking the event loop.
+
+    The DNS, connect, handshake, and read phases each run under their own timeout from the scan settings.
+    Sites resolved ahead of time by the bulk resolver skip the DNS phase.
+    TLS sessions are cached per site and resumed on the next check when the session cache is enabled.
+    The chain comes from the same handshake. Resumed sessions report the chain from the original handshake.
+
+    Parameters
+    ----------
+    site_url : str
+        `summary`: The site host name or IP address.
+    context : ssl.SSLContext
+        `summary`: The SSL context used for the handshake.
+    scan_settings : ScanSettings
+        `summary`: The scan engine settings.
+    address_info : Union[list, None], optional
+        `summary`: The pre-resolved getaddrinfo results for the site. The site is resolved when not set. Defaults to None.
+    port : int, optional
+        `summary`: The TCP port the site is checked on. Defaults to 443.
+    server_name : Union[str, None], optional
+        `summary`: The TLS server name sent and verified. Defaults to None, which uses the site host.
+
+    Returns
+    -------
+    tuple[dict, bytes, tuple[tuple[dict, float, str], ...]]
+        `summary`: The peer certificate dictionary from getpeercert(), the DER encoded peer certificate, and the parsed chain certificates from parse_chain().
+
+    Raises
+    ------
+    CertMonitorError : fexception
+        `summary`: A failure occurred while getting SSL information for {site_url}.
+    """
+    logger = logging.getLogger(__name__)
+
+    loop = asyncio.get_running_loop()
+    server_name = server_name or site_url
+    # TLS sessions are only resumed for the same address, port, and server name.
+    session_key = f"{site_url}:{port}/{server_name}"
+    try:
+        if address_info is None:
+            resolution = (await resolve_hosts([site_url], scan_settings))[site_url]
+            if isinstance(resolution, Exception):
+                raise resolution
+            address_info = resolution
+
+        sock = await _open_connection(loop, site_url, address_info, port, scan_settings.connect_timeout)
+
+        try:
+            # The handshake runs over memory buffers, so a cached TLS session can be offered for resumption.
+            incoming = ssl.MemoryBIO()
+            outgoing = ssl.MemoryBIO()
+            session = (
+                get_tls_session(session_key, scan_settings.session_max_age) if scan_settings.session_cache else None
+            )
+            ssl_object = context.wrap_bio(incoming, outgoing, server_hostname=server_name, session=session)
+            await _run_phase(
+                "TLS handshake",
+                _tls_handshake(loop, sock, ssl_object, incoming, outgoing),
+                scan_settings.handshake_timeout,
+            )
+
+            logger.debug(f"Getting the SSL certificate information from {site_url}")
+            raw_ssl_info = ssl_object.getpeercert()
+            der_certificate = ssl_object.getpeercert(binary_form=True)
+            if ssl_object.session_reused:
+                chain = get_tls_session_chain(session_key)
+            else:
+                chain = parse_chain(get_presented_chain(ssl_object))
+
+            if scan_settings.session_cache:
+                if ssl_object.session_reused:
+                    logger.debug(f"The cached TLS session for {site_url} was resumed")
+                else:
+                    # TLS 1.3 session tickets arrive after the handshake, so they are read before the session is stored.
+                    if ssl_object.version() == "TLSv1.3":
+                        try:
+                            await _run_phase(
+                                "TLS read",
+                                _read_session_ticket(loop, sock, ssl_object, incoming),
+                                scan_settings.read_timeout,
+                            )
+                        except (ssl.SSLError, OSError):
+                            # The certificate is already pulled, so a site without session tickets is not a failure.
+                            pass
+                    store_tls_session(session_key, ssl_object.session, chain)
+
+            try:
+                # Sends the TLS close notification without waiting for the site to answer it.
+                ssl_object.unwrap()
+            except ssl.SSLError:
+                pass
+            try:
+                await _run_phase("TLS close", _flush(loop, sock, outgoing), scan_settings.read_timeout)
+            except OSError:
+                # The certificate is already pulled, so a failed or slow TLS close is ignored.
+                pass
+        finally:
+            sock.close()
+        return raw_ssl_info, der_certificate, chain
+    except Exception as exc:
+        exc_args = {
+            "main_message": f"A failure occurred while getting SSL information for {site_url}.",
+            "custom_type": CertMonitorError,
+            "returned_result": {exc},
+            "suggested_resolution": "Please validate that the website is an HTTPS supported website.",
+        }
+        raise CertMonitorError(FCustomException(message_args=exc_args))
+
+
+async def probe_peer_chain(
+    site_url: str,
+    context: ssl.SSLContext,
+    scan_settings: ScanSettings,
+    address_info: Union[list, None] = None,
+    port: int = 443,
+    server_name: Union[str, None] = None,
+) -> list[bytes]:
+    """Fetches the raw certificate chain the site presents and closes the connection right after the handshake.
+
+    The handshake runs with the unverified probe context, so a chain that would fail verification is still returned.
+    Nothing is read or sent after the handshake, not even the TLS close notification, and no TLS session is cached.
+    The chain must be verified separately with verify_chains().
+
+    Parameters
+    ----------
+    site_url : str
+        `summary`: The site host name or IP address.
+    context : ssl.SSLContext
+        `summary`: The unverified SSL context from get_probe_context().
+    scan_settings : ScanSettings
+        `summary`: The scan engine settings.
+    address_info : Union[list, None], optional
+        `summary`: The pre-resolved getaddrinfo results for the site. The site is resolved when not set. Defaults to None.
+    port : int, optional
+        `summary`: The TCP port the site is checked on. Defaults to 443.
+    server_name : Union[str, None], optional
+        `summary`: The TLS server name sent. Defaults to None, which uses the site host.
+
+    Returns
+    -------
+    list[bytes]
+        `summary`: The DER encoded certificates the site presented, starting with the site certificate.
+
+    Raises
+    ------
+    CertMonitorError : fexception
+        `summary`: A failure occurred while getting SSL information for {site_url}.
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        if address_info is None:
+            resolution = (await resolve_hosts([site_url], scan_settings))[site_url]
+            if isinstance(resolution, Exception):
+                raise resolution
+            address_info = resolution
+
+        sock = await _open_connection(loop, site_url, address_info, port, scan_settings.connect_timeout)
+        try:
+            incoming = ssl.MemoryBIO()
+            outgoing = ssl.MemoryBIO()
+            ssl_object = context.wrap_bio(incoming, outgoing, server_hostname=server_name or site_url)
+            await _run_phase(
+                "TLS handshake",
+                _tls_handshake(loop, sock, ssl_object, incoming, outgoing),
+                scan_settings.handshake_timeout,
+            )
+            # Python versions without the presented chain only return the site certificate.
+            der_chain = get_presented_chain(ssl_object) or [ssl_object.getpeercert(binary_form=True)]
+        finally:
+            sock.close()
+        return der_chain
+    except Exception as exc:
+        exc_args = {
+            "main_message": f"A failure occurred while getting SSL information for {site_url}.",
+            "custom_type": CertMonitorError,
+            "returned_result": {exc},
+            "suggested_resolution": "Please validate that the website is an HTTPS supported website.",
+        }
+        raise CertMonitorError(FCustomException(message_args=exc_args))
+
+
+async def ssl_pull_async(
+    site_url: str,
+    context: ssl.SSLContext,
+    scan_settings: ScanSettings,
+    address_info: Union[list, None] = None,
+    port: int = 443,
+    server_name: Union[str, None] = None,
+) -> Union[SSLReturn, None]:
+    """Pulls the SSL website certificate expiration date without blocking the event loop.
+
+    Parameters
+    ----------
+    site_url : str
+        `summary`: The site URL
+    context : ssl.SSLContext
+        `summary`: The SSL context used for the handshake.
+    scan_settings : ScanSettings
+        `summary`: The scan engine settings.
+    address_info : Union[list, None], optional
+        `summary`: The pre-resolved getaddrinfo results for the site. The site is resolved when not set. Defaults to None.
+    port : int, optional
+        `summary`: The TCP port the site is checked on. Defaults to 443.
+    server_name : Union[str, None], optional
+        `summary`: The TLS server name sent and verified. Defaults to None, which uses the site host.
+
+    Returns
+    -------
+    SSLReturn
+        `summary`: The SSL certificate return information.
+
+    Raises
+    ------
+    CertMonitorError : fexception
+        `summary`: A failure occurred while getting SSL information for {site_url}.
+    """
+    raw_ssl_info, _, _ = await pull_peer_certificate(site_url, context, scan_settings, address_info, port, server_name)
+    return build_ssl_return(raw_ssl_info)
+
+
+def _not_checked_result(site_url: str) -> ScanResult:
+    """Creates the scan result for a site that was not checked before the sweep deadline."""
+    return ScanResult(
+        site_url=site_url,
+        expiration_msg=None,
+        error=None,
+        checked=False,
+        resolved=True,
+        reachable=True,
+        ssl_return=None,
+        fingerprint=None,
+        not_after_epoch=None,
+        cached=False,
+        source="url",
+        chain_error=None,
+    )
+
+
+async def _check_site(
+    target: ScanTarget,
+    semaphore: asyncio.Semaphore,
+    context: ssl.SSLContext,
+    buffer_days: int,
+    time_zone: str,
+    scan_settings: ScanSettings,
+    deadline: Union[float, None],
+    resolution: Union[list, Exception],
+    limiter: Union[PolitenessLimiter, None] = None,
+    chains: Union[list[ChainCheck], None] = None,
+) -> ScanResult:
+    """Checks a single site while holding a slot from the concurrency limit.
+
+    Failures are returned in the scan result instead of raised, so one site never stops the sweep.
+    DNS failures from the bulk resolver are returned as not resolved without opening a connection.
+    Sites that cannot finish before the sweep deadline are returned as not checked.
+    The site waits for the politeness limits of its first resolved address before it takes a concurrency slot, so
+    sites queued behind one busy destination do not hold the slots other destinations could use.
+    In probe mode, the presented chain of each probed site is added to the chains list, so the caller can verify the
+    chains in batch once the connections are closed.
+    The results carry the target name. The caller maps them back to the site URLs.
+    """
+    logger = logging.getLogger(__name__)
+
+    site_url = target.name
+    if isinstance(resolution, Exception):
+        logger.debug(f"The DNS resolution failed for {site_url}")
+        exc_args = {
+            "main_message": f"The DNS resolution failed for {target.host}.",
+            "custom_type": CertMonitorError,
+            "returned_result": {resolution},
+            "suggested_resolution": "Please verify the website name is correct and still exists.",
+        }
+        return ScanResult(
+            site_url=site_url,
+            expiration_msg=None,
+            error=str(CertMonitorError(FCustomException(message_args=exc_args, tb_limit=0))),
+            checked=True,
+            resolved=False,
+            reachable=False,
+            ssl_return=None,
+            fingerprint=None,
+            not_after_epoch=None,
+            cached=False,
+            source="url",
+            chain_error=None,
+        )
+
+    loop = asyncio.get_running_loop()
+    if limiter and resolution and not await limiter.acquire(resolution[0][4][0], target.host, deadline):
+        logger.debug(f"The politeness limits would hold {site_url} past the sweep deadline")
+        return _not_checked_result(site_url)
+    async with semaphore:
+        remaining: Union[float, None] = None
+        if deadline is not None:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                logger.debug(f"The sweep deadline was reached before {site_url} was checked")
+                return _not_checked_result(site_url)
+
+        logger.debug(f"Checking site {site_url} for SSL information")
+        # Times the connection, handshake, and parse of the site. The DNS lookup and the slot wait are not included.
+        with metrics.time("certmonitor_host_check_seconds"):
+            try:
+                der_chain: list[bytes] = []
+                if scan_settings.probe_mode:
+                    der_chain = await asyncio.wait_for(
+                        probe_peer_chain(
+                            target.host, context, scan_settings, resolution, target.port, target.server_name
+                        ),
+                        remaining,
+                    )
+                    der_certificate = der_chain[0]
+                else:
+                    raw_ssl_info, der_certificate, chain = await asyncio.wait_for(
+                        pull_peer_certificate(
+                            target.host, context, scan_settings, resolution, target.port, target.server_name
+                        ),
+                        remaining,
+                    )
+                with metrics.time("certmonitor_phase_seconds", phase="parse"):
+                    if der_chain:
+                        # The probe handshake is not verified, so the site certificate is parsed from the raw chain.
+                        leaf = parse_certificate(der_certificate)
+                        raw_ssl_info = leaf[0]
+                        chain = parse_chain(der_chain)
+                    ssl_output = build_ssl_return(raw_ssl_info)
+                    # Reports the certificate that expires first, so an expiring intermediate is not hidden by the site certificate.
+                    expiration_msg, not_after_epoch = evaluate_chain_expiration(
+                        site_url=site_url,
+                        ssl_output=ssl_output,
+                        chain=chain,
+                        buffer_days=buffer_days,
+                        time_zone=time_zone,
+                    )
+                    fingerprint = hashlib.sha256(der_certificate).hexdigest() if der_certificate else None
+                scan_result = ScanResult(
+                    site_url=site_url,
+                    expiration_msg=expiration_msg,
+                    error=None,
+                    checked=True,
+                    resolved=True,
+                    reachable=True,
+                    ssl_return=ssl_output,
+                    fingerprint=fingerprint,
+                    not_after_epoch=not_after_epoch,
+                    cached=False,
+                    source="url",
+                    chain_error=None,
+                )
+                if der_chain and chains is not None:
+                    chains.append((scan_result, target.server_name or target.host, der_chain, leaf, chain))
+                return scan_result
+            except asyncio.TimeoutError:
+                logger.debug(f"The sweep deadline was reached while {site_url} was being checked")
+                return _not_checked_result(site_url)
+            except Exception as exc:
+                # The failure is wrapped in a CertMonitorError, so the original failure is read from the context.
+                # Connection failures and timeouts are OSErrors. Verification and TLS protocol failures are SSLErrors.
+                failure = exc.__context__
+                return ScanResult(
+                    site_url=site_url,
+                    expiration_msg=None,
+                    error=str(exc),
+                    checked=True,
+                    resolved=True,
+                    reachable=not isinstance(failure, OSError) or isinstance(failure, ssl.SSLError),
+                    ssl_return=None,
+                    fingerprint=None,
+                    not_after_epoch=None,
+                    cached=False,
+                    source="url",
+                    chain_error=None,
+                )
+
+
+async def _scan(
+    targets: list[ScanTarget], buffer_days: int, time_zone: str, scan_settings: ScanSettings
+) -> list[ScanResult]:
+    """Runs all site checks on the event loop under the concurrency limit, politeness limits, and sweep deadline.
+
+    Every host is resolved in bulk first, so DNS latency is not added to each handshake. In probe mode, the presented
+    chains are verified in one batch after the last connection is closed.
+    """
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(scan_settings.concurrency)
+    limiter = PolitenessLimiter(scan_settings)
+    context = get_probe_context() if scan_settings.probe_mode else get_ssl_context()
+    chains: list[ChainCheck] = []
+    # A sweep deadline of 0 disables the deadline.
+    deadline = loop.time() + scan_settings.sweep_deadline if scan_settings.sweep_deadline else None
+
+    # Targets on different ports or with different server names share one lookup per host.
+    resolutions = await resolve_hosts([target.host for target in targets], scan_settings)
+    scan_results = await asyncio.gather(
+        *(
+            _check_site(
+                target,
+                semaphore,
+                context,
+                buffer_days,
+                time_zone,
+                scan_settings,
+                deadline,
+                resolutions[target.host],
+                limiter,
+                chains,
+            )
+            for target in targets
+        )
+    )
+    verify_chains(chains)
+    return scan_results
+
+
+def _validate_concurrency(scan_settings: ScanSettings) -> None:
+    """Raises an error when the scan concurrency would never start a check."""
+    if scan_settings.concurrency < 1:
+        exc_args = {
+            "main_message": "The scan concurrency must be greater than zero.",
+            "custom_type": CertMonitorError,
+            "returned_result": scan_settings.concurrency,
+            "suggested_resolution": "Please verify the 'concurrency' value in the 'scan' section of the YAML file.",
+        }
+        raise CertMonitorError(FCustomException(message_args=exc_args))
+
+
+def scan_targets(
+    targets: list[ScanTarget], buffer_days: int, time_zone: str, scan_settings: ScanSettings
+) -> list[ScanResult]:
+    """Checks the certificate expiration for many scan targets at the same time.
+
+    The handshakes run concurrently on an asyncio event loop, so a sweep takes roughly as long as the slowest batch instead of the sum of every site.
+
+    Parameters
+    ----------
+    targets : list[ScanTarget]
+        `summary`: The canonical scan targets that need to be checked.
+    buffer_days : int
+        `summary`: Days to buffer certificate expiring before notifying.
+    time_zone : str
+        `summary`: Time zone the program is running.
+    scan_settings : ScanSettings
+        `summary`: The scan engine settings.
+
+    Returns
+    -------
+    list[ScanResult]
+        `summary`: The scan results in the same order as the targets. Each result carries the target name.
+
+    Raises
+    ------
+    CertMonitorError : fexception
+        `summary`: The scan concurrency must be greater than zero.
+    """
+    logger = logging.getLogger(__name__)
+
+    _validate_concurrency(scan_settings)
+
+    logger.debug(f"Scanning {len(targets)} target(s) with a concurrency limit of {scan_settings.concurrency}")
+    return asyncio.run(_scan(targets, buffer_days, time_zone, scan_settings))
+
+
+async def _stream(
+    targets: Iterable[ScanTarget],
+    buffer_days: int,
+    time_zone: str,
+    scan_settings: ScanSettings,
+    on_result: Callable[[ScanResult], None],
+) -> int:
+    """Runs the site checks batch by batch and reports each result as soon as its check finishes.
+
+    In probe mode, the chains of the finished checks are verified in batch before their results are reported.
+    """
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(scan_settings.concurrency)
+    limiter = PolitenessLimiter(scan_settings)
+    context = get_probe_context() if scan_settings.probe_mode else get_ssl_context()
+    chains: list[ChainCheck] = []
+    deadline = loop.time() + scan_settings.sweep_deadline if scan_settings.sweep_deadline else None
+    batch_size = max(STREAM_BATCH_SIZE, scan_settings.concurrency)
+
+    pending: set[asyncio.Task] = set()
+    result_count = 0
+
+    async def report(limit: int) -> None:
+        nonlocal pending, result_count
+        while len(pending) > limit:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            if chains:
+                # Every chain in the list belongs to a finished check, so the list is handed off and cleared at once.
+                # The batch is verified in an executor thread, so the handshakes in flight keep running.
+                checks = chains.copy()
+                chains.clear()
+                await loop.run_in_executor(None, verify_chains, checks)
+            for task in done:
+                on_result(task.result())
+                result_count += 1
+
+    target_iterator = iter(targets)
+    while True:
+        batch = list(islice(target_iterator, batch_size))
+        if not batch:
+            break
+        resolutions = await resolve_hosts([target.host for target in batch], scan_settings)
+        for target in batch:
+            pending.add(
+                asyncio.create_task(
+                    _check_site(
+                        target,
+                        semaphore,
+                        context,
+                        buffer_days,
+                        time_zone,
+                        scan_settings,
+                        deadline,
+                        resolutions[target.host],
+                        limiter,
+                        chains,
+                    )
+                )
+            )
+        # Reads the next batch once the queue is down to one batch, so the semaphore never runs dry between batches.
+        await report(batch_size)
+    await report(0)
+    return result_count
+
+
+def stream_targets(
+    targets: Iterable[ScanTarget],
+    buffer_days: int,
+    time_zone: str,
+    scan_settings: ScanSettings,
+    on_result: Callable[[ScanResult], None],
+) -> int:
+    """Checks the certificate expiration for scan targets and reports each result as its check finishes.
+
+    The targets are read lazily in batches, and no result is kept after it is reported, so the memory use does not
+    grow with the number of targets. The results arrive in completion order, not target order. The checks run in the
+    calling process, so the worker count from the scan settings is not used.
+
+    Parameters
+    ----------
+    targets : Iterable[ScanTarget]
+        `summary`: The scan targets that need to be checked. Duplicates are checked each time they appear.
+    buffer_days : int
+        `summary`: Days to buffer certificate expiring before notifying.
+    time_zone : str
+        `summary`: Time zone the program is running.
+    scan_settings : ScanSettings
+        `summary`: The scan engine settings.
+    on_result : Callable[[ScanResult], None]
+        `summary`: Called with each scan result. Each result carries the target name.
+
+    Returns
+    -------
+    int
+        `summary`: The number of reported results.
+
+    Raises
+    ------
+    CertMonitorError : fexception
+        `summary`: The scan concurrency must be greater than zero.
+    """
+    logger = logging.getLogger(__name__)
+
+    _validate_concurrency(scan_settings)
+
+    logger.debug(f"Streaming the scan results with a concurrency limit of {scan_settings.concurrency}")
+    return asyncio.run(_stream(targets, buffer_days, time_zone, scan_settings, on_result))
+
+
+def scan_sites(site_urls: list[str], buffer_days: int, time_zone: str, scan_settings: ScanSettings) -> list[ScanResult]:
+    """Checks the certificate expiration for many sites at the same time.
+
+    The site URLs are collapsed into unique (host, port, server name) targets first, so duplicates are checked once
+    and the result is mapped back to every site URL.
+
+    Parameters
+    ----------
+    site_urls : list[str]
+        `summary`: The site URLs that need to be checked.
+    buffer_days : int
+        `summary`: Days to buffer certificate expiring before notifying.
+    time_zone : str
+        `summary`: Time zone the program is running.
+    scan_settings : ScanSettings
+        `summary`: The scan engine settings.
+
+    Returns
+    -------
+    list[ScanResult]
+        `summary`: The scan results in the same order as the site URLs.
+
+    Raises
+    ------
+    CertMonitorError : fexception
+        `summary`: The site URL '{site_url}' is not a valid HTTPS target.
+    CertMonitorError : fexception
+        `summary`: The scan concurrency must be greater than zero.
+    """
+    targets, target_indexes = canonicalize_targets(site_urls)
+    target_results = scan_targets(
+        targets=targets, buffer_days=buffer_days, time_zone=time_zone, scan_settings=scan_settings
+    )
+    return expand_results(site_urls, target_indexes, target_results)
+
+
+async def _probe_target(
+    target: ScanTarget,
+    semaphore: asyncio.Semaphore,
+    scan_settings: ScanSettings,
+    resolution: Union[list, Exception],
+    limiter: PolitenessLimiter,
+) -> Union[str, None]:
+    """Opens and closes a TCP connection to the target without a TLS handshake."""
+    if isinstance(resolution, Exception):
+        return f"The DNS resolution failed for {target.host}. {resolution}"
+    loop = asyncio.get_running_loop()
+    if resolution:
+        await limiter.acquire(resolution[0][4][0], target.host)
+    async with semaphore:
+        try:
+            sock = await _open_connection(loop, target.host, resolution, target.port, scan_settings.connect_timeout)
+        except Exception as exc:
+            return str(exc)
+        sock.close()
+        return None
+
+
+async def _probe(targets: list[ScanTarget], scan_settings: ScanSettings) -> list[Union[str, None]]:
+    """Runs all connection probes on the event loop under the concurrency and politeness limits."""
+    semaphore = asyncio.Semaphore(scan_settings.concurrency)
+    limiter = PolitenessLimiter(scan_settings)
+    resolutions = await resolve_hosts([target.host for target in targets], scan_settings)
+    return await asyncio.gather(
+        *(_probe_target(target, semaphore, scan_settings, resolutions[target.host], limiter) for target in targets)
+    )
+
+
+def probe_sites(site_urls: list[str], scan_settings: ScanSettings) -> dict[str, Union[str, None]]:
+    """Checks that the sites accept a TCP connection without a TLS handshake.
+
+    The probe only costs a DNS lookup and a connect, so sites that keep failing can be tested cheaply before a
+    full certificate check is tried again.
+
+    Parameters
+    ----------
+    site_urls : list[str]
+        `summary`: The site URLs that need to be probed.
+    scan_settings : ScanSettings
+        `summary`: The scan engine settings. The DNS and connect timeouts are used.
+
+    Returns
+    -------
+    dict[str, Union[str, None]]
+        `summary`: The failure message for each site URL. None is returned for sites that accepted the connection.
+
+    Raises
+    ------
+    CertMonitorError : fexception
+        `summary`: The site URL '{site_url}' is not a valid HTTPS target.
+    """
+    targets, target_indexes = canonicalize_targets(site_urls)
+    target_failures = asyncio.run(_probe(targets, scan_settings))
+    return {site_url: target_failures[index] for site_url, index in zip(site_urls, target_indexes)}
@@ -0,0 +1,218 @@
+# Package/Modules
+import heapq
+import itertools
+import logging
+import threading
+import time
+from typing import Union
+
+__author__ = "IncognitoCoding"
+__copyright__ = "Copyright 2023, scheduler"
+__credits__ = ["IncognitoCoding"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "IncognitoCoding"
+__status__ = "Beta"
+
+# Seconds in one day. Expiring, expired, and failed sites are re-checked daily.
+SECONDS_IN_DAY = 86400
+# Longest single sleep. Windows limits time.sleep to 4294967 seconds (49 days, 17:02:47), so long waits are split.
+MAX_SLEEP_SECONDS = SECONDS_IN_DAY
+
+
+def get_check_interval(expiration_days_away: Union[int, None], buffer_days: int, monitor_sleep: int) -> int:
+    """Gets the number of seconds until a site should be checked again.
+
+    Sites inside the buffer days and failed sites are checked daily. Healthy sites are checked every monitor_sleep
+    seconds, or sooner when the certificate would enter the buffer days before the next check.
+
+    Parameters
+    ----------
+    expiration_days_away : Union[int, None]
+        `summary`: The amount of days until the certificate expires. None is sent when the check failed.
+    buffer_days : int
+        `summary`: Days to buffer certificate expiring before notifying.
+    monitor_sleep : int
+        `summary`: The user-defined seconds between checks.
+
+    Returns
+    -------
+    int
+        `summary`: The seconds until the next check.
+    """
+    if expiration_days_away is None or expiration_days_away <= buffer_days:
+        return min(monitor_sleep, SECONDS_IN_DAY)
+    # Gets the seconds until the certificate enters the buffer days.
+    seconds_to_buffer = (expiration_days_away - buffer_days) * SECONDS_IN_DAY
+    return min(monitor_sleep, max(seconds_to_buffer, SECONDS_IN_DAY))
+
+
+def sleep_until(wake_time: float, wake_event: Union[threading.Event, None] = None) -> None:
+    """Sleeps until the wake time. Long waits are split, so there is no limit on the sleep length.
+
+    Parameters
+    ----------
+    wake_time : float
+        `summary`: The epoch time to wake up.
+    wake_event : Union[threading.Event, None], optional
+        `summary`: Ends the sleep early when set, such as when an on-demand check is queued. Defaults to None.
+    """
+    while True:
+        remaining = wake_time - time.time()
+        if remaining <= 0:
+            break
+        if wake_event is None:
+            time.sleep(min(remaining, MAX_SLEEP_SECONDS))
+        elif wake_event.wait(min(remaining, MAX_SLEEP_SECONDS)):
+            break
+
+
+class HostScheduler(object):
+    """Keeps the next check time of every site URL in a heap, so only due sites are checked each loop.
+
+    Removed site URLs are dropped lazily when they reach the top of the heap. The inventory files are swept together,
+    so they have one next check time instead of one per inventory site URL.
+    """
+
+    def __init__(self) -> None:
+        # Heap entries are (next check epoch, tie-breaker, site URL).
+        self._heap: list[tuple[float, int, str]] = []
+        # The current next check time for each scheduled site URL. Heap entries that do not match are stale.
+        self._next_check: dict[str, float] = {}
+        self._counter = itertools.count()
+        # The next inventory sweep time. None sweeps the inventory on the next loop without waking the sleep for it.
+        self._next_inventory_check: Union[float, None] = None
+
+    def __len__(self) -> int:
+        return len(self._next_check)
+
+    def __contains__(self, site_url: str) -> bool:
+        return site_url in self._next_check
+
+    def schedule(self, site_url: str, next_check: float) -> None:
+        """Sets the next check time for a site URL.
+
+        Parameters
+        ----------
+        site_url : str
+            `summary`: The site URL.
+        next_check : float
+            `summary`: The epoch time the site URL is due.
+        """
+        self._next_check[site_url] = next_check
+        heapq.heappush(self._heap, (next_check, next(self._counter), site_url))
+        # Rebuilds the heap when stale entries outnumber the scheduled sites.
+        if len(self._heap) > 2 * len(self._next_check) + 64:
+            self._heap = [(check, next(self._counter), url) for url, check in self._next_check.items()]
+            heapq.heapify(self._heap)
+
+    def remove(self, site_url: str) -> None:
+        """Removes a site URL from the schedule.
+
+        Parameters
+        ----------
+        site_url : str
+            `summary`: The site URL.
+        """
+        self._next_check.pop(site_url, None)
+
+    def schedule_inventory(self, next_check: Union[float, None]) -> None:
+        """Sets the next inventory sweep time.
+
+        Parameters
+        ----------
+        next_check : Union[float, None]
+            `summary`: The epoch time the inventory is due. None makes the inventory due on every loop.
+        """
+        self._next_inventory_check = next_check
+
+    def is_inventory_due(self, now: float) -> bool:
+        """Checks if the inventory files need to be swept.
+
+        Parameters
+        ----------
+        now : float
+            `summary`: The current epoch time.
+
+        Returns
+        -------
+        bool
+            `summary`: True when the inventory was never swept, has no interval, or the interval has passed.
+        """
+        return self._next_inventory_check is None or self._next_inventory_check <= now
+
+    def next_inventory_time(self) -> Union[float, None]:
+        """Gets the next inventory sweep time.
+
+        Returns
+        -------
+        Union[float, None]
+            `summary`: The epoch time the inventory is due. None is returned when the inventory is due on every loop.
+        """
+        return self._next_inventory_check
+
+    def sync(self, site_urls: list[str], now: float) -> tuple[list[str], list[str]]:
+        """Adds new site URLs as due now and removes site URLs that are no longer configured.
+
+        Parameters
+        ----------
+        site_urls : list[str]
+            `summary`: The configured site URLs.
+        now : float
+            `summary`: The current epoch time.
+
+        Returns
+        -------
+        tuple[list[str], list[str]]
+            `summary`: The added and removed site URLs.
+        """
+        logger = logging.getLogger(__name__)
+
+        configured = dict.fromkeys(site_urls)
+        added = [site_url for site_url in configured if site_url not in self._next_check]
+        removed = [site_url for site_url in self._next_check if site_url not in configured]
+        for site_url in removed:
+            self.remove(site_url)
+        for site_url in added:
+            self.schedule(site_url, now)
+        if added or removed:
+            logger.debug(f"Scheduler added {len(added)} site(s) and removed {len(removed)} site(s)")
+        return added, removed
+
+    def pop_due(self, now: float) -> list[str]:
+        """Gets every site URL that is due. The returned site URLs must be scheduled again after the check.
+
+        Parameters
+        ----------
+        now : float
+            `summary`: The current epoch time.
+
+        Returns
+        -------
+        list[str]
+            `summary`: The due site URLs, earliest first.
+        """
+        due: list[str] = []
+        while self._heap and self._heap[0][0] <= now:
+            next_check, _, site_url = heapq.heappop(self._heap)
+            if self._next_check.get(site_url) == next_check:
+                del self._next_check[site_url]
+                due.append(site_url)
+        return due
+
+    def next_check_time(self) -> Union[float, None]:
+        """Gets the earliest next check time.
+
+        Returns
+        -------
+        Union[float, None]
+            `summary`: The earliest epoch time a site URL or the inventory is due. None is returned when nothing is scheduled.
+        """
+        while self._heap:
+            next_check, _, site_url = self._heap[0]
+            if self._next_check.get(site_url) == next_check:
+                if self._next_inventory_check is not None:
+                    return min(next_check, self._next_inventory_check)
+                return next_check
+            heapq.heappop(self._heap)
+        return self._next_inventory_check
@@ -0,0 +1,157 @@
+# Package/Modules
+import dataclasses
+import ipaddress
+import logging
+import urllib.parse
+
+# Exceptions
+from fexception import FCustomException
+
+# Local Dataclasses
+from certmonitor.dataclasses.common import ScanResult, ScanTarget
+
+# Local Exceptions
+from certmonitor.exceptions.exceptions import CertMonitorError
+
+__author__ = "IncognitoCoding"
+__copyright__ = "Copyright 2023, targets"
+__credits__ = ["IncognitoCoding"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "IncognitoCoding"
+__status__ = "Beta"
+
+# The port used when the site URL does not set one.
+DEFAULT_PORT = 443
+
+
+def _raise_invalid_target(site_url: str, reason: str) -> None:
+    """Raises the error for a site URL that cannot be turned into a scan target."""
+    exc_args = {
+        "main_message": f"The site URL '{site_url}' is not a valid HTTPS target. {reason}",
+        "custom_type": CertMonitorError,
+        "returned_result": site_url,
+        "suggested_resolution": "Please update the URL in the 'site_urls' section of the YAML file. Supported formats are host, host:port, and https://host:port/path.",
+    }
+    raise CertMonitorError(FCustomException(message_args=exc_args))
+
+
+def _normalize_host(site_url: str, host: str) -> str:
+    """Lowercases the host, drops the trailing root dot, and converts international names to their ASCII form."""
+    host = host.strip().lower().rstrip(".")
+    if not host:
+        _raise_invalid_target(site_url, "The host is missing.")
+    try:
+        # IP addresses are returned in their compressed form, so 127.000.0.1 style duplicates are not possible.
+        return str(ipaddress.ip_address(host))
+    except ValueError:
+        pass
+    try:
+        return host.encode("idna").decode("ascii")
+    except UnicodeError:
+        _raise_invalid_target(site_url, "The host is not a valid domain name.")
+    return host
+
+
+def parse_target(site_url: str) -> ScanTarget:
+    """Parses a site URL into the host, port, and TLS server name that are checked.
+
+    The scheme, user info, path, and fragment are ignored. Hosts are lowercased, so the same site written in
+    different ways becomes the same target. The server name defaults to the host and can be set with an "sni" query
+    value to check a specific address for a name, such as https://10.0.0.5:8443/?sni=www.example.com.
+
+    Parameters
+    ----------
+    site_url : str
+        `summary`: The site URL from the YAML file.
+
+    Returns
+    -------
+    ScanTarget
+        `summary`: The canonical scan target.
+
+    Raises
+    ------
+    CertMonitorError : fexception
+        `summary`: The site URL '{site_url}' is not a valid HTTPS target.
+    """
+    value = site_url.strip()
+    # Bare hosts and host:port values are parsed as HTTPS URLs.
+    if "://" not in value:
+        value = f"https://{value}"
+    parts = urllib.parse.urlsplit(value)
+    if parts.scheme != "https":
+        _raise_invalid_target(site_url, f"The '{parts.scheme}' scheme is not supported.")
+    try:
+        port = DEFAULT_PORT if parts.port is None else parts.port
+    except ValueError:
+        port = 0
+    if not 0 < port < 65536:
+        _raise_invalid_target(site_url, "The port must be a number from 1 to 65535.")
+    host = _normalize_host(site_url, parts.hostname or "")
+
+    server_name = host
+    sni_values = urllib.parse.parse_qs(parts.query).get("sni")
+    if sni_values:
+        server_name = _normalize_host(site_url, sni_values[-1])
+    return ScanTarget(host=host, port=port, server_name=server_name)
+
+
+def canonicalize_targets(site_urls: list[str]) -> tuple[list[ScanTarget], list[int]]:
+    """Parses the site URLs into unique scan targets, so every duplicate costs one handshake instead of one each.
+
+    Parameters
+    ----------
+    site_urls : list[str]
+        `summary`: The site URLs from the YAML file.
+
+    Returns
+    -------
+    tuple[list[ScanTarget], list[int]]
+        `summary`: The unique targets in first seen order and the target index of each site URL.
+
+    Raises
+    ------
+    CertMonitorError : fexception
+        `summary`: The site URL '{site_url}' is not a valid HTTPS target.
+    """
+    logger = logging.getLogger(__name__)
+
+    targets: list[ScanTarget] = []
+    target_indexes: list[int] = []
+    seen: dict[tuple[str, int, str], int] = {}
+    for site_url in site_urls:
+        target = parse_target(site_url)
+        key = (target.host, target.port, target.server_name)
+        index = seen.get(key)
+        if index is None:
+            index = seen[key] = len(targets)
+            targets.append(target)
+        target_indexes.append(index)
+
+    if len(targets) < len(site_urls):
+        logger.debug(f"Collapsed {len(site_urls)} site URL(s) into {len(targets)} unique target(s)")
+    return targets, target_indexes
+
+
+def expand_results(site_urls: list[str], target_indexes: list[int], scan_results: list[ScanResult]) -> list[ScanResult]:
+    """Maps the scan result of each unique target back to every site URL that points to it.
+
+    Parameters
+    ----------
+    site_urls : list[str]
+        `summary`: The site URLs from the YAML file.
+    target_indexes : list[int]
+        `summary`: The target index of each site URL from canonicalize_targets().
+    scan_results : list[ScanResult]
+        `summary`: The scan result of each unique target.
+
+    Returns
+    -------
+    list[ScanResult]
+        `summary`: One scan result per site URL in the same order as the site URLs.
+    """
+    return [
+        dataclasses.replace(scan_results[index], site_url=site_url)
+        for site_url, index in zip(site_urls, target_indexes)
+    ]
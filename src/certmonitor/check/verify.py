@@ -0,0 +1,298 @@
+# Package/Modules
+import base64
+import functools
+import ipaddress
+import logging
+import os
+import re
+import ssl
+import time
+from typing import Union
+from typing_extensions import TypeAlias
+
+# Optional Package/Modules
+try:
+    # Only needed to verify the chain signatures. The names, dates, and host name are verified without it.
+    from cryptography import x509
+    from cryptography.x509.verification import PolicyBuilder, Store, VerificationError
+except ImportError:
+    x509 = None
+
+# Local Package/Modules
+from certmonitor.check.chain import parse_chain
+from certmonitor.check.context import get_ssl_context
+from certmonitor.files.der import parse_certificate
+from certmonitor.files.formats import PEM_CERTIFICATE
+from certmonitor.metrics.registry import metrics
+
+# Local Dataclasses
+from certmonitor.dataclasses.common import ScanResult
+
+__author__ = "IncognitoCoding"
+__copyright__ = "Copyright 2023, verify"
+__credits__ = ["IncognitoCoding"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "IncognitoCoding"
+__status__ = "Beta"
+
+# The scan result, the host the site certificate must match, the presented DER chain, the parsed site certificate,
+# and the parsed chain certificates of one handshake-only probe.
+ChainCheck: TypeAlias = tuple[
+    ScanResult, str, list[bytes], tuple[dict, float, str], tuple[tuple[dict, float, str], ...]
+]
+
+# The hashed certificate file names OpenSSL looks up in a CA directory, such as 5ad8a5d6.0.
+_HASHED_FILE_NAME = re.compile(r"^[0-9a-f]{8}\.\d+$")
+
+# Converts the notBefore times. Chain certificates are shared by many sites, so the same times repeat.
+_get_time_epoch = functools.lru_cache(maxsize=4096)(ssl.cert_time_to_seconds)
+
+# The trusted CA certificates are loaded once per process, the same as the SSL context.
+# The trusted certificates keyed by the SHA-256 fingerprint. None until the trust store is loaded.
+_trusted_certificates: Union[dict[str, tuple[dict, float, str]], None] = None
+# The subjects of the trusted certificates. A certificate issued by one of them ends the chain.
+_trusted_subjects: set[tuple] = set()
+# The trusted certificates loaded by cryptography to verify the signatures. None when cryptography is not installed.
+_signature_store = None
+
+
+def _read_ca_directory(capath: str) -> list[bytes]:
+    """Reads the DER encoded certificates from the hashed PEM files in an OpenSSL CA directory."""
+    logger = logging.getLogger(__name__)
+
+    der_certificates: list[bytes] = []
+    read_paths: set[str] = set()
+    try:
+        file_names = sorted(os.listdir(capath))
+    except OSError:
+        return der_certificates
+    for file_name in file_names:
+        if not _HASHED_FILE_NAME.match(file_name):
+            continue
+        # The hashed names are usually links to the same files, so each file is read once.
+        file_path = os.path.realpath(os.path.join(capath, file_name))
+        if file_path in read_paths:
+            continue
+        read_paths.add(file_path)
+        try:
+            with open(file_path, "rb") as ca_file:
+                data = ca_file.read()
+        except OSError as exc:
+            logger.debug(f"Skipping the CA file {file_path} that could not be read. {exc}")
+            continue
+        der_certificates.extend(base64.b64decode(match.group(1)) for match in PEM_CERTIFICATE.finditer(data))
+    return der_certificates
+
+
+def _load_trust_store() -> dict[str, tuple[dict, float, str]]:
+    """Loads the trusted CA certificates on the first call.
+
+    The certificates come from the shared SSL context, which holds the CA file and the operating system store, and
+    from the CA directory OpenSSL would search during a verified handshake.
+    """
+    global _trusted_certificates, _signature_store
+
+    if _trusted_certificates is None:
+        logger = logging.getLogger(__name__)
+
+        der_certificates = list(get_ssl_context().get_ca_certs(binary_form=True))
+        capath = ssl.get_default_verify_paths().capath
+        if capath:
+            der_certificates.extend(_read_ca_directory(capath))
+
+        trusted_certificates: dict[str, tuple[dict, float, str]] = {}
+        unique_der_certificates: list[bytes] = []
+        for der_certificate in der_certificates:
+            try:
+                parsed = parse_certificate(der_certificate)
+            except ValueError as exc:
+                logger.debug(f"Skipping a trusted certificate that could not be parsed. {exc}")
+                continue
+            if parsed[2] not in trusted_certificates:
+                trusted_certificates[parsed[2]] = parsed
+                unique_der_certificates.append(der_certificate)
+        _trusted_subjects.update(certificate["subject"] for certificate, _, _ in trusted_certificates.values())
+
+        if x509 is not None and unique_der_certificates:
+            signature_certificates = []
+            for der_certificate in unique_der_certificates:
+                try:
+                    signature_certificates.append(x509.load_der_x509_certificate(der_certificate))
+                except ValueError:
+                    continue
+            _signature_store = Store(signature_certificates) if signature_certificates else None
+        _trusted_certificates = trusted_certificates
+        logger.debug(
+            f"Loaded {len(trusted_certificates)} trusted certificate(s) for the chain verification. "
+            f"Signatures are {'verified' if _signature_store is not None else 'not verified without cryptography'}"
+        )
+    return _trusted_certificates
+
+
+def _format_address(address: Union[ipaddress.IPv4Address, ipaddress.IPv6Address]) -> str:
+    """Formats an IP address the way getpeercert() lists it in the subject alternative names."""
+    if address.version == 4:
+        return str(address)
+    packed = address.packed
+    return ":".join(f"{int.from_bytes(packed[index:index + 2], 'big'):X}" for index in range(0, 16, 2))
+
+
+def _match_host(certificate: dict, host: str) -> bool:
+    """Matches the host against the subject alternative names the same way OpenSSL does for a verified handshake.
+
+    A wildcard only matches one whole left-most label. The common name is only used when the certificate has no DNS names.
+    """
+    subject_alt_names = certificate.get("subjectAltName", ())
+    try:
+        # IP addresses are compared in the getpeercert() format, so the listed addresses are not parsed one by one.
+        return ("IP Address", _format_address(ipaddress.ip_address(host))) in subject_alt_names
+    except ValueError:
+        pass
+
+    host = host.rstrip(".").lower()
+    dns_names = [value for name_type, value in subject_alt_names if name_type == "DNS"]
+    if not dns_names:
+        dns_names = [
+            value
+            for relative_name in certificate.get("subject", ())
+            for attribute, value in relative_name
+            if attribute == "commonName"
+        ]
+
+    host_labels = host.split(".")
+    for dns_name in dns_names:
+        name_labels = dns_name.rstrip(".").lower().split(".")
+        if len(name_labels) != len(host_labels):
+            continue
+        if name_labels[0] == "*" and len(name_labels) > 2:
+            if name_labels[1:] == host_labels[1:]:
+                return True
+        elif name_labels == host_labels:
+            return True
+    return False
+
+
+def _verify_names(
+    host: str, leaf: tuple[dict, float, str], chain: tuple[tuple[dict, float, str], ...], now: float
+) -> Union[str, None]:
+    """Builds the issuer path from the site certificate to a trusted certificate by subject and issuer names.
+
+    The reasons use the OpenSSL wording, so they read the same as the errors of a verified handshake.
+    """
+    if not _match_host(leaf[0], host):
+        return f"Hostname mismatch, certificate is not valid for '{host}'."
+
+    trusted_certificates = _load_trust_store()
+    certificate, not_after_epoch, fingerprint = leaf
+    # Servers can send extra or out of order certificates, so the issuer is looked up among all of them.
+    remaining = list(chain)
+    while True:
+        if now < _get_time_epoch(certificate["notBefore"]):
+            return "certificate is not yet valid"
+        if now > not_after_epoch:
+            return "certificate has expired"
+        if fingerprint in trusted_certificates or certificate["issuer"] in _trusted_subjects:
+            return None
+        if certificate["issuer"] == certificate["subject"]:
+            return (
+                "self-signed certificate" if certificate is leaf[0] else "self-signed certificate in certificate chain"
+            )
+        issuer = next((entry for entry in remaining if entry[0]["subject"] == certificate["issuer"]), None)
+        if issuer is None:
+            return "unable to get local issuer certificate"
+        remaining.remove(issuer)
+        certificate, not_after_epoch, fingerprint = issuer
+
+
+def _verify_signatures(host: str, der_chain: list[bytes]) -> Union[str, None]:
+    """Verifies the chain signatures, dates, and host name against the trust store with cryptography."""
+    try:
+        subject = x509.IPAddress(ipaddress.ip_address(host))
+    except ValueError:
+        subject = x509.DNSName(host.rstrip("."))
+    verifier = PolicyBuilder().store(_signature_store).build_server_verifier(subject)
+    try:
+        verifier.verify(
+            x509.load_der_x509_certificate(der_chain[0]),
+            [x509.load_der_x509_certificate(der_certificate) for der_certificate in der_chain[1:]],
+        )
+    except VerificationError as exc:
+        return str(exc)
+    return None
+
+
+def verify_chain(
+    host: str,
+    der_chain: list[bytes],
+    now: Union[float, None] = None,
+    leaf: Union[tuple[dict, float, str], None] = None,
+    chain: Union[tuple[tuple[dict, float, str], ...], None] = None,
+) -> Union[str, None]:
+    """Verifies a presented chain against the trust store without connecting to the site.
+
+    The signatures are verified when cryptography is installed. Without it, the chain must still lead by issuer name
+    to a trusted certificate, the certificates must be in their validity period, and the site certificate must match
+    the host, which catches missing intermediates, untrusted roots, self-signed certificates, and host mismatches.
+
+    Parameters
+    ----------
+    host : str
+        `summary`: The host name or IP address the site certificate must match. Use the TLS server name when set.
+    der_chain : list[bytes]
+        `summary`: The DER encoded certificates the site presented, starting with the site certificate.
+    now : Union[float, None], optional
+        `summary`: The epoch time the chain is verified at. Defaults to None, which uses the current time.
+    leaf : Union[tuple[dict, float, str], None], optional
+        `summary`: The site certificate already parsed by parse_certificate(). Defaults to None, which parses it from the chain.
+    chain : Union[tuple[tuple[dict, float, str], ...], None], optional
+        `summary`: The chain certificates already parsed by parse_chain(). Defaults to None, which parses them with the shared chain cache.
+
+    Returns
+    -------
+    Union[str, None]
+        `summary`: The reason the chain failed verification. None is returned when the chain is trusted.
+    """
+    if not der_chain:
+        return "The site did not present a certificate."
+    try:
+        if leaf is None:
+            leaf = parse_certificate(der_chain[0])
+        if chain is None:
+            # The chain certificates are parsed from the shared chain cache.
+            chain = parse_chain(der_chain)
+        name_error = _verify_names(host, leaf, chain, time.time() if now is None else now)
+        if name_error or _signature_store is None:
+            return name_error
+        return _verify_signatures(host, der_chain)
+    except ValueError as exc:
+        return f"The presented certificate could not be read. {exc}"
+
+
+def verify_chains(checks: list[ChainCheck]) -> None:
+    """Verifies the chains from a batch of handshake-only probes and sets the chain error of each scan result.
+
+    The trust store is loaded on the first call and reused by every later batch in this process. The chains are
+    verified from the parsed certificates in the batch without the shared chain cache, so a batch can be verified
+    in an executor thread while the event loop keeps running.
+
+    Parameters
+    ----------
+    checks : list[ChainCheck]
+        `summary`: The scan result, the host the site certificate must match, the presented DER chain, the parsed site certificate, and the parsed chain certificates of each probe.
+    """
+    logger = logging.getLogger(__name__)
+
+    if not checks:
+        return
+    # Loads the trust store before the first chain is timed, so the load is not reported as verify latency.
+    _load_trust_store()
+    now = time.time()
+    for scan_result, host, der_chain, leaf, chain in checks:
+        with metrics.time("certmonitor_phase_seconds", phase="verify"):
+            scan_result.chain_error = verify_chain(host, der_chain, now, leaf, chain)
+        metrics.increment(
+            "certmonitor_chain_verifications_total", result="untrusted" if scan_result.chain_error else "trusted"
+        )
+        if scan_result.chain_error:
+            logger.debug(f"The chain of {scan_result.site_url} failed verification. {scan_result.chain_error}")
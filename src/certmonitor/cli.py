@@ -0,0 +1,185 @@
+# Package/Modules
+import argparse
+import csv
+import dataclasses
+import itertools
+import json
+import logging
+import os
+import sys
+from typing import Callable, Iterable, Iterator, Union
+
+# Local Package/Modules
+from certmonitor.check.inventory import iter_inventories
+from certmonitor.check.scan import stream_targets
+from certmonitor.check.targets import parse_target
+from certmonitor.launch import get_startup_settings
+from certmonitor.store.records import RECORD_FIELDS, build_record, summarize_error
+
+# Local Dataclasses
+from certmonitor.dataclasses.common import ScanTarget
+
+# Local Exceptions
+from certmonitor.exceptions.exceptions import CertMonitorError
+
+__author__ = "IncognitoCoding"
+__copyright__ = "Copyright 2023, cli"
+__credits__ = ["IncognitoCoding"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "IncognitoCoding"
+__status__ = "Beta"
+
+
+def get_record_writer(output_format: str, stream) -> Callable[[dict], None]:
+    """Gets the function that writes one record to the output stream.
+
+    Each record is flushed right away, so the next program in a pipe gets it while the scan is still running.
+
+    Parameters
+    ----------
+    output_format : str
+        `summary`: ndjson writes one JSON object per line. csv writes a header row and one row per record.
+    stream : TextIO
+        `summary`: The output stream.
+
+    Returns
+    -------
+    Callable[[dict], None]
+        `summary`: The record writer.
+    """
+    if output_format == "csv":
+        csv_writer = csv.DictWriter(stream, fieldnames=RECORD_FIELDS, lineterminator="\n")
+        csv_writer.writeheader()
+
+        def write_csv(record: dict) -> None:
+            csv_writer.writerow(record)
+            stream.flush()
+
+        return write_csv
+
+    def write_ndjson(record: dict) -> None:
+        stream.write(json.dumps(record, separators=(",", ":")) + "\n")
+        stream.flush()
+
+    return write_ndjson
+
+
+def _iter_targets(site_urls: Iterable[str], write_record: Callable[[dict], None]) -> Iterator[ScanTarget]:
+    """Parses the site URLs into scan targets while the scan reads them.
+
+    Invalid site URLs are written as an "invalid" record instead of stopping the scan. Duplicates are not tracked,
+    so the memory use does not grow with the inventory size.
+    """
+    for site_url in site_urls:
+        try:
+            yield parse_target(site_url)
+        except CertMonitorError as exc:
+            write_record(
+                dict.fromkeys(RECORD_FIELDS)
+                | {"target": site_url, "status": "invalid", "error": summarize_error(str(exc))}
+            )
+
+
+def _get_parser() -> argparse.ArgumentParser:
+    """Creates the command-line argument parser."""
+    parser = argparse.ArgumentParser(
+        prog="certmonitor",
+        description=(
+            "Checks the certificate expiration of each target once and writes one record per target to stdout as "
+            "soon as its check finishes. The records arrive in completion order. No alerts are sent and no state "
+            "files are written."
+        ),
+    )
+    parser.add_argument(
+        "targets",
+        nargs="*",
+        help="Site URLs to check, such as example.com or example.com:8443. The site_urls and inventory from the settings are used when no targets or inventory files are given.",
+    )
+    parser.add_argument(
+        "-i",
+        "--inventory",
+        action="append",
+        default=[],
+        help="A text or CSV inventory file with one site URL per line. .gz, .bz2, and .xz files are decompressed while read. - reads stdin. Can be repeated.",
+    )
+    parser.add_argument(
+        "-c",
+        "--config",
+        default="settings.yaml",
+        help="The YAML settings file. The scan settings, buffer days, and time zone are read from it. Defaults to settings.yaml.",
+    )
+    parser.add_argument("-f", "--format", choices=("ndjson", "csv"), default="ndjson", help="The record format.")
+    parser.add_argument(
+        "--probe-mode",
+        action="store_true",
+        help="Fetches each chain with a handshake-only probe and verifies it afterwards, so targets with a broken chain still report their expiration with a chain_error. Overrides the probe_mode scan setting.",
+    )
+    parser.add_argument(
+        "--log-level",
+        choices=("DEBUG", "INFO", "WARNING", "ERROR"),
+        default="WARNING",
+        help="The log level. Logs are written to stderr, so stdout only holds records.",
+    )
+    return parser
+
+
+def main(argv: Union[list[str], None] = None) -> int:
+    """Runs a single scan from the command line and streams the records to stdout.
+
+    Parameters
+    ----------
+    argv : Union[list[str], None], optional
+        `summary`: The command-line arguments. The process arguments are used when not set. Defaults to None.
+
+    Returns
+    -------
+    int
+        `summary`: The exit code. 1 is returned when the settings cannot be loaded.
+    """
+    args = _get_parser().parse_args(argv)
+    logging.basicConfig(
+        stream=sys.stderr, level=args.log_level, format="%(asctime)s|%(levelname)s|%(name)s|%(message)s"
+    )
+    logger = logging.getLogger(__name__)
+
+    if not os.path.isfile(args.config):
+        logger.error(f"The settings file '{args.config}' was not found")
+        return 1
+    try:
+        startup_settings = get_startup_settings(args.config)
+    except Exception as exc:
+        logger.error(f"The settings file '{args.config}' could not be loaded. {summarize_error(str(exc))}")
+        return 1
+
+    scan_settings = startup_settings.scan_settings
+    if args.probe_mode:
+        scan_settings = dataclasses.replace(scan_settings, probe_mode=True)
+
+    write_record = get_record_writer(args.format, sys.stdout)
+    inventory_settings = startup_settings.inventory_settings
+    if args.targets or args.inventory:
+        site_urls = itertools.chain(args.targets, iter_inventories(args.inventory, inventory_settings.csv_column))
+    else:
+        site_urls = itertools.chain(
+            startup_settings.site_urls, iter_inventories(inventory_settings.paths, inventory_settings.csv_column)
+        )
+    try:
+        result_count = stream_targets(
+            targets=_iter_targets(site_urls, write_record),
+            buffer_days=startup_settings.buffer_days,
+            time_zone=startup_settings.time_zome,
+            scan_settings=scan_settings,
+            on_result=lambda scan_result: write_record(build_record(scan_result)),
+        )
+    except BrokenPipeError:
+        # The reading program closed the pipe, such as head. The remaining output is discarded without an error.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
+    logger.info(f"Wrote {result_count} record(s)")
+    return 0
+
+
+# Checks that this is the main program that initiates the classes to start the functions.
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,6 @@
 # Built-in/Generic Imports
 from dataclasses import dataclass
+from enum import Enum
 from typing import Union
 from typing_extensions import TypeAlias
 
@@ -57,6 +58,264 @@ class EmailSettings(object):
     to_email: str
 
 
+@dataclass
+class ScanSettings(object):
+    """Stores the certificate scan engine settings.
+
+    Parameters
+    ----------
+    concurrency : int
+        `summary`: The maximum number of sites checked at the same time by each worker process.
+    workers : int
+        `summary`: The number of worker processes that split the site URLs. 0 uses one worker process per CPU core.
+    dns_timeout : float
+        `summary`: Seconds to wait for the site DNS resolution. 0 disables the timeout.
+    connect_timeout : float
+        `summary`: Seconds to wait for the TCP connection. 0 disables the timeout.
+    handshake_timeout : float
+        `summary`: Seconds to wait for the TLS handshake. 0 disables the timeout.
+    read_timeout : float
+        `summary`: Seconds to wait for reads after the TLS handshake. 0 disables the timeout.
+    sweep_deadline : float
+        `summary`: Seconds a full sweep may run before the remaining sites are reported as not checked. 0 disables the deadline.
+    probe_mode : bool
+        `summary`: Fetches the presented chain with an unverified handshake and closes the connection right away. The chains are verified in batch after the checks, so a chain that fails verification still reports its expiration.
+    session_cache : bool
+        `summary`: Caches TLS sessions per site so re-checks can resume them.
+    session_max_age : int
+        `summary`: Maximum age in seconds of a cached TLS session. A renewed certificate is seen once the session is dropped.
+    dns_cache_ttl : int
+        `summary`: Seconds a resolved site address is cached between sweeps. 0 disables the cache.
+    ip_rate : float
+        `summary`: New connections per second to one resolved IP address. 0 disables the limit.
+    ip_burst : int
+        `summary`: New connections to one resolved IP address that can start at once before the rate applies.
+    network_rate : float
+        `summary`: New connections per second to one IPv4 /24 or IPv6 /64 network. 0 disables the limit.
+    network_burst : int
+        `summary`: New connections to one network that can start at once before the rate applies.
+    domain_rate : float
+        `summary`: New connections per second to the hosts of one registered domain. 0 disables the limit.
+    domain_burst : int
+        `summary`: New connections to one registered domain that can start at once before the rate applies.
+    """
+
+    __slots__ = (
+        "concurrency",
+        "workers",
+        "dns_timeout",
+        "connect_timeout",
+        "handshake_timeout",
+        "read_timeout",
+        "sweep_deadline",
+        "probe_mode",
+        "session_cache",
+        "session_max_age",
+        "dns_cache_ttl",
+        "ip_rate",
+        "ip_burst",
+        "network_rate",
+        "network_burst",
+        "domain_rate",
+        "domain_burst",
+    )
+
+    concurrency: int
+    workers: int
+    dns_timeout: float
+    connect_timeout: float
+    handshake_timeout: float
+    read_timeout: float
+    sweep_deadline: float
+    probe_mode: bool
+    session_cache: bool
+    session_max_age: int
+    dns_cache_ttl: int
+    ip_rate: float
+    ip_burst: int
+    network_rate: float
+    network_burst: int
+    domain_rate: float
+    domain_burst: int
+
+
+@dataclass
+class StoreSettings(object):
+    """Stores the result store settings.
+
+    Parameters
+    ----------
+    enabled : bool
+        `summary`: Keeps the last result of each site in a local SQLite database.
+    path : str
+        `summary`: The SQLite database path.
+    recheck_after : int
+        `summary`: Seconds before a stored result that is far from expiration is checked again.
+    skip_margin_days : int
+        `summary`: Days past the buffer days a stored certificate must have left before the check is skipped.
+    """
+
+    __slots__ = "enabled", "path", "recheck_after", "skip_margin_days"
+
+    enabled: bool
+    path: str
+    recheck_after: int
+    skip_margin_days: int
+
+
+@dataclass
+class AlertSettings(object):
+    """Stores the alert delivery settings.
+
+    Parameters
+    ----------
+    digest : bool
+        `summary`: Collects the alerts from a sweep and sends them as digest emails over one SMTP session.
+    digest_max_entries : int
+        `summary`: The maximum number of alerts in a single digest email. Larger sweeps are split into parts.
+    dedupe : bool
+        `summary`: Skips alerts that were already sent for the same site and severity until the re-notify interval passes.
+    renotify_interval : int
+        `summary`: Seconds before the same alert is sent again. 0 only sends again when the severity changes.
+    state_path : str
+        `summary`: The SQLite database path that keeps the sent alerts across restarts.
+    """
+
+    __slots__ = "digest", "digest_max_entries", "dedupe", "renotify_interval", "state_path"
+
+    digest: bool
+    digest_max_entries: int
+    dedupe: bool
+    renotify_interval: int
+    state_path: str
+
+
+@dataclass
+class MetricsSettings(object):
+    """Stores the metrics endpoint settings.
+
+    Parameters
+    ----------
+    enabled : bool
+        `summary`: Serves the metrics in the Prometheus text format over a local HTTP endpoint.
+    host : str
+        `summary`: The address the metrics endpoint listens on.
+    port : int
+        `summary`: The port the metrics endpoint listens on.
+    """
+
+    __slots__ = "enabled", "host", "port"
+
+    enabled: bool
+    host: str
+    port: int
+
+
+@dataclass
+class FileSettings(object):
+    """Stores the certificate file settings.
+
+    Parameters
+    ----------
+    paths : list[str]
+        `summary`: The certificate files and directories that are checked. Directories are searched recursively.
+    extensions : list[str]
+        `summary`: The file extensions that are read when a directory is searched.
+    workers : int
+        `summary`: The number of worker processes that parse new and changed files. 0 uses one per CPU core.
+    index_path : str
+        `summary`: The SQLite index that keeps the parsed certificates by file path, modification time, and size.
+    pkcs12_password : str
+        `summary`: The password used to read PKCS#12 files.
+    report_count : int
+        `summary`: The number of earliest-expiring certificates reported for each file.
+    """
+
+    __slots__ = "paths", "extensions", "workers", "index_path", "pkcs12_password", "report_count"
+
+    paths: list[str]
+    extensions: list[str]
+    workers: int
+    index_path: str
+    pkcs12_password: str
+    report_count: int
+
+
+@dataclass
+class RetrySettings(object):
+    """Stores the failed site retry and circuit breaker settings.
+
+    Parameters
+    ----------
+    enabled : bool
+        `summary`: True to retry failed sites with backoff and pause sites that keep failing.
+    failure_threshold : int
+        `summary`: The failed checks in a row before the circuit opens and the site is only probed.
+    base_delay : int
+        `summary`: Seconds before the first retry of a failed site. The delay doubles for each failure in a row.
+    max_delay : int
+        `summary`: The longest delay in seconds between retries and probes.
+    state_path : str
+        `summary`: The SQLite database that keeps the failure state of each site URL between runs.
+    """
+
+    __slots__ = "enabled", "failure_threshold", "base_delay", "max_delay", "state_path"
+
+    enabled: bool
+    failure_threshold: int
+    base_delay: int
+    max_delay: int
+    state_path: str
+
+
+@dataclass
+class InventorySettings(object):
+    """Stores the external site URL inventory settings.
+
+    Parameters
+    ----------
+    paths : list[str]
+        `summary`: The text or CSV inventory files. Files ending with .gz, .bz2, or .xz are decompressed while read.
+    csv_column : str
+        `summary`: The CSV header of the site URL column. The first column is used when the header is missing.
+    chunk_size : int
+        `summary`: The number of site URLs read and checked at a time.
+    interval : int
+        `summary`: Seconds between inventory sweeps during continuous monitoring. 0 reads the inventory on every sweep.
+    """
+
+    __slots__ = "paths", "csv_column", "chunk_size", "interval"
+
+    paths: list[str]
+    csv_column: str
+    chunk_size: int
+    interval: int
+
+
+@dataclass
+class ApiSettings(object):
+    """Stores the local API settings.
+
+    Parameters
+    ----------
+    enabled : bool
+        `summary`: Serves the latest results and accepts on-demand checks over a local HTTP API while continuous monitoring runs.
+    host : str
+        `summary`: The address the API listens on.
+    port : int
+        `summary`: The port the API listens on.
+    socket_path : str
+        `summary`: The Unix socket file the API listens on instead of the host and port. TCP is used when empty.
+    """
+
+    __slots__ = "enabled", "host", "port", "socket_path"
+
+    enabled: bool
+    host: str
+    port: int
+    socket_path: str
+
+
 @dataclass
 class StartupSettings(object):
     """Stores startup settings from the YAML settings file.
@@ -79,6 +338,22 @@ class StartupSettings(object):
         `summary`: URLs that need to be checked.
     email_settings : EmailSettings
         `summary`: The email settings dataclass.
+    scan_settings : ScanSettings
+        `summary`: The scan engine settings dataclass.
+    store_settings : StoreSettings
+        `summary`: The result store settings dataclass.
+    alert_settings : AlertSettings
+        `summary`: The alert delivery settings dataclass.
+    metrics_settings : MetricsSettings
+        `summary`: The metrics endpoint settings dataclass.
+    file_settings : FileSettings
+        `summary`: The certificate file settings dataclass.
+    retry_settings : RetrySettings
+        `summary`: The failed site retry settings dataclass.
+    inventory_settings : InventorySettings
+        `summary`: The external site URL inventory settings dataclass.
+    api_settings : ApiSettings
+        `summary`: The local API settings dataclass.
     """
 
     __slots__ = (
@@ -90,6 +365,14 @@ class StartupSettings(object):
         "time_zome",
         "site_urls",
         "email_settings",
+        "scan_settings",
+        "store_settings",
+        "alert_settings",
+        "metrics_settings",
+        "file_settings",
+        "retry_settings",
+        "inventory_settings",
+        "api_settings",
     )
 
     continuous_monitoring: bool
@@ -100,6 +383,14 @@ class StartupSettings(object):
     time_zome: str
     site_urls: list[str]
     email_settings: EmailSettings
+    scan_settings: ScanSettings
+    store_settings: StoreSettings
+    alert_settings: AlertSettings
+    metrics_settings: MetricsSettings
+    file_settings: FileSettings
+    retry_settings: RetrySettings
+    inventory_settings: InventorySettings
+    api_settings: ApiSettings
 
 
 @dataclass
@@ -129,19 +420,228 @@ class SSLReturn(object):
     crlDistributionPoints: Union[str, _PCTRTTT, _PCTRTT, None]
 
 
-@dataclass
+class Severity(Enum):
+    """The certificate expiration severity."""
+
+    INFO = "info"
+    WARNING = "warning"
+    EXPIRED = "expired"
+
+
+# The status prefix of each severity in the status message.
+_STATUS_PREFIXES = {Severity.INFO: "Info", Severity.WARNING: "Warning", Severity.EXPIRED: "Error"}
+
+
+@dataclass(init=False)
 class ExpirationMsg(object):
     """The expiration message output.
 
+    The human-readable text is only rendered when the message or status_message is read. A status message passed in
+    is returned as is instead of the rendered text, so messages built the earlier way with the "Info:, Warning:, or
+    Error:" prefix keep working.
+
     Parameters
     ----------
-    status_message : str
-        `summary`: The status of the message.
-    expiration_days_away : str
-        `summary`: The amount of days the certificate will expire.
+    status_message : Union[str, None], optional
+        `summary`: The expiration message with the status prefix. Defaults to None, which renders the message from the severity when it is read.
+    expiration_days_away : int, optional
+        `summary`: The amount of days the certificate will expire. Expired certificates are negative. Defaults to 0.
+    site_url : str, optional
+        `summary`: The site URL the certificate belongs to. Defaults to "".
+    severity : Union[Severity, None], optional
+        `summary`: The certificate expiration severity. Defaults to None, which reads the severity from the status message prefix.
     """
 
-    __slots__ = "status_message", "expiration_days_away"
+    __slots__ = "_status_message", "expiration_days_away", "site_url", "severity"
 
-    status_message: str
+    _status_message: Union[str, None]
     expiration_days_away: int
+    site_url: str
+    severity: Severity
+
+    def __init__(
+        self,
+        status_message: Union[str, None] = None,
+        expiration_days_away: int = 0,
+        site_url: str = "",
+        severity: Union[Severity, None] = None,
+    ) -> None:
+        self._status_message = status_message
+        self.expiration_days_away = expiration_days_away
+        self.site_url = site_url
+        if severity is None:
+            prefix = status_message.partition(":")[0] if status_message else ""
+            severity = next(
+                (severity for severity, status in _STATUS_PREFIXES.items() if status == prefix), Severity.INFO
+            )
+        self.severity = severity
+
+    @property
+    def message(self) -> str:
+        """The human-readable expiration message without the status prefix."""
+        if self._status_message is not None:
+            prefix = f"{_STATUS_PREFIXES[self.severity]}: "
+            return (
+                self._status_message[len(prefix) :] if self._status_message.startswith(prefix) else self._status_message
+            )
+        if self.severity is Severity.EXPIRED:
+            return f"Certificate for {self.site_url} has expired! The certificate has been expired for {-self.expiration_days_away} days."
+        elif self.severity is Severity.WARNING:
+            if self.expiration_days_away == 0:
+                return f"Certificate for {self.site_url} is expring soon. The certificate will expire tomorrow."
+            return f"Certificate for {self.site_url} is expring soon. The certificate will expire in {self.expiration_days_away} days."
+        return f"Certificate for {self.site_url} is good. The certificate does not expire for {self.expiration_days_away} days."
+
+    @property
+    def status_message(self) -> str:
+        """The expiration message with the "Info:, Warning:, or Error:" status prefix."""
+        if self._status_message is not None:
+            return self._status_message
+        return f"{_STATUS_PREFIXES[self.severity]}: {self.message}"
+
+
+@dataclass
+class ScanTarget(object):
+    """Stores one canonical scan target parsed from the site URLs.
+
+    Parameters
+    ----------
+    host : str
+        `summary`: The lowercase host name or IP address the connection is opened to.
+    port : int
+        `summary`: The TCP port the connection is opened to.
+    server_name : str
+        `summary`: The name sent as the TLS server name indication (SNI) and verified against the certificate.
+    """
+
+    __slots__ = "host", "port", "server_name"
+
+    host: str
+    port: int
+    server_name: str
+
+    @property
+    def name(self) -> str:
+        """The target name used in log lines and messages. The port is only shown when it is not 443."""
+        host = f"[{self.host}]" if ":" in self.host else self.host
+        name = host if self.port == 443 else f"{host}:{self.port}"
+        return name if self.server_name == self.host else f"{name} ({self.server_name})"
+
+
+@dataclass
+class ScanResult(object):
+    """The scan result for a single site URL or certificate file.
+
+    Parameters
+    ----------
+    site_url : str
+        `summary`: The site URL that was checked. Certificate file results hold the file path.
+    expiration_msg : Union[ExpirationMsg, None]
+        `summary`: The certificate expiration message. None is returned when the check failed.
+    error : Union[str, None]
+        `summary`: The failure message when the check failed.
+    checked : bool
+        `summary`: False when the sweep deadline was reached before the site URL check finished.
+    resolved : bool
+        `summary`: False when the DNS resolution failed. The error holds the DNS failure message.
+    reachable : bool
+        `summary`: False when the DNS resolution failed, the site refused the connection, or a connection phase timed out. Certificate verification and TLS protocol failures are reachable.
+    ssl_return : Union[SSLReturn, None]
+        `summary`: The SSL certificate return information. None is returned when the check failed.
+    fingerprint : Union[str, None]
+        `summary`: The SHA-256 fingerprint of the DER encoded certificate.
+    not_after_epoch : Union[float, None]
+        `summary`: The earliest expiration as epoch seconds of the certificate and the chain the site presented with it. None is returned when the check failed.
+    cached : bool
+        `summary`: True when the result was evaluated from the result store without connecting to the site.
+    source : str
+        `summary`: Where the certificate came from. "url" for site URLs, "inventory" for site URLs from the inventory files, and "file" for certificate files.
+    chain_error : Union[str, None]
+        `summary`: The reason the presented chain failed verification in probe mode. None is returned when the chain is trusted or was verified during the handshake.
+    """
+
+    __slots__ = (
+        "site_url",
+        "expiration_msg",
+        "error",
+        "checked",
+        "resolved",
+        "reachable",
+        "ssl_return",
+        "fingerprint",
+        "not_after_epoch",
+        "cached",
+        "source",
+        "chain_error",
+    )
+
+    site_url: str
+    expiration_msg: Union[ExpirationMsg, None]
+    error: Union[str, None]
+    checked: bool
+    resolved: bool
+    reachable: bool
+    ssl_return: Union[SSLReturn, None]
+    fingerprint: Union[str, None]
+    not_after_epoch: Union[float, None]
+    cached: bool
+    source: str
+    chain_error: Union[str, None]
+
+
+@dataclass
+class StoredResult(object):
+    """The last stored check result for a single site URL.
+
+    Parameters
+    ----------
+    site_url : str
+        `summary`: The site URL that was checked.
+    ssl_return : SSLReturn
+        `summary`: The SSL certificate return information from the last check.
+    fingerprint : Union[str, None]
+        `summary`: The SHA-256 fingerprint of the DER encoded certificate.
+    not_after_epoch : float
+        `summary`: The earliest expiration as epoch seconds of the certificate and the chain the site presented with it.
+    checked_at : float
+        `summary`: The epoch time of the last check.
+    """
+
+    __slots__ = "site_url", "ssl_return", "fingerprint", "not_after_epoch", "checked_at"
+
+    site_url: str
+    ssl_return: SSLReturn
+    fingerprint: Union[str, None]
+    not_after_epoch: float
+    checked_at: float
+
+
+@dataclass
+class CertificateFile(object):
+    """The parsed certificates of one certificate file in the file index.
+
+    Parameters
+    ----------
+    path : str
+        `summary`: The absolute file path.
+    mtime_ns : int
+        `summary`: The file modification time in nanoseconds when the file was parsed.
+    size : int
+        `summary`: The file size in bytes when the file was parsed.
+    certificates : list[tuple[dict, float, str, int]]
+        `summary`: The earliest-expiring certificates in expiration order.
+        `extra1`: Each entry holds the certificate in the getpeercert() dictionary format, the notAfter epoch, the SHA-256 fingerprint, and the 1-based position in the file.
+    certificate_count : int
+        `summary`: The number of certificates in the file, including the certificates that were not kept.
+    error : Union[str, None]
+        `summary`: The failure message when the file could not be parsed.
+    """
+
+    __slots__ = "path", "mtime_ns", "size", "certificates", "certificate_count", "error"
+
+    path: str
+    mtime_ns: int
+    size: int
+    certificates: list[tuple[dict, float, str, int]]
+    certificate_count: int
+    error: Union[str, None]
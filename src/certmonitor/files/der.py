@@ -0,0 +1,325 @@
+# Package/Modules
+import calendar
+import datetime
+import functools
+import hashlib
+import mmap
+from typing import Iterator, Union
+
+__author__ = "IncognitoCoding"
+__copyright__ = "Copyright 2023, der"
+__credits__ = ["IncognitoCoding"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "IncognitoCoding"
+__status__ = "Beta"
+
+# ASN.1 tags used by X.509 certificates and PKCS#12 files.
+TAG_INTEGER = 0x02
+TAG_OCTET_STRING = 0x04
+TAG_UTC_TIME = 0x17
+TAG_GENERALIZED_TIME = 0x18
+TAG_SEQUENCE = 0x30
+# BER encoders can split an OCTET STRING into a constructed string of chunks.
+TAG_CONSTRUCTED_OCTET_STRING = 0x24
+TAG_CONTEXT_0 = 0xA0
+
+# The attribute names getpeercert() uses for the common name attributes.
+_NAME_ATTRIBUTES = {
+    "2.5.4.3": "commonName",
+    "2.5.4.4": "surname",
+    "2.5.4.5": "serialNumber",
+    "2.5.4.6": "countryName",
+    "2.5.4.7": "localityName",
+    "2.5.4.8": "stateOrProvinceName",
+    "2.5.4.9": "streetAddress",
+    "2.5.4.10": "organizationName",
+    "2.5.4.11": "organizationalUnitName",
+    "2.5.4.12": "title",
+    "2.5.4.42": "givenName",
+    "2.5.4.97": "organizationIdentifier",
+    "0.9.2342.19200300.100.1.25": "domainComponent",
+    "1.2.840.113549.1.9.1": "emailAddress",
+    "1.3.6.1.4.1.311.60.2.1.3": "jurisdictionCountryName",
+    "2.5.4.15": "businessCategory",
+}
+
+# The string encodings used by directory names.
+_STRING_ENCODINGS = {0x0C: "utf-8", 0x13: "ascii", 0x14: "latin-1", 0x16: "ascii", 0x1C: "utf-32-be", 0x1E: "utf-16-be"}
+
+_OID_SUBJECT_ALT_NAME = "2.5.29.17"
+_OID_CRL_DISTRIBUTION_POINTS = "2.5.29.31"
+_OID_AUTHORITY_INFO_ACCESS = "1.3.6.1.5.5.7.1.1"
+_OID_OCSP = "1.3.6.1.5.5.7.48.1"
+_OID_CA_ISSUERS = "1.3.6.1.5.5.7.48.2"
+
+# getpeercert() month names. The names are fixed, so the output does not depend on the locale.
+_MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+# Anything that supports integer indexing and byte slicing, such as bytes or an mmap.
+Buffer = Union[bytes, bytearray, memoryview, mmap.mmap]
+
+
+def read_element(data: Buffer, offset: int, limit: Union[int, None] = None) -> tuple[int, int, int, int]:
+    """Reads one ASN.1 element header.
+
+    DER and the BER indefinite length form used by some PKCS#12 writers are supported.
+
+    Parameters
+    ----------
+    data : Buffer
+        `summary`: The encoded data.
+    offset : int
+        `summary`: The offset of the element tag.
+    limit : Union[int, None], optional
+        `summary`: The offset the element must end before. Defaults to None, which uses the data length.
+
+    Returns
+    -------
+    tuple[int, int, int, int]
+        `summary`: The tag, content start offset, content end offset, and the offset of the next element.
+
+    Raises
+    ------
+    ValueError
+        `summary`: The data is not valid ASN.1.
+    """
+    limit = len(data) if limit is None else limit
+    if offset + 2 > limit:
+        raise ValueError("The ASN.1 element is truncated.")
+    tag = data[offset]
+    if tag & 0x1F == 0x1F:
+        raise ValueError("ASN.1 high tag numbers are not used by certificates.")
+    length = data[offset + 1]
+    start = offset + 2
+    if length == 0x80:
+        # Indefinite length. The content ends at the end-of-contents marker.
+        if not tag & 0x20:
+            raise ValueError("Only constructed ASN.1 elements can use the indefinite length form.")
+        position = start
+        while True:
+            if position + 2 > limit:
+                raise ValueError("The ASN.1 end-of-contents marker is missing.")
+            if data[position] == 0 and data[position + 1] == 0:
+                return tag, start, position, position + 2
+            position = read_element(data, position, limit)[3]
+    if length & 0x80:
+        count = length & 0x7F
+        if count > 4 or start + count > limit:
+            raise ValueError("The ASN.1 length is not supported.")
+        length = int.from_bytes(data[start : start + count], "big")
+        start += count
+    end = start + length
+    if end > limit:
+        raise ValueError("The ASN.1 element is longer than the data.")
+    return tag, start, end, end
+
+
+def iter_elements(data: Buffer, start: int, end: int) -> Iterator[tuple[int, int, int]]:
+    """Yields the tag, content start, and content end of every element between start and end."""
+    position = start
+    while position < end:
+        tag, content_start, content_end, position = read_element(data, position, end)
+        yield tag, content_start, content_end
+
+
+def read_octets(data: Buffer, tag: int, start: int, end: int) -> bytes:
+    """Reads an OCTET STRING. Constructed BER strings are joined."""
+    if tag == TAG_CONSTRUCTED_OCTET_STRING:
+        return b"".join(read_octets(data, *child) for child in iter_elements(data, start, end))
+    if tag != TAG_OCTET_STRING:
+        raise ValueError("An ASN.1 OCTET STRING was expected.")
+    return bytes(data[start:end])
+
+
+@functools.lru_cache(maxsize=1024)
+def decode_oid(value: bytes) -> str:
+    """Decodes an OBJECT IDENTIFIER into the dotted form. Certificates repeat a small set of OIDs, so results are cached."""
+    arcs: list[int] = []
+    current = 0
+    for byte in value:
+        current = (current << 7) | (byte & 0x7F)
+        if not byte & 0x80:
+            arcs.append(current)
+            current = 0
+    if not arcs:
+        raise ValueError("The ASN.1 OBJECT IDENTIFIER is empty.")
+    first = min(arcs[0] // 40, 2)
+    return ".".join(str(arc) for arc in [first, arcs[0] - first * 40, *arcs[1:]])
+
+
+def _expect(element: Union[tuple[int, int, int], None], tag: int, description: str) -> tuple[int, int, int]:
+    """Checks the tag of an element. None is sent when the element is missing."""
+    if element is None or element[0] != tag:
+        raise ValueError(f"The certificate {description} is not valid.")
+    return element
+
+
+def _decode_string(data: Buffer, tag: int, start: int, end: int) -> str:
+    """Decodes a directory string. Unknown string types are decoded as UTF-8."""
+    return bytes(data[start:end]).decode(_STRING_ENCODINGS.get(tag, "utf-8"), errors="replace")
+
+
+def _decode_name(data: Buffer, start: int, end: int) -> tuple:
+    """Decodes a distinguished name into the nested tuples returned by getpeercert()."""
+    name = []
+    for _, set_start, set_end in iter_elements(data, start, end):
+        relative_name = []
+        for _, attribute_start, attribute_end in iter_elements(data, set_start, set_end):
+            (_, oid_start, oid_end), (value_tag, value_start, value_end) = list(
+                iter_elements(data, attribute_start, attribute_end)
+            )[:2]
+            oid = decode_oid(bytes(data[oid_start:oid_end]))
+            relative_name.append(
+                (_NAME_ATTRIBUTES.get(oid, oid), _decode_string(data, value_tag, value_start, value_end))
+            )
+        name.append(tuple(relative_name))
+    return tuple(name)
+
+
+def _decode_time(data: Buffer, tag: int, start: int, end: int) -> float:
+    """Decodes a UTCTime or GeneralizedTime into epoch seconds."""
+    value = bytes(data[start:end]).decode("ascii").rstrip("Z")
+    if tag == TAG_UTC_TIME:
+        year = int(value[0:2])
+        # RFC 5280 maps two digit years 50-99 to 19xx and 00-49 to 20xx.
+        value = f"{1900 + year if year >= 50 else 2000 + year}{value[2:]}"
+    elif tag != TAG_GENERALIZED_TIME:
+        raise ValueError("The certificate validity time is not valid.")
+    return float(
+        calendar.timegm(
+            (int(value[0:4]), int(value[4:6]), int(value[6:8]), int(value[8:10]), int(value[10:12]), int(value[12:14]))
+        )
+    )
+
+
+def format_time(epoch: float) -> str:
+    """Formats epoch seconds the same as the notBefore and notAfter values from getpeercert()."""
+    parts = datetime.datetime.fromtimestamp(epoch, datetime.timezone.utc)
+    return f"{_MONTHS[parts.month - 1]} {parts.day:>2} {parts:%H:%M:%S} {parts.year} GMT"
+
+
+def _decode_general_name(data: Buffer, tag: int, start: int, end: int) -> Union[tuple[str, str], None]:
+    """Decodes the general name types getpeercert() reports."""
+    value = bytes(data[start:end])
+    if tag == 0x82:
+        return "DNS", value.decode("ascii", errors="replace")
+    elif tag == 0x86:
+        return "URI", value.decode("ascii", errors="replace")
+    elif tag == 0x81:
+        return "email", value.decode("ascii", errors="replace")
+    elif tag == 0x87 and len(value) == 4:
+        # Formats the address directly. Certificates shared by many hosts can list hundreds of addresses.
+        return "IP Address", ".".join(map(str, value))
+    elif tag == 0x87 and len(value) == 16:
+        # OpenSSL prints IPv6 addresses as eight uncompressed uppercase groups.
+        return "IP Address", ":".join(f"{int.from_bytes(value[index:index + 2], 'big'):X}" for index in range(0, 16, 2))
+    return None
+
+
+def _decode_extensions(data: Buffer, start: int, end: int, certificate: dict) -> None:
+    """Adds the subject alternative names, OCSP, CA issuer, and CRL distribution point URLs to the certificate."""
+    for _, extension_start, extension_end in iter_elements(data, start, end):
+        parts = list(iter_elements(data, extension_start, extension_end))
+        oid = decode_oid(bytes(data[parts[0][1] : parts[0][2]]))
+        # The critical flag is optional. The value is always the last element.
+        _, value_start, value_end = _expect(parts[-1], TAG_OCTET_STRING, "extension")
+        value_tag, value_start, value_end, _ = read_element(data, value_start, value_end)
+
+        if oid == _OID_SUBJECT_ALT_NAME:
+            names = [_decode_general_name(data, *name) for name in iter_elements(data, value_start, value_end)]
+            certificate["subjectAltName"] = tuple(name for name in names if name)
+        elif oid == _OID_AUTHORITY_INFO_ACCESS:
+            ocsp: list[str] = []
+            ca_issuers: list[str] = []
+            for _, access_start, access_end in iter_elements(data, value_start, value_end):
+                (_, method_start, method_end), location = list(iter_elements(data, access_start, access_end))[:2]
+                method = decode_oid(bytes(data[method_start:method_end]))
+                name = _decode_general_name(data, *location)
+                if name and name[0] == "URI":
+                    (ocsp if method == _OID_OCSP else ca_issuers if method == _OID_CA_ISSUERS else []).append(name[1])
+            if ocsp:
+                certificate["OCSP"] = tuple(ocsp)
+            if ca_issuers:
+                certificate["caIssuers"] = tuple(ca_issuers)
+        elif oid == _OID_CRL_DISTRIBUTION_POINTS:
+            urls: list[str] = []
+            for _, point_start, point_end in iter_elements(data, value_start, value_end):
+                for point_tag, name_start, name_end in iter_elements(data, point_start, point_end):
+                    if point_tag != TAG_CONTEXT_0:
+                        continue
+                    for full_name_tag, full_start, full_end in iter_elements(data, name_start, name_end):
+                        if full_name_tag != TAG_CONTEXT_0:
+                            continue
+                        for general_name in iter_elements(data, full_start, full_end):
+                            name = _decode_general_name(data, *general_name)
+                            if name and name[0] == "URI":
+                                urls.append(name[1])
+            if urls:
+                certificate["crlDistributionPoints"] = tuple(urls)
+
+
+def parse_certificate(data: Buffer, start: int = 0, end: Union[int, None] = None) -> tuple[dict, float, str]:
+    """Parses a DER encoded X.509 certificate without extra packages.
+
+    Only the fields getpeercert() reports are decoded. The signature is not verified.
+
+    Parameters
+    ----------
+    data : Buffer
+        `summary`: The data that holds the DER encoded certificate.
+    start : int, optional
+        `summary`: The offset of the certificate. Defaults to 0.
+    end : Union[int, None], optional
+        `summary`: The offset the certificate must end before. Defaults to None, which uses the data length.
+
+    Returns
+    -------
+    tuple[dict, float, str]
+        `summary`: The certificate in the getpeercert() dictionary format, the notAfter epoch, and the SHA-256 fingerprint.
+
+    Raises
+    ------
+    ValueError
+        `summary`: The data is not a valid X.509 certificate.
+    """
+    tag, certificate_start, certificate_end, next_offset = read_element(data, start, end)
+    if tag != TAG_SEQUENCE:
+        raise ValueError("The data is not an X.509 certificate.")
+    tbs = _expect(next(iter_elements(data, certificate_start, certificate_end), None), TAG_SEQUENCE, "body")
+    fields = list(iter_elements(data, tbs[1], tbs[2]))
+
+    version = 1
+    if fields and fields[0][0] == TAG_CONTEXT_0:
+        _, version_start, version_end = _expect(
+            next(iter_elements(data, fields[0][1], fields[0][2]), None), TAG_INTEGER, "version"
+        )
+        version = int.from_bytes(data[version_start:version_end], "big") + 1
+        fields = fields[1:]
+    if len(fields) < 6:
+        raise ValueError("The certificate body is missing fields.")
+    serial, _, issuer, validity, subject = fields[:5]
+
+    _expect(serial, TAG_INTEGER, "serial number")
+    not_before, not_after = list(iter_elements(data, _expect(validity, TAG_SEQUENCE, "validity")[1], validity[2]))[:2]
+    not_before_epoch = _decode_time(data, *not_before)
+    not_after_epoch = _decode_time(data, *not_after)
+
+    certificate: dict = {
+        "subject": _decode_name(data, subject[1], subject[2]),
+        "issuer": _decode_name(data, issuer[1], issuer[2]),
+        "version": version,
+        "serialNumber": bytes(data[serial[1] : serial[2]]).lstrip(b"\x00").hex().upper() or "00",
+        "notBefore": format_time(not_before_epoch),
+        "notAfter": format_time(not_after_epoch),
+    }
+    for field_tag, field_start, field_end in fields[6:]:
+        # Extensions are wrapped in the [3] tag.
+        if field_tag == 0xA3:
+            _, extensions_start, extensions_end = _expect(
+                next(iter_elements(data, field_start, field_end), None), TAG_SEQUENCE, "extensions"
+            )
+            _decode_extensions(data, extensions_start, extensions_end, certificate)
+
+    fingerprint = hashlib.sha256(data[start:next_offset]).hexdigest()
+    return certificate, not_after_epoch, fingerprint
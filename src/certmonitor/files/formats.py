@@ -0,0 +1,240 @@
+# Package/Modules
+import base64
+import re
+from typing import BinaryIO, Iterator
+
+# Optional Package/Modules
+try:
+    # Only needed for PKCS#12 files that encrypt their certificates.
+    from cryptography.hazmat.primitives.serialization import Encoding, pkcs12
+except ImportError:
+    pkcs12 = None
+
+# Local Package/Modules
+from certmonitor.files.der import (
+    TAG_CONTEXT_0,
+    TAG_INTEGER,
+    Buffer,
+    decode_oid,
+    iter_elements,
+    parse_certificate,
+    read_element,
+    read_octets,
+)
+
+__author__ = "IncognitoCoding"
+__copyright__ = "Copyright 2023, formats"
+__credits__ = ["IncognitoCoding"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "IncognitoCoding"
+__status__ = "Beta"
+
+# Matches each PEM certificate block. OpenSSL trusted certificates and the older X509 label are included.
+PEM_CERTIFICATE = re.compile(
+    rb"-----BEGIN (?:TRUSTED |X509 )?CERTIFICATE-----(.+?)-----END (?:TRUSTED |X509 )?CERTIFICATE-----", re.DOTALL
+)
+
+# The bytes read from a PEM stream at a time. Only one chunk and one partly read certificate are held in memory.
+PEM_CHUNK_SIZE = 1024 * 1024
+# A PEM block that has not ended after this many bytes is not a certificate, so a truncated bundle cannot fill memory.
+PEM_MAX_BLOCK_SIZE = 1024 * 1024
+
+# Starts every PEM block.
+PEM_BEGIN = b"-----BEGIN "
+
+_OID_DATA = "1.2.840.113549.1.7.1"
+_OID_CERT_BAG = "1.2.840.113549.1.12.10.1.3"
+_OID_SAFE_CONTENTS_BAG = "1.2.840.113549.1.12.10.1.6"
+_OID_X509_CERTIFICATE = "1.2.840.113549.1.9.22.1"
+
+
+def _read_content_info(data: Buffer, start: int, end: int) -> tuple[str, tuple[int, int, int]]:
+    """Reads a PKCS#7 ContentInfo and returns the content type and the explicitly tagged content."""
+    parts = list(iter_elements(data, start, end))
+    if len(parts) < 2 or parts[1][0] != TAG_CONTEXT_0:
+        raise ValueError("The PKCS#12 content is not valid.")
+    content = next(iter_elements(data, parts[1][1], parts[1][2]), None)
+    if content is None:
+        raise ValueError("The PKCS#12 content is not valid.")
+    return decode_oid(bytes(data[parts[0][1] : parts[0][2]])), content
+
+
+def _read_safe_contents(data: Buffer, start: int, end: int, certificates: list[tuple[dict, float, str]]) -> None:
+    """Adds the X.509 certificates from the certificate bags of a PKCS#12 SafeContents."""
+    for _, bag_start, bag_end in iter_elements(data, start, end):
+        parts = list(iter_elements(data, bag_start, bag_end))
+        if len(parts) < 2 or parts[1][0] != TAG_CONTEXT_0:
+            raise ValueError("The PKCS#12 bag is not valid.")
+        bag_value = next(iter_elements(data, parts[1][1], parts[1][2]), None)
+        if bag_value is None:
+            raise ValueError("The PKCS#12 bag is not valid.")
+        bag_type = decode_oid(bytes(data[parts[0][1] : parts[0][2]]))
+        _, value_start, value_end = bag_value
+        if bag_type == _OID_CERT_BAG:
+            certificate_type, certificate_value = _read_content_info(data, value_start, value_end)
+            # SDSI certificates are not X.509 and are skipped.
+            if certificate_type == _OID_X509_CERTIFICATE:
+                certificates.append(parse_certificate(read_octets(data, *certificate_value)))
+        elif bag_type == _OID_SAFE_CONTENTS_BAG:
+            _read_safe_contents(data, value_start, value_end, certificates)
+
+
+def _read_encrypted_pkcs12(data: Buffer, password: str) -> list[tuple[dict, float, str]]:
+    """Reads a PKCS#12 file with encrypted certificates through the optional cryptography package."""
+    if pkcs12 is None:
+        raise ValueError(
+            "The PKCS#12 file encrypts its certificates. Install the cryptography package to read encrypted PKCS#12 files."
+        )
+    _, certificate, additional_certificates = pkcs12.load_key_and_certificates(
+        bytes(data), password.encode() if password else None
+    )
+    return [
+        parse_certificate(item.public_bytes(Encoding.DER))
+        for item in [certificate, *additional_certificates]
+        if item is not None
+    ]
+
+
+def read_pkcs12(data: Buffer, password: str = "") -> list[tuple[dict, float, str]]:
+    """Reads the certificates from a PKCS#12 (.p12 or .pfx) file.
+
+    Certificates stored without encryption are read without extra packages. Most tools encrypt the certificates
+    with the file password, and those files are read with the optional cryptography package.
+
+    Parameters
+    ----------
+    data : Buffer
+        `summary`: The PKCS#12 file data.
+    password : str, optional
+        `summary`: The PKCS#12 file password. Defaults to "".
+
+    Returns
+    -------
+    list[tuple[dict, float, str]]
+        `summary`: The parse_certificate() output for each certificate.
+
+    Raises
+    ------
+    ValueError
+        `summary`: The data is not a readable PKCS#12 file.
+    """
+    _, pfx_start, pfx_end, _ = read_element(data, 0)
+    parts = list(iter_elements(data, pfx_start, pfx_end))
+    if len(parts) < 2 or parts[0][0] != TAG_INTEGER:
+        raise ValueError("The data is not a PKCS#12 file.")
+    content_type, content = _read_content_info(data, parts[1][1], parts[1][2])
+    if content_type != _OID_DATA:
+        raise ValueError("PKCS#12 files with public-key integrity protection are not supported.")
+
+    authenticated_safe = read_octets(data, *content)
+    _, safe_start, safe_end, _ = read_element(authenticated_safe, 0)
+    certificates: list[tuple[dict, float, str]] = []
+    for _, info_start, info_end in iter_elements(authenticated_safe, safe_start, safe_end):
+        content_type, content = _read_content_info(authenticated_safe, info_start, info_end)
+        if content_type != _OID_DATA:
+            # The certificates are encrypted, so the whole file is read through the cryptography package.
+            return _read_encrypted_pkcs12(data, password)
+        safe_contents = read_octets(authenticated_safe, *content)
+        _, contents_start, contents_end, _ = read_element(safe_contents, 0)
+        _read_safe_contents(safe_contents, contents_start, contents_end, certificates)
+    return certificates
+
+
+def iter_pem_certificates(stream: BinaryIO, chunk_size: int = PEM_CHUNK_SIZE) -> Iterator[tuple[dict, float, str]]:
+    """Reads the certificates from a PEM stream one at a time.
+
+    The stream is read in chunks, and only the unfinished PEM block at the end of each chunk is carried over, so
+    memory use does not grow with the size of the bundle. Other PEM blocks, such as private keys, are ignored.
+
+    Parameters
+    ----------
+    stream : BinaryIO
+        `summary`: The PEM file opened in binary mode.
+    chunk_size : int, optional
+        `summary`: The bytes read at a time. Defaults to PEM_CHUNK_SIZE.
+
+    Yields
+    ------
+    tuple[dict, float, str]
+        `summary`: The parse_certificate() output for each certificate in file order.
+
+    Raises
+    ------
+    ValueError
+        `summary`: A certificate in the stream is not valid, or a PEM block does not end.
+    """
+    pending = b""
+    while True:
+        chunk = stream.read(chunk_size)
+        data = pending + chunk if pending else chunk
+        last_end = 0
+        for match in PEM_CERTIFICATE.finditer(data):
+            yield parse_certificate(base64.b64decode(match.group(1)))
+            last_end = match.end()
+        if not chunk:
+            return
+        # Keeps the last block that has not ended. Without one, only enough bytes for a marker split across chunks are kept.
+        begin = data.rfind(PEM_BEGIN, last_end)
+        pending = data[begin:] if begin != -1 else data[max(last_end, len(data) - len(PEM_BEGIN)) :]
+        if len(pending) > PEM_MAX_BLOCK_SIZE:
+            raise ValueError(f"A PEM block is larger than {PEM_MAX_BLOCK_SIZE} bytes without an END line.")
+
+
+def iter_certificates(data: Buffer, password: str = "") -> Iterator[tuple[dict, float, str]]:
+    """Reads the certificates from PEM, DER, or PKCS#12 file data one at a time.
+
+    PEM data can hold any number of certificates. Other PEM blocks, such as private keys, are ignored.
+
+    Parameters
+    ----------
+    data : Buffer
+        `summary`: The file data. An mmap can be sent, so large files are not copied into memory.
+    password : str, optional
+        `summary`: The PKCS#12 file password. Defaults to "".
+
+    Yields
+    ------
+    tuple[dict, float, str]
+        `summary`: The parse_certificate() output for each certificate.
+
+    Raises
+    ------
+    ValueError
+        `summary`: The data is not a readable certificate file.
+    """
+    if data.find(PEM_BEGIN) != -1:
+        for match in PEM_CERTIFICATE.finditer(data):
+            yield parse_certificate(base64.b64decode(match.group(1)))
+        return
+
+    # DER certificates start with the certificate body SEQUENCE. PKCS#12 files start with the version INTEGER.
+    _, start, end, _ = read_element(data, 0)
+    first_tag = read_element(data, start, end)[0]
+    if first_tag == TAG_INTEGER:
+        yield from read_pkcs12(data, password)
+    else:
+        yield parse_certificate(data)
+
+
+def read_certificates(data: Buffer, password: str = "") -> list[tuple[dict, float, str]]:
+    """Reads every certificate from PEM, DER, or PKCS#12 file data.
+
+    Parameters
+    ----------
+    data : Buffer
+        `summary`: The file data. An mmap can be sent, so large files are not copied into memory.
+    password : str, optional
+        `summary`: The PKCS#12 file password. Defaults to "".
+
+    Returns
+    -------
+    list[tuple[dict, float, str]]
+        `summary`: The parse_certificate() output for each certificate. PEM files without certificates return an empty list.
+
+    Raises
+    ------
+    ValueError
+        `summary`: The data is not a readable certificate file.
+    """
+    return list(iter_certificates(data, password))
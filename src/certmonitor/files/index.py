@@ -0,0 +1,157 @@
+# Package/Modules
+import logging
+import marshal
+import os
+import sqlite3
+
+# Exceptions
+from fexception import FCustomException
+
+# Local Dataclasses
+from certmonitor.dataclasses.common import CertificateFile
+
+# Local Exceptions
+from certmonitor.exceptions.exceptions import CertMonitorError
+
+__author__ = "IncognitoCoding"
+__copyright__ = "Copyright 2023, index"
+__credits__ = ["IncognitoCoding"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "IncognitoCoding"
+__status__ = "Beta"
+
+# SQLite limits the number of bound parameters, so bulk deletes are split.
+_DELETE_CHUNK_SIZE = 500
+
+# Saved as the SQLite user_version. Indexes with another layout are rebuilt, which parses every file once.
+_SCHEMA_VERSION = 2
+
+_CREATE_TABLE = """
+CREATE TABLE IF NOT EXISTS certificate_files (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    certificates BLOB NOT NULL,
+    certificate_count INTEGER NOT NULL,
+    error TEXT
+)
+"""
+
+
+class FileIndex(object):
+    """Keeps the parsed certificates of every certificate file in a local SQLite database.
+
+    Files are keyed by path, modification time, and size, so unchanged files are not read again on later sweeps.
+    The certificates are stored with marshal, which keeps the getpeercert() tuples and loads much faster than JSON.
+    Entries written by a different Python version that cannot be loaded are parsed again.
+
+    Parameters
+    ----------
+    path : str
+        `summary`: The SQLite database path. The parent directory is created if it does not exist.
+
+    Raises
+    ------
+    CertMonitorError : fexception
+        `summary`: The certificate file index could not be opened.
+    """
+
+    def __init__(self, path: str) -> None:
+        logger = logging.getLogger(__name__)
+
+        try:
+            parent_path = os.path.dirname(os.path.abspath(path))
+            if not os.path.exists(parent_path):
+                os.makedirs(parent_path)
+            self._connection = sqlite3.connect(path)
+            if self._connection.execute("PRAGMA user_version").fetchone()[0] != _SCHEMA_VERSION:
+                logger.info(f"Rebuilding the certificate file index at '{path}' for the current index layout")
+                self._connection.execute("DROP TABLE IF EXISTS certificate_files")
+                self._connection.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+            self._connection.execute(_CREATE_TABLE)
+            self._connection.commit()
+        except Exception as exc:
+            exc_args = {
+                "main_message": f"The certificate file index could not be opened at '{path}'.",
+                "custom_type": CertMonitorError,
+                "returned_result": {exc},
+                "suggested_resolution": "Please verify the 'index_path' value in the 'certificate_files' section of the YAML file.",
+            }
+            raise CertMonitorError(FCustomException(message_args=exc_args))
+        logger.debug(f"Opened the certificate file index at '{path}'")
+
+    def __enter__(self) -> "FileIndex":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Closes the SQLite connection."""
+        self._connection.close()
+
+    def get_all(self) -> dict[str, CertificateFile]:
+        """Gets every indexed certificate file.
+
+        Returns
+        -------
+        dict[str, CertificateFile]
+            `summary`: The indexed files keyed by path.
+        """
+        indexed_files: dict[str, CertificateFile] = {}
+        for path, mtime_ns, size, certificates, certificate_count, error in self._connection.execute(
+            "SELECT * FROM certificate_files"
+        ):
+            try:
+                loaded_certificates = marshal.loads(certificates)
+            except (EOFError, ValueError, TypeError):
+                continue
+            indexed_files[path] = CertificateFile(
+                path=path,
+                mtime_ns=mtime_ns,
+                size=size,
+                certificates=loaded_certificates,
+                certificate_count=certificate_count,
+                error=error,
+            )
+        return indexed_files
+
+    def save_many(self, certificate_files: list[CertificateFile]) -> None:
+        """Saves newly parsed certificate files.
+
+        Parameters
+        ----------
+        certificate_files : list[CertificateFile]
+            `summary`: The parsed certificate files.
+        """
+        with self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO certificate_files VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    (
+                        item.path,
+                        item.mtime_ns,
+                        item.size,
+                        marshal.dumps(item.certificates),
+                        item.certificate_count,
+                        item.error,
+                    )
+                    for item in certificate_files
+                ),
+            )
+
+    def remove_many(self, paths: list[str]) -> None:
+        """Removes files that no longer exist or are no longer configured.
+
+        Parameters
+        ----------
+        paths : list[str]
+            `summary`: The file paths to remove.
+        """
+        with self._connection:
+            for index in range(0, len(paths), _DELETE_CHUNK_SIZE):
+                chunk = paths[index : index + _DELETE_CHUNK_SIZE]
+                self._connection.execute(
+                    f"DELETE FROM certificate_files WHERE path IN ({','.join('?' * len(chunk))})", chunk
+                )
@@ -0,0 +1,285 @@
+# Package/Modules
+import heapq
+import itertools
+import logging
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, Union
+
+# Local Package/Modules
+from certmonitor.check.certificate import build_ssl_return, evaluate_expiration_epochs
+from certmonitor.check.pool import get_worker_count
+from certmonitor.files.formats import PEM_BEGIN, iter_certificates, iter_pem_certificates
+from certmonitor.files.index import FileIndex
+from certmonitor.metrics.registry import metrics
+
+# Local Dataclasses
+from certmonitor.dataclasses.common import CertificateFile, FileSettings, ScanResult
+
+__author__ = "IncognitoCoding"
+__copyright__ = "Copyright 2023, source"
+__credits__ = ["IncognitoCoding"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "IncognitoCoding"
+__status__ = "Beta"
+
+# Worker processes are only started when each worker gets at least this many files. Small batches parse faster
+# in the main process than the time it takes to start the pool.
+POOL_MIN_FILES_PER_WORKER = 256
+
+
+def find_certificate_files(paths: list[str], extensions: tuple[str, ...]) -> dict[str, tuple[int, int]]:
+    """Finds the certificate files in the configured paths.
+
+    Directories are searched recursively without following directory links, so link loops cannot hang the sweep.
+    Configured files are always included. Files found in directories must have one of the extensions.
+
+    Parameters
+    ----------
+    paths : list[str]
+        `summary`: The certificate files and directories.
+    extensions : tuple[str, ...]
+        `summary`: The lowercase file extensions read from directories.
+
+    Returns
+    -------
+    dict[str, tuple[int, int]]
+        `summary`: The modification time in nanoseconds and the size of each file, keyed by path.
+    """
+    logger = logging.getLogger(__name__)
+
+    found: dict[str, tuple[int, int]] = {}
+    pending_directories: list[str] = []
+    for path in paths:
+        if os.path.isdir(path):
+            pending_directories.append(path)
+        elif os.path.isfile(path):
+            stat = os.stat(path)
+            found[path] = (stat.st_mtime_ns, stat.st_size)
+        else:
+            logger.warning(f"The certificate path '{path}' does not exist")
+
+    while pending_directories:
+        directory = pending_directories.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending_directories.append(entry.path)
+                        elif entry.name.lower().endswith(extensions) and entry.is_file():
+                            stat = entry.stat()
+                            found[entry.path] = (stat.st_mtime_ns, stat.st_size)
+                    except OSError:
+                        # The file was removed or cannot be read while the directory was searched.
+                        continue
+        except OSError as exc:
+            logger.warning(f"The certificate directory '{directory}' could not be read. {exc}")
+    return found
+
+
+def _keep_earliest(
+    certificates: Iterator[tuple[dict, float, str]], report_count: int
+) -> tuple[list[tuple[dict, float, str, int]], int]:
+    """Keeps the earliest-expiring certificates while the certificates are read.
+
+    A heap of report_count entries holds the latest-expiring kept certificate at the top, so every other certificate
+    is dropped as soon as it is evaluated.
+
+    Returns
+    -------
+    tuple[list[tuple[dict, float, str, int]], int]
+        `summary`: The kept certificates with their 1-based file position in expiration order, and the certificate count.
+    """
+    heap: list[tuple[float, int, dict, str]] = []
+    certificate_count = 0
+    for certificate_count, (certificate, not_after_epoch, fingerprint) in enumerate(certificates, 1):
+        # The negated position breaks ties, so the dictionaries are never compared.
+        entry = (-not_after_epoch, -certificate_count, certificate, fingerprint)
+        if len(heap) < report_count:
+            heapq.heappush(heap, entry)
+        elif entry > heap[0]:
+            heapq.heapreplace(heap, entry)
+    kept = [
+        (certificate, -negated_epoch, fingerprint, -negated_position)
+        for negated_epoch, negated_position, certificate, fingerprint in sorted(heap, reverse=True)
+    ]
+    return kept, certificate_count
+
+
+def _parse_certificate_file(
+    path: str, password: str, report_count: int
+) -> tuple[list[tuple[dict, float, str, int]], int, Union[str, None]]:
+    """Parses one certificate file and keeps the earliest-expiring certificates.
+
+    PEM files are streamed in chunks. DER and PKCS#12 files are read through a read-only memory map.
+    Failures are returned instead of raised, so one bad file never stops the sweep.
+    """
+    try:
+        with open(path, "rb") as file:
+            # Empty files cannot be memory-mapped and hold no certificates.
+            if os.fstat(file.fileno()).st_size == 0:
+                return [], 0, None
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                if data.find(PEM_BEGIN) == -1:
+                    return (*_keep_earliest(iter_certificates(data, password), report_count), None)
+            return (*_keep_earliest(iter_pem_certificates(file), report_count), None)
+    except Exception as exc:
+        return [], 0, f"{type(exc).__name__}: {exc}"
+
+
+def _parse_files(
+    paths: list[str], password: str, report_count: int, workers: int
+) -> list[tuple[list[tuple[dict, float, str, int]], int, Union[str, None]]]:
+    """Parses the files in the main process or across a pool of worker processes.
+
+    Returns
+    -------
+    list[tuple[list[tuple[dict, float, str, int]], int, Union[str, None]]]
+        `summary`: The kept certificates, the certificate count, and the failure message of each file in the same order as the paths.
+    """
+    logger = logging.getLogger(__name__)
+
+    worker_count = min(get_worker_count(workers), len(paths) // POOL_MIN_FILES_PER_WORKER)
+    if worker_count <= 1:
+        return [_parse_certificate_file(path, password, report_count) for path in paths]
+
+    logger.debug(f"Parsing {len(paths)} certificate file(s) across {worker_count} worker process(es)")
+    with ProcessPoolExecutor(max_workers=worker_count) as executor:
+        # Several batches per worker keep the workers busy when some directories hold larger files.
+        return list(
+            executor.map(
+                _parse_certificate_file,
+                paths,
+                itertools.repeat(password),
+                itertools.repeat(report_count),
+                chunksize=max(1, len(paths) // (worker_count * 8)),
+            )
+        )
+
+
+def scan_certificate_files(file_settings: FileSettings, buffer_days: int, time_zone: str) -> list[ScanResult]:
+    """Checks the certificate expiration of the local certificate files.
+
+    New and changed files are parsed. Unchanged files are read from the file index. Each file is reported by the
+    certificates that expire first, so a bundle alerts when any certificate in it is expiring. Files that report more
+    than one certificate name each result by the certificate position, such as ca-bundle.pem#12.
+
+    Parameters
+    ----------
+    file_settings : FileSettings
+        `summary`: The certificate file settings.
+    buffer_days : int
+        `summary`: Days to buffer certificate expiring before notifying.
+    time_zone : str
+        `summary`: Time zone the program is running.
+
+    Returns
+    -------
+    list[ScanResult]
+        `summary`: One scan result per reported certificate. Files without certificates, such as key files, are not included.
+
+    Raises
+    ------
+    CertMonitorError : fexception
+        `summary`: The certificate file index could not be opened.
+    """
+    logger = logging.getLogger(__name__)
+
+    report_count = file_settings.report_count
+    found = find_certificate_files(
+        file_settings.paths, tuple(extension.lower() for extension in file_settings.extensions)
+    )
+    with FileIndex(file_settings.index_path) as file_index:
+        indexed_files = file_index.get_all()
+        # Files are parsed again when they changed or when a higher report count needs certificates that were not kept.
+        changed_paths = [
+            path
+            for path, (mtime_ns, size) in found.items()
+            if path not in indexed_files
+            or indexed_files[path].mtime_ns != mtime_ns
+            or indexed_files[path].size != size
+            or len(indexed_files[path].certificates) < min(report_count, indexed_files[path].certificate_count)
+        ]
+        removed_paths = [path for path in indexed_files if path not in found]
+
+        parsed_files = [
+            CertificateFile(
+                path=path,
+                mtime_ns=found[path][0],
+                size=found[path][1],
+                certificates=certificates,
+                certificate_count=certificate_count,
+                error=error,
+            )
+            for path, (certificates, certificate_count, error) in zip(
+                changed_paths,
+                _parse_files(changed_paths, file_settings.pkcs12_password, report_count, file_settings.workers),
+            )
+        ]
+        file_index.save_many(parsed_files)
+        file_index.remove_many(removed_paths)
+    indexed_files.update((parsed_file.path, parsed_file) for parsed_file in parsed_files)
+    parsed_paths = set(changed_paths)
+
+    metrics.increment("certmonitor_certificate_files_total", len(parsed_files), result="parsed")
+    metrics.increment("certmonitor_certificate_files_total", len(found) - len(parsed_files), result="indexed")
+    logger.info(
+        f"Found {len(found)} certificate file(s) holding "
+        f"{sum(indexed_files[path].certificate_count for path in found)} certificate(s). "
+        f"{len(parsed_files)} new or changed file(s) were parsed, "
+        f"and {len(found) - len(parsed_files)} unchanged file(s) were read from the index"
+    )
+
+    # Reports each file by the certificates that expire first. Files without certificates, such as key files, are skipped.
+    reported_certificates: list[tuple[str, str, tuple[dict, float, str, int]]] = []
+    for path in sorted(found):
+        kept = indexed_files[path].certificates[:report_count]
+        for certificate in kept:
+            name = path if len(kept) == 1 else f"{path}#{certificate[3]}"
+            reported_certificates.append((name, path, certificate))
+    expiration_msgs = evaluate_expiration_epochs(
+        site_urls=[name for name, _, _ in reported_certificates],
+        not_after_epochs=[certificate[1] for _, _, certificate in reported_certificates],
+        buffer_days=buffer_days,
+        time_zone=time_zone,
+    )
+    scan_results = [
+        ScanResult(
+            site_url=name,
+            expiration_msg=expiration_msg,
+            error=None,
+            checked=True,
+            resolved=True,
+            reachable=True,
+            ssl_return=build_ssl_return(certificate[0]),
+            fingerprint=certificate[2],
+            not_after_epoch=certificate[1],
+            cached=path not in parsed_paths,
+            source="file",
+            chain_error=None,
+        )
+        for (name, path, certificate), expiration_msg in zip(reported_certificates, expiration_msgs)
+    ]
+    # Files that could not be parsed are reported as failed checks.
+    scan_results.extend(
+        ScanResult(
+            site_url=path,
+            expiration_msg=None,
+            error=indexed_files[path].error,
+            checked=True,
+            resolved=True,
+            reachable=True,
+            ssl_return=None,
+            fingerprint=None,
+            not_after_epoch=None,
+            cached=path not in parsed_paths,
+            source="file",
+            chain_error=None,
+        )
+        for path in sorted(found)
+        if indexed_files[path].error
+    )
+    return scan_results
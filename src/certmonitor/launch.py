@@ -1,6 +1,7 @@
 # Package/Modules
 from dataclasses import asdict
-from time import sleep
+import hashlib
+import time
 import os
 import logging
 import pathlib
@@ -14,10 +15,28 @@ from ictoolkit.directors.email_director import send_email
 from fexception import FCustomException
 
 # Local Package/Modules
+from certmonitor.api.server import start_api_server
 from certmonitor.check.check import cert_check
+from certmonitor.check.ondemand import OnDemandQueue
+from certmonitor.check.pool import shutdown_worker_pools
+from certmonitor.check.scheduler import HostScheduler
+from certmonitor.check.targets import parse_target
+from certmonitor.metrics.exporter import start_metrics_server
+from certmonitor.store.snapshot import ResultSnapshot
 
 # Local Dataclasses
-from certmonitor.dataclasses.common import StartupSettings, EmailSettings
+from certmonitor.dataclasses.common import (
+    StartupSettings,
+    EmailSettings,
+    ScanSettings,
+    StoreSettings,
+    AlertSettings,
+    MetricsSettings,
+    FileSettings,
+    RetrySettings,
+    InventorySettings,
+    ApiSettings,
+)
 
 # Local Exceptions
 from certmonitor.exceptions.exceptions import CertMonitorError
@@ -30,12 +49,62 @@ __version__ = "0.1"
 __maintainer__ = "IncognitoCoding"
 __status__ = "Beta"
 
+# Keeps the next check time of each URL between main loops.
+host_scheduler = HostScheduler()
+# Keeps the latest result of every URL and certificate file between main loops in compact columns.
+result_snapshot = ResultSnapshot()
+# Passes the on-demand checks from the API to the check loop.
+on_demand_queue = OnDemandQueue()
+# Keeps the parsed settings between main loops. The YAML file is only parsed again when the file changes.
+settings_cache: dict = {"signature": None, "startup_settings": None}
+# The running metrics endpoint and the (host, port) it listens on.
+metrics_endpoint: dict = {"server": None, "address": None}
+# The running API and the (host, port, socket_path) it listens on.
+api_endpoint: dict = {"server": None, "address": None}
+
+
+def get_settings_signature(
+    yaml_file_path: str, cached_signature: Union[tuple[int, int, str], None]
+) -> tuple[int, int, str]:
+    """Gets the change signature of the YAML settings file.
+
+    The file content is only hashed when the modification time or size changed, so an unchanged file costs one stat call.
+
+    Parameters
+    ----------
+    yaml_file_path : str
+        `summary`: The YAML settings file path.
+    cached_signature : Union[tuple[int, int, str], None]
+        `summary`: The signature from the last load. None is sent before the first load.
 
-def get_startup_settings() -> StartupSettings:
+    Returns
+    -------
+    tuple[int, int, str]
+        `summary`: The modification time in nanoseconds, the size, and the SHA-256 content hash.
+
+    Raises
+    ------
+    FileNotFoundError
+        `summary`: The YAML settings file does not exist.
+    """
+    file_stat = os.stat(yaml_file_path)
+    if cached_signature and cached_signature[:2] == (file_stat.st_mtime_ns, file_stat.st_size):
+        return cached_signature
+    with open(yaml_file_path, "rb") as yaml_file:
+        content_hash = hashlib.sha256(yaml_file.read()).hexdigest()
+    return file_stat.st_mtime_ns, file_stat.st_size, content_hash
+
+
+def get_startup_settings(settings_path: Union[str, None] = None) -> StartupSettings:
     """Populates all hard-coded and yaml-configuration variables into a dataclass that is pulled into the main function.
 
     YAML entry validation checks are performed within this function. No manual configurations are setup within the program. All user settings are completed in the "settings.yaml" configuration file.
 
+    Parameters
+    ----------
+    settings_path : Union[str, None], optional
+        `summary`: The YAML settings file path. The settings.yaml file in the working directory is used when not set. Defaults to None.
+
     Returns
     -------
     StartupSettings
@@ -57,6 +126,110 @@ def get_startup_settings() -> StartupSettings:
         `summary`: The object value '{time_zome}' is not an instance of the required class(es) or subclass(es).
     FTypeError : fexception
         `summary`: The object value '{site_urls}' is not an instance of the required class(es) or subclass(es).
+    FTypeError : fexception
+        `summary`: The object value '{site_url}' is not an instance of the required class(es) or subclass(es).
+    CertMonitorError : fexception
+        `summary`: The site URL '{site_url}' is not a valid HTTPS target.
+    FTypeError : fexception
+        `summary`: The object value '{concurrency}' is not an instance of the required class(es) or subclass(es).
+    FTypeError : fexception
+        `summary`: The object value '{workers}' is not an instance of the required class(es) or subclass(es).
+    FTypeError : fexception
+        `summary`: The object value '{dns_timeout}' is not an instance of the required class(es) or subclass(es).
+    FTypeError : fexception
+        `summary`: The object value '{connect_timeout}' is not an instance of the required class(es) or subclass(es).
+    FTypeError : fexception
+        `summary`: The object value '{handshake_timeout}' is not an instance of the required class(es) or subclass(es).
+    FTypeError : fexception
+        `summary`: The object value '{read_timeout}' is not an instance of the required class(es) or subclass(es).
+    FTypeError : fexception
+        `summary`: The object value '{sweep_deadline}' is not an instance of the required class(es) or subclass(es).
+    FTypeError : fexception
+        `summary`: The object value '{probe_mode}' is not an instance of the required class(es) or subclass(es).
+    FTypeError : fexception
+        `summary`: The object value '{session_cache}' is not an instance of the required class(es) or subclass(es).
+    FTypeError : fexception
+        `summary`: The object value '{session_max_age}' is not an instance of the required class(es) or subclass(es).
+    FTypeError : fexception
+        `summary`: The object value '{dns_cache_ttl}' is not an instance of the required class(es) or subclass(es).
+    FTypeError : fexception
+        `summary`: The object value '{ip_rate}' is not an instance of the required class(es) or subclass(es).
+    FTypeError : fexception
+        `summary`: The object value '{ip_burst}' is not an instance of the required class(es) or subclass(es).
+    FTypeError : fexception
+        `summary`: The object value '{network_rate}' is not an instance of the required class(es) or subclass(es).
+    FTypeError : fexception
+        `summary`: The object value '{network_burst}' is not an instance of the required class(es) or subclass(es).
+    FTypeError : fexception
+        `summary`: The object value '{domain_rate}' is not an instance of the required class(es) or subclass(es).
+    FTypeError : fexception
+        `summary`: The object value '{domain_burst}' is not an instance of the required class(es) or subclass(es).
+    CertMonitorError : fexception
+        `summary`: The 'scan' section politeness limits are not valid.
+    FTypeError : fexception
+        `summary`: The object value '{store_enabled}' is not an instance of the required class(es) or subclass(es).
+    FTypeError : fexception
+        `summary`: The object value '{store_path}' is not an instance of the required class(es) or subclass(es).
+    FTypeError : fexception
+        `summary`: The object value '{recheck_after}' is not an instance of the required class(es) or subclass(es).
+    FTypeError : fexception
+        `summary`: The object value '{skip_margin_days}' is not an instance of the required class(es) or subclass(es).
+    FTypeError : fexception
+        `summary`: The object value '{digest}' is not an instance of the required class(es) or subclass(es).
+    FTypeError : fexception
+        `summary`: The object value '{digest_max_entries}' is not an instance of the required class(es) or subclass(es).
+    FTypeError : fexception
+        `summary`: The object value '{dedupe}' is not an instance of the required class(es) or subclass(es).
+    FTypeError : fexception
+        `summary`: The object value '{renotify_interval}' is not an instance of the required class(es) or subclass(es).
+    FTypeError : fexception
+        `summary`: The object value '{alert_state_path}' is not an instance of the required class(es) or subclass(es).
+    FTypeError : fexception
+        `summary`: The object value '{metrics_enabled}' is not an instance of the required class(es) or subclass(es).
+    FTypeError : fexception
+        `summary`: The object value '{metrics_host}' is not an instance of the required class(es) or subclass(es).
+    FTypeError : fexception
+        `summary`: The object value '{metrics_port}' is not an instance of the required class(es) or subclass(es).
+    FTypeError : fexception
+        `summary`: The object value '{certificate_paths}' is not an instance of the required class(es) or subclass(es).
+    FTypeError : fexception
+        `summary`: The object value '{certificate_extensions}' is not an instance of the required class(es) or subclass(es).
+    FTypeError : fexception
+        `summary`: The object value '{file_workers}' is not an instance of the required class(es) or subclass(es).
+    FTypeError : fexception
+        `summary`: The object value '{file_index_path}' is not an instance of the required class(es) or subclass(es).
+    FTypeError : fexception
+        `summary`: The object value '{pkcs12_password}' is not an instance of the required class(es) or subclass(es).
+    FTypeError : fexception
+        `summary`: The object value '{report_count}' is not an instance of the required class(es) or subclass(es).
+    FTypeError : fexception
+        `summary`: The object value '{retry_enabled}' is not an instance of the required class(es) or subclass(es).
+    FTypeError : fexception
+        `summary`: The object value '{failure_threshold}' is not an instance of the required class(es) or subclass(es).
+    FTypeError : fexception
+        `summary`: The object value '{retry_base_delay}' is not an instance of the required class(es) or subclass(es).
+    FTypeError : fexception
+        `summary`: The object value '{retry_max_delay}' is not an instance of the required class(es) or subclass(es).
+    FTypeError : fexception
+        `summary`: The object value '{retry_state_path}' is not an instance of the required class(es) or subclass(es).
+    FTypeError : fexception
+        `summary`: The object value '{inventory_paths}' is not an instance of the required class(es) or subclass(es).
+    FTypeError : fexception
+        `summary`: The object value '{csv_column}' is not an instance of the required class(es) or subclass(es).
+    FTypeError : fexception
+        `summary`: The object value '{chunk_size}' is not an instance of the required class(es) or subclass(es).
+    FTypeError : fexception
+        `summary`: The object value '{inventory_interval}' is not an instance of the required class(es) or subclass(es).
+    FTypeError : fexception
+        `summary`: The object value '{api_enabled}' is not an instance of the required class(es) or subclass(es).
+    FTypeError : fexception
+        `summary`: The object value '{api_host}' is not an instance of the required class(es) or subclass(es).
+    FTypeError : fexception
+        `summary`: The object value '{api_port}' is not an instance of the required class(es) or subclass(es).
+    FTypeError : fexception
+        `summary`: The object value '{socket_path}' is not an instance of the required class(es) or subclass(es).
+    CertMonitorError : fexception
+        `summary`: The API is enabled without continuous monitoring.
     """
     logger = logging.getLogger(__name__)
 
@@ -69,8 +242,8 @@ def get_startup_settings() -> StartupSettings:
     # Gets the config from the YAML file.
     # Gets the main program root directory.
     main_script_path = pathlib.Path.cwd()
-    # Sets the reports directory save path.
-    settings_path_name = os.path.abspath(f"{main_script_path}/settings.yaml")
+    # Sets the YAML settings file path.
+    settings_path_name = os.path.abspath(settings_path or f"{main_script_path}/settings.yaml")
     returned_yaml_read_config = read_yaml_config(settings_path_name, "FullLoader")
 
     # Validates required root keys exist in the YAML configuration.
@@ -126,6 +299,10 @@ def get_startup_settings() -> StartupSettings:
     # Gets URLs that need to be checked.
     site_urls: list[str] = returned_yaml_read_config.get("site_urls", {})  # type: ignore
     type_check(value=site_urls, required_type=list)
+    # Validates every URL up front, so a typo stops the program at startup instead of in the middle of a sweep.
+    for site_url in site_urls:
+        type_check(value=site_url, required_type=str)
+        parse_target(site_url)
     ##############################################################################
     # Sets email values.
     smtp: str = returned_yaml_read_config.get("email", {}).get("smtp")  # type: ignore
@@ -144,6 +321,233 @@ def get_startup_settings() -> StartupSettings:
     type_check(value=from_email, required_type=str)
     type_check(value=to_email, required_type=str)
     ##############################################################################
+    ##############################################################################
+    # Sets scan engine values.
+    # The scan section is optional. Defaults are used when the section or a key is missing.
+    concurrency: int = returned_yaml_read_config.get("scan", {}).get("concurrency", 100)  # type: ignore
+    workers: int = returned_yaml_read_config.get("scan", {}).get("workers", 1)  # type: ignore
+    # Time is in seconds. 0 disables the timeout or deadline.
+    dns_timeout: float = returned_yaml_read_config.get("scan", {}).get("dns_timeout", 5)  # type: ignore
+    connect_timeout: float = returned_yaml_read_config.get("scan", {}).get("connect_timeout", 10)  # type: ignore
+    handshake_timeout: float = returned_yaml_read_config.get("scan", {}).get("handshake_timeout", 10)  # type: ignore
+    read_timeout: float = returned_yaml_read_config.get("scan", {}).get("read_timeout", 5)  # type: ignore
+    sweep_deadline: float = returned_yaml_read_config.get("scan", {}).get("sweep_deadline", 0)  # type: ignore
+    probe_mode: bool = returned_yaml_read_config.get("scan", {}).get("probe_mode", False)  # type: ignore
+    session_cache: bool = returned_yaml_read_config.get("scan", {}).get("session_cache", False)  # type: ignore
+    session_max_age: int = returned_yaml_read_config.get("scan", {}).get("session_max_age", 3600)  # type: ignore
+    dns_cache_ttl: int = returned_yaml_read_config.get("scan", {}).get("dns_cache_ttl", 300)  # type: ignore
+    # New connections per second and the burst allowed at once for each IP, /24 or /64 network, and registered domain.
+    # The limits are off unless a rate is set. An empty rate is the same as 0.
+    ip_rate: float = returned_yaml_read_config.get("scan", {}).get("ip_rate") or 0  # type: ignore
+    ip_burst: int = returned_yaml_read_config.get("scan", {}).get("ip_burst", 10)  # type: ignore
+    network_rate: float = returned_yaml_read_config.get("scan", {}).get("network_rate") or 0  # type: ignore
+    network_burst: int = returned_yaml_read_config.get("scan", {}).get("network_burst", 25)  # type: ignore
+    domain_rate: float = returned_yaml_read_config.get("scan", {}).get("domain_rate") or 0  # type: ignore
+    domain_burst: int = returned_yaml_read_config.get("scan", {}).get("domain_burst", 10)  # type: ignore
+
+    type_check(value=concurrency, required_type=int)
+    type_check(value=workers, required_type=int)
+    type_check(value=dns_timeout, required_type=(int, float))
+    type_check(value=connect_timeout, required_type=(int, float))
+    type_check(value=handshake_timeout, required_type=(int, float))
+    type_check(value=read_timeout, required_type=(int, float))
+    type_check(value=sweep_deadline, required_type=(int, float))
+    type_check(value=probe_mode, required_type=bool)
+    type_check(value=session_cache, required_type=bool)
+    type_check(value=session_max_age, required_type=int)
+    type_check(value=dns_cache_ttl, required_type=int)
+    type_check(value=ip_rate, required_type=(int, float))
+    type_check(value=ip_burst, required_type=int)
+    type_check(value=network_rate, required_type=(int, float))
+    type_check(value=network_burst, required_type=int)
+    type_check(value=domain_rate, required_type=(int, float))
+    type_check(value=domain_burst, required_type=int)
+
+    if min(ip_rate, network_rate, domain_rate) < 0 or min(ip_burst, network_burst, domain_burst) < 1:
+        exc_args = {
+            "main_message": "The 'scan' section politeness limits are not valid.",
+            "custom_type": CertMonitorError,
+            "returned_result": f"ip_rate = {ip_rate}, ip_burst = {ip_burst}, network_rate = {network_rate}, network_burst = {network_burst}, domain_rate = {domain_rate}, domain_burst = {domain_burst}",
+            "suggested_resolution": "Please set the rates to 0 or higher and the bursts to 1 or higher in the YAML file.",
+        }
+        raise CertMonitorError(FCustomException(message_args=exc_args))
+    ##############################################################################
+    ##############################################################################
+    # Sets result store values.
+    # The store section is optional. Defaults are used when the section or a key is missing.
+    store_enabled: bool = returned_yaml_read_config.get("store", {}).get("enabled", False)  # type: ignore
+    store_path: str = returned_yaml_read_config.get("store", {}).get("path", "certmonitor.db")  # type: ignore
+    # Time is in seconds.
+    recheck_after: int = returned_yaml_read_config.get("store", {}).get("recheck_after", 86400)  # type: ignore
+    skip_margin_days: int = returned_yaml_read_config.get("store", {}).get("skip_margin_days", 30)  # type: ignore
+
+    type_check(value=store_enabled, required_type=bool)
+    type_check(value=store_path, required_type=str)
+    type_check(value=recheck_after, required_type=int)
+    type_check(value=skip_margin_days, required_type=int)
+
+    # Relative store paths are saved in the main program root directory.
+    store_path = os.path.abspath(os.path.join(main_script_path, store_path))
+    ##############################################################################
+    ##############################################################################
+    # Sets alert delivery values.
+    # The alerts section is optional. Defaults are used when the section or a key is missing.
+    digest: bool = returned_yaml_read_config.get("alerts", {}).get("digest", False)  # type: ignore
+    digest_max_entries: int = returned_yaml_read_config.get("alerts", {}).get("digest_max_entries", 500)  # type: ignore
+    dedupe: bool = returned_yaml_read_config.get("alerts", {}).get("dedupe", False)  # type: ignore
+    # Time is in seconds.
+    renotify_interval: int = returned_yaml_read_config.get("alerts", {}).get("renotify_interval", 86400)  # type: ignore
+    alert_state_path: str = returned_yaml_read_config.get("alerts", {}).get("state_path", "alert_state.db")  # type: ignore
+
+    type_check(value=digest, required_type=bool)
+    type_check(value=digest_max_entries, required_type=int)
+    type_check(value=dedupe, required_type=bool)
+    type_check(value=renotify_interval, required_type=int)
+    type_check(value=alert_state_path, required_type=str)
+
+    # Relative alert state paths are saved in the main program root directory.
+    alert_state_path = os.path.abspath(os.path.join(main_script_path, alert_state_path))
+
+    if digest_max_entries < 1:
+        exc_args = {
+            "main_message": "The 'digest_max_entries' value in the 'alerts' section must be 1 or higher.",
+            "custom_type": CertMonitorError,
+            "returned_result": digest_max_entries,
+            "suggested_resolution": "Please update the 'digest_max_entries' value in the YAML file.",
+        }
+        raise CertMonitorError(FCustomException(message_args=exc_args))
+    ##############################################################################
+    ##############################################################################
+    # Sets metrics endpoint values.
+    # The metrics section is optional. Defaults are used when the section or a key is missing.
+    metrics_enabled: bool = returned_yaml_read_config.get("metrics", {}).get("enabled", False)  # type: ignore
+    metrics_host: str = returned_yaml_read_config.get("metrics", {}).get("host", "127.0.0.1")  # type: ignore
+    metrics_port: int = returned_yaml_read_config.get("metrics", {}).get("port", 9464)  # type: ignore
+
+    type_check(value=metrics_enabled, required_type=bool)
+    type_check(value=metrics_host, required_type=str)
+    type_check(value=metrics_port, required_type=int)
+    ##############################################################################
+    ##############################################################################
+    # Sets certificate file values.
+    # The certificate_files section is optional. No files are checked when the section is missing.
+    certificate_paths: list[str] = returned_yaml_read_config.get("certificate_files", {}).get("paths", [])  # type: ignore
+    certificate_extensions: list[str] = returned_yaml_read_config.get("certificate_files", {}).get(  # type: ignore
+        "extensions", [".pem", ".crt", ".cer", ".der", ".p12", ".pfx"]
+    )
+    file_workers: int = returned_yaml_read_config.get("certificate_files", {}).get("workers", 1)  # type: ignore
+    file_index_path: str = returned_yaml_read_config.get("certificate_files", {}).get(  # type: ignore
+        "index_path", "file_index.db"
+    )
+    pkcs12_password: str = returned_yaml_read_config.get("certificate_files", {}).get("pkcs12_password", "")  # type: ignore
+    report_count: int = returned_yaml_read_config.get("certificate_files", {}).get("report_count", 1)  # type: ignore
+
+    type_check(value=certificate_paths, required_type=list)
+    type_check(value=certificate_extensions, required_type=list)
+    type_check(value=file_workers, required_type=int)
+    type_check(value=file_index_path, required_type=str)
+    type_check(value=pkcs12_password, required_type=str)
+    type_check(value=report_count, required_type=int)
+
+    # Relative certificate paths and the relative index path are in the main program root directory.
+    certificate_paths = [os.path.abspath(os.path.join(main_script_path, path)) for path in certificate_paths]
+    file_index_path = os.path.abspath(os.path.join(main_script_path, file_index_path))
+
+    if report_count < 1:
+        exc_args = {
+            "main_message": "The 'report_count' value in the 'certificate_files' section must be 1 or higher.",
+            "custom_type": CertMonitorError,
+            "returned_result": report_count,
+            "suggested_resolution": "Please update the 'report_count' value in the YAML file.",
+        }
+        raise CertMonitorError(FCustomException(message_args=exc_args))
+    ##############################################################################
+    ##############################################################################
+    # Sets failed site retry values.
+    # The retry section is optional. Failed sites are checked and alerted on every loop when the section is missing.
+    retry_enabled: bool = returned_yaml_read_config.get("retry", {}).get("enabled", False)  # type: ignore
+    failure_threshold: int = returned_yaml_read_config.get("retry", {}).get("failure_threshold", 3)  # type: ignore
+    retry_base_delay: int = returned_yaml_read_config.get("retry", {}).get("base_delay", 300)  # type: ignore
+    retry_max_delay: int = returned_yaml_read_config.get("retry", {}).get("max_delay", 86400)  # type: ignore
+    retry_state_path: str = returned_yaml_read_config.get("retry", {}).get("state_path", "host_failures.db")  # type: ignore
+
+    type_check(value=retry_enabled, required_type=bool)
+    type_check(value=failure_threshold, required_type=int)
+    type_check(value=retry_base_delay, required_type=int)
+    type_check(value=retry_max_delay, required_type=int)
+    type_check(value=retry_state_path, required_type=str)
+
+    # Relative retry state paths are saved in the main program root directory.
+    retry_state_path = os.path.abspath(os.path.join(main_script_path, retry_state_path))
+
+    if failure_threshold < 1 or retry_base_delay < 1 or retry_max_delay < retry_base_delay:
+        exc_args = {
+            "main_message": "The 'retry' section values are not valid.",
+            "custom_type": CertMonitorError,
+            "returned_result": f"failure_threshold = {failure_threshold}, base_delay = {retry_base_delay}, max_delay = {retry_max_delay}",
+            "suggested_resolution": "Please set 'failure_threshold' and 'base_delay' to 1 or higher and 'max_delay' to at least 'base_delay' in the YAML file.",
+        }
+        raise CertMonitorError(FCustomException(message_args=exc_args))
+    ##############################################################################
+    ##############################################################################
+    # Sets the external site URL inventory values.
+    # The inventory section is optional. Only the site_urls are checked when the section is missing.
+    inventory_paths: list[str] = returned_yaml_read_config.get("inventory", {}).get("paths", [])  # type: ignore
+    csv_column: str = returned_yaml_read_config.get("inventory", {}).get("csv_column", "site_url")  # type: ignore
+    chunk_size: int = returned_yaml_read_config.get("inventory", {}).get("chunk_size", 10000)  # type: ignore
+    inventory_interval: int = returned_yaml_read_config.get("inventory", {}).get("interval", 86400)  # type: ignore
+
+    type_check(value=inventory_paths, required_type=list)
+    type_check(value=csv_column, required_type=str)
+    type_check(value=chunk_size, required_type=int)
+    type_check(value=inventory_interval, required_type=int)
+
+    # Relative inventory paths are in the main program root directory.
+    inventory_paths = [os.path.abspath(os.path.join(main_script_path, path)) for path in inventory_paths]
+
+    if chunk_size < 1:
+        exc_args = {
+            "main_message": "The inventory chunk size must be greater than zero.",
+            "custom_type": CertMonitorError,
+            "returned_result": chunk_size,
+            "suggested_resolution": "Please verify the 'chunk_size' value in the 'inventory' section of the YAML file.",
+        }
+        raise CertMonitorError(FCustomException(message_args=exc_args))
+    if inventory_interval < 0:
+        exc_args = {
+            "main_message": "The inventory interval must be zero or greater.",
+            "custom_type": CertMonitorError,
+            "returned_result": inventory_interval,
+            "suggested_resolution": "Please verify the 'interval' value in the 'inventory' section of the YAML file.",
+        }
+        raise CertMonitorError(FCustomException(message_args=exc_args))
+    ##############################################################################
+    ##############################################################################
+    # Sets the local API values.
+    # The api section is optional. The API is disabled when the section is missing.
+    api_enabled: bool = returned_yaml_read_config.get("api", {}).get("enabled", False)  # type: ignore
+    api_host: str = returned_yaml_read_config.get("api", {}).get("host", "127.0.0.1")  # type: ignore
+    api_port: int = returned_yaml_read_config.get("api", {}).get("port", 8586)  # type: ignore
+    socket_path: str = returned_yaml_read_config.get("api", {}).get("socket_path", "")  # type: ignore
+
+    type_check(value=api_enabled, required_type=bool)
+    type_check(value=api_host, required_type=str)
+    type_check(value=api_port, required_type=int)
+    type_check(value=socket_path, required_type=str)
+
+    # The empty default uses TCP. Relative socket paths are in the main program root directory.
+    if socket_path:
+        socket_path = os.path.abspath(os.path.join(main_script_path, socket_path))
+
+    if api_enabled and not continuous_monitoring:
+        exc_args = {
+            "main_message": "The API requires continuous monitoring.",
+            "custom_type": CertMonitorError,
+            "returned_result": "continuous_monitoring = False",
+            "suggested_resolution": "Please enable 'continuous_monitoring' or disable the 'api' section in the YAML file.",
+        }
+        raise CertMonitorError(FCustomException(message_args=exc_args))
+    ##############################################################################
 
     startup_variables = StartupSettings(
         continuous_monitoring=continuous_monitoring,
@@ -162,6 +566,70 @@ def get_startup_settings() -> StartupSettings:
             from_email=from_email,
             to_email=to_email,
         ),
+        scan_settings=ScanSettings(
+            concurrency=concurrency,
+            workers=workers,
+            dns_timeout=dns_timeout,
+            connect_timeout=connect_timeout,
+            handshake_timeout=handshake_timeout,
+            read_timeout=read_timeout,
+            sweep_deadline=sweep_deadline,
+            probe_mode=probe_mode,
+            session_cache=session_cache,
+            session_max_age=session_max_age,
+            dns_cache_ttl=dns_cache_ttl,
+            ip_rate=ip_rate,
+            ip_burst=ip_burst,
+            network_rate=network_rate,
+            network_burst=network_burst,
+            domain_rate=domain_rate,
+            domain_burst=domain_burst,
+        ),
+        store_settings=StoreSettings(
+            enabled=store_enabled,
+            path=store_path,
+            recheck_after=recheck_after,
+            skip_margin_days=skip_margin_days,
+        ),
+        alert_settings=AlertSettings(
+            digest=digest,
+            digest_max_entries=digest_max_entries,
+            dedupe=dedupe,
+            renotify_interval=renotify_interval,
+            state_path=alert_state_path,
+        ),
+        metrics_settings=MetricsSettings(
+            enabled=metrics_enabled,
+            host=metrics_host,
+            port=metrics_port,
+        ),
+        file_settings=FileSettings(
+            paths=certificate_paths,
+            extensions=certificate_extensions,
+            workers=file_workers,
+            index_path=file_index_path,
+            pkcs12_password=pkcs12_password,
+            report_count=report_count,
+        ),
+        retry_settings=RetrySettings(
+            enabled=retry_enabled,
+            failure_threshold=failure_threshold,
+            base_delay=retry_base_delay,
+            max_delay=retry_max_delay,
+            state_path=retry_state_path,
+        ),
+        inventory_settings=InventorySettings(
+            paths=inventory_paths,
+            csv_column=csv_column,
+            chunk_size=chunk_size,
+            interval=inventory_interval,
+        ),
+        api_settings=ApiSettings(
+            enabled=api_enabled,
+            host=api_host,
+            port=api_port,
+            socket_path=socket_path,
+        ),
     )
 
     logger.debug(f"Returning value(s):\n  - {startup_variables}")
@@ -170,7 +638,14 @@ def get_startup_settings() -> StartupSettings:
     return startup_variables
 
 
-def main():
+def main() -> bool:
+    """Reads the settings when they change and runs one certificate check.
+
+    Returns
+    -------
+    bool
+        `summary`: True when continuous monitoring is enabled and the check should run again.
+    """
     # ############################################################################################
     # ######################Gets the programs main root directory/YAML File Path##################
     # ############################################################################################
@@ -200,8 +675,7 @@ def main():
     yaml_file_path = os.path.abspath(f"{main_script_path}/settings.yaml")
 
     try:
-        # Calls function to setup the logging configuration with the YAML file.
-        setup_logger_yaml(yaml_file_path)
+        settings_signature = get_settings_signature(yaml_file_path, settings_cache["signature"])
     except FileNotFoundError:
         exc_args = {
             "main_message": "The settings.yaml file was not found.",
@@ -210,22 +684,68 @@ def main():
         }
         raise CertMonitorError(FCustomException(message_args=exc_args))
 
-    logger = logging.getLogger(__name__)
+    # Checks if the YAML file content changed since the last loop. A touched file with the same content is not reloaded.
+    if settings_cache["signature"] is None or settings_signature[2] != settings_cache["signature"][2]:
+        # Calls function to setup the logging configuration with the YAML file.
+        setup_logger_yaml(yaml_file_path)
 
-    logger.info("#" * 80)
-    logger.info(" " * 34 + "CertMonitor" + " " * 34)
-    logger.info("#" * 80)
+        logger = logging.getLogger(__name__)
 
-    # Calls a function to pull in the startup variables.
-    startup_variables = get_startup_settings()
+        logger.info("#" * 80)
+        logger.info(" " * 34 + "CertMonitor" + " " * 34)
+        logger.info("#" * 80)
 
-    try:
-        # Starts the check.
-        cert_check(startup_settings=startup_variables)
+        # Calls a function to pull in the startup variables.
+        startup_variables = get_startup_settings()
 
-        logger.info(f"{startup_variables.monitor_sleep} seconds until next torrent remove check")
-        # Sleeps for the amount of seconds set in the YAML file.
-        sleep(startup_variables.monitor_sleep)
+        # Applies only the added and removed URLs, so the URLs that did not change keep their next check time.
+        added_urls, removed_urls = host_scheduler.sync(startup_variables.site_urls, time.time())
+        if settings_cache["startup_settings"] is not None:
+            logger.info(
+                f"The settings file changed and was reloaded. {len(added_urls)} URL(s) were added and {len(removed_urls)} URL(s) were removed"
+            )
+            # Stops the kept scan worker processes only when the scan settings changed, so the next sweep starts workers
+            # with the new settings. A reload that only changes the URLs or other sections keeps the warm worker caches.
+            if startup_variables.scan_settings != settings_cache["startup_settings"].scan_settings:
+                shutdown_worker_pools()
+        settings_cache["startup_settings"] = startup_variables
+
+        # Starts, moves, or stops the metrics endpoint when the metrics settings change.
+        metrics_settings = startup_variables.metrics_settings
+        metrics_address = (metrics_settings.host, metrics_settings.port) if metrics_settings.enabled else None
+        if metrics_address != metrics_endpoint["address"]:
+            if metrics_endpoint["server"]:
+                metrics_endpoint["server"].shutdown()
+                metrics_endpoint["server"].server_close()
+                metrics_endpoint["server"] = None
+            if metrics_address:
+                metrics_endpoint["server"] = start_metrics_server(*metrics_address)
+            metrics_endpoint["address"] = metrics_address
+
+        # Starts, moves, or stops the API when the API settings change.
+        api_settings = startup_variables.api_settings
+        api_address = (api_settings.host, api_settings.port, api_settings.socket_path) if api_settings.enabled else None
+        if api_address != api_endpoint["address"]:
+            if api_endpoint["server"]:
+                api_endpoint["server"].shutdown()
+                api_endpoint["server"].server_close()
+                api_endpoint["server"] = None
+            if api_address:
+                api_endpoint["server"] = start_api_server(*api_address, result_snapshot, on_demand_queue)
+            api_endpoint["address"] = api_address
+    else:
+        startup_variables = settings_cache["startup_settings"]
+    # The signature is cached for every loop, so an unchanged file is not hashed again after a touch.
+    settings_cache["signature"] = settings_signature
+
+    try:
+        # Starts the check. The check sleeps until the next URL is due when continuous monitoring is enabled.
+        cert_check(
+            startup_settings=startup_variables,
+            scheduler=host_scheduler,
+            snapshot=result_snapshot,
+            on_demand=on_demand_queue,
+        )
     except Exception as exc:
         # Catches exceptions to email notifications.
         # Checks if program errors get emailed.
@@ -241,6 +761,8 @@ def main():
 
         raise
 
+    return startup_variables.continuous_monitoring
+
 
 # Checks that this is the main program that initiates the classes to start the functions.
 if __name__ == "__main__":
@@ -259,10 +781,11 @@ if __name__ == "__main__":
     try:
         # Loops to keep the main program active.
         # The YAML configuration file will contain a sleep setting within the main function.
-        while True:
-            main()
+        # Single runs stop after the first check without the sleep.
+        while main():
             # 5-second delay sleep to prevent system resource issues if the function fails and the loop runs without any pause.
-            sleep(5)
+            # A queued on-demand check from the API ends the delay, so the request is not held for the delay.
+            on_demand_queue.wake_event.wait(5)
     # Catches ctrl + c
     except KeyboardInterrupt:
         print("\nKeyboard interruption. Exiting...")
@@ -0,0 +1,77 @@
+# Package/Modules
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Exceptions
+from fexception import FCustomException
+
+# Local Package/Modules
+from certmonitor.metrics.registry import metrics
+
+# Local Exceptions
+from certmonitor.exceptions.exceptions import CertMonitorError
+
+__author__ = "IncognitoCoding"
+__copyright__ = "Copyright 2023, exporter"
+__credits__ = ["IncognitoCoding"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "IncognitoCoding"
+__status__ = "Beta"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    """Serves the metrics in the Prometheus text format on /metrics."""
+
+    def do_GET(self) -> None:
+        if self.path.split("?")[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = metrics.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        logging.getLogger(__name__).debug(f"Metrics request from {self.address_string()}: {format % args}")
+
+
+def start_metrics_server(host: str, port: int) -> ThreadingHTTPServer:
+    """Starts the metrics endpoint in a daemon thread.
+
+    Parameters
+    ----------
+    host : str
+        `summary`: The address the endpoint listens on.
+    port : int
+        `summary`: The port the endpoint listens on.
+
+    Returns
+    -------
+    ThreadingHTTPServer
+        `summary`: The running metrics server. Call shutdown() to stop it.
+
+    Raises
+    ------
+    CertMonitorError : fexception
+        `summary`: The metrics endpoint could not be started.
+    """
+    logger = logging.getLogger(__name__)
+
+    try:
+        server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    except OSError as exc:
+        exc_args = {
+            "main_message": f"The metrics endpoint could not be started on {host}:{port}.",
+            "custom_type": CertMonitorError,
+            "returned_result": {exc},
+            "suggested_resolution": "Please verify the 'host' and 'port' values in the 'metrics' section of the YAML file.",
+        }
+        raise CertMonitorError(FCustomException(message_args=exc_args))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="certmonitor-metrics", daemon=True).start()
+    logger.info(f"Serving metrics on http://{host}:{server.server_address[1]}/metrics")
+    return server
@@ -0,0 +1,228 @@
+# Package/Modules
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Union
+
+__author__ = "IncognitoCoding"
+__copyright__ = "Copyright 2023, registry"
+__credits__ = ["IncognitoCoding"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "IncognitoCoding"
+__status__ = "Beta"
+
+# Histogram bucket upper bounds in seconds. Covers fast loopback handshakes up to the longest phase timeouts.
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# The help text for each metric in the Prometheus output.
+METRIC_HELP = {
+    "certmonitor_phase_seconds": "Latency of each check phase in seconds.",
+    "certmonitor_host_checks_total": "Host checks by outcome.",
+    "certmonitor_host_check_seconds": "Latency of each site check in seconds, from the connection to the parsed certificate.",
+    "certmonitor_certificates_total": "Checked certificates by expiration severity.",
+    "certmonitor_certificate_files_total": "Certificate files by whether they were parsed or read from the file index.",
+    "certmonitor_circuit_changes_total": "Site circuit breaker changes by the new state.",
+    "certmonitor_open_circuits": "Site URLs with an open circuit that only get a connection probe.",
+    "certmonitor_chain_cache_total": "Presented chain certificates by whether the parsed certificate was cached.",
+    "certmonitor_chain_verifications_total": "Presented chains verified after handshake-only probes, by whether the chain was trusted.",
+    "certmonitor_alerts_total": "Alerts by delivery result.",
+    "certmonitor_rate_limit_waits_total": "New connections delayed by a politeness limit, by the limit scope.",
+    "certmonitor_rate_limit_wait_seconds": "Seconds new connections waited for the politeness limits.",
+    "certmonitor_sweeps_total": "Completed sweeps.",
+    "certmonitor_sweep_duration_seconds": "Duration of each sweep in seconds.",
+    "certmonitor_last_sweep_duration_seconds": "Duration of the last sweep in seconds.",
+    "certmonitor_last_sweep_timestamp_seconds": "Epoch time the last sweep completed.",
+}
+
+_Key = tuple[str, tuple[tuple[str, str], ...]]
+
+
+def _format_value(value: float) -> str:
+    """Formats a sample value without losing precision on large values such as epoch times."""
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def get_phase_averages(
+    before: dict[tuple[tuple[str, str], ...], tuple[float, int]],
+    after: dict[tuple[tuple[str, str], ...], tuple[float, int]],
+) -> dict[str, float]:
+    """Gets the average latency of each phase recorded between two get_histogram_totals() calls.
+
+    Parameters
+    ----------
+    before : dict[tuple[tuple[str, str], ...], tuple[float, int]]
+        `summary`: The phase histogram totals before the sweep.
+    after : dict[tuple[tuple[str, str], ...], tuple[float, int]]
+        `summary`: The phase histogram totals after the sweep.
+
+    Returns
+    -------
+    dict[str, float]
+        `summary`: The average seconds keyed by phase. Phases without new samples are not included.
+    """
+    averages: dict[str, float] = {}
+    for labels, (total, count) in after.items():
+        previous_total, previous_count = before.get(labels, (0.0, 0))
+        if count > previous_count:
+            averages[dict(labels).get("phase", "")] = (total - previous_total) / (count - previous_count)
+    return averages
+
+
+class Histogram(object):
+    """A cumulative latency histogram with fixed buckets."""
+
+    __slots__ = "buckets", "counts", "total", "count"
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.buckets = buckets
+        # The last count is the +Inf bucket.
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def merge(self, other: "Histogram") -> None:
+        for index, count in enumerate(other.counts):
+            self.counts[index] += count
+        self.total += other.total
+        self.count += other.count
+
+
+class MetricsRegistry(object):
+    """Keeps the counters, gauges, and histograms for the running process.
+
+    The registry is locked, so the metrics endpoint thread can read it while a sweep records into it.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: dict[_Key, float] = {}
+        self._gauges: dict[_Key, float] = {}
+        self._histograms: dict[_Key, Histogram] = {}
+
+    @staticmethod
+    def _key(name: str, labels: dict[str, str]) -> _Key:
+        return name, tuple(sorted(labels.items()))
+
+    def increment(self, name: str, value: float = 1, **labels: str) -> None:
+        """Adds to a counter."""
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, **labels: str) -> None:
+        """Sets a gauge."""
+        with self._lock:
+            self._gauges[self._key(name, labels)] = value
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        """Records a value in a histogram."""
+        key = self._key(name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(value)
+
+    @contextmanager
+    def time(self, name: str, **labels: str) -> Iterator[None]:
+        """Records the duration of the block in a histogram, including blocks that raise."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def get_counter(self, name: str, **labels: str) -> float:
+        """Gets a counter value. Missing counters are 0."""
+        with self._lock:
+            return self._counters.get(self._key(name, labels), 0)
+
+    def get_histogram_totals(self, name: str) -> dict[tuple[tuple[str, str], ...], tuple[float, int]]:
+        """Gets the sum and count of every histogram with the metric name, keyed by labels."""
+        with self._lock:
+            return {
+                labels: (histogram.total, histogram.count)
+                for (metric_name, labels), histogram in self._histograms.items()
+                if metric_name == name
+            }
+
+    def reset(self) -> None:
+        """Clears every metric."""
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+
+    def snapshot(self) -> dict:
+        """Gets a copy of the metrics that can be sent between processes."""
+        with self._lock:
+            return {
+                "counters": dict(self._counters),
+                "gauges": dict(self._gauges),
+                "histograms": {
+                    key: (histogram.buckets, list(histogram.counts), histogram.total, histogram.count)
+                    for key, histogram in self._histograms.items()
+                },
+            }
+
+    def merge(self, snapshot: dict) -> None:
+        """Adds the metrics recorded by a worker process. Counters and histograms are summed, gauges are replaced."""
+        with self._lock:
+            for key, value in snapshot["counters"].items():
+                self._counters[key] = self._counters.get(key, 0) + value
+            self._gauges.update(snapshot["gauges"])
+            for key, (buckets, counts, total, count) in snapshot["histograms"].items():
+                other = Histogram(buckets)
+                other.counts, other.total, other.count = counts, total, count
+                histogram = self._histograms.get(key)
+                if histogram is None:
+                    histogram = self._histograms[key] = Histogram(buckets)
+                histogram.merge(other)
+
+    def render(self) -> str:
+        """Renders every metric in the Prometheus text exposition format."""
+
+        def format_labels(labels: tuple[tuple[str, str], ...], extra: Union[tuple[str, str], None] = None) -> str:
+            pairs = list(labels) + ([extra] if extra else [])
+            if not pairs:
+                return ""
+            escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+            return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+        with self._lock:
+            families: dict[str, tuple[str, list[str]]] = {}
+            for (name, labels), value in sorted(self._counters.items()):
+                families.setdefault(name, ("counter", []))[1].append(
+                    f"{name}{format_labels(labels)} {_format_value(value)}"
+                )
+            for (name, labels), value in sorted(self._gauges.items()):
+                families.setdefault(name, ("gauge", []))[1].append(
+                    f"{name}{format_labels(labels)} {_format_value(value)}"
+                )
+            for (name, labels), histogram in sorted(self._histograms.items(), key=lambda item: item[0]):
+                lines = families.setdefault(name, ("histogram", []))[1]
+                cumulative = 0
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{format_labels(labels, ('le', f'{bound:g}'))} {cumulative}")
+                lines.append(f"{name}_bucket{format_labels(labels, ('le', '+Inf'))} {histogram.count}")
+                lines.append(f"{name}_sum{format_labels(labels)} {_format_value(histogram.total)}")
+                lines.append(f"{name}_count{format_labels(labels)} {histogram.count}")
+
+        output: list[str] = []
+        for name, (metric_type, lines) in families.items():
+            output.append(f"# HELP {name} {METRIC_HELP.get(name, name)}")
+            output.append(f"# TYPE {name} {metric_type}")
+            output.extend(lines)
+        return "\n".join(output) + "\n"
+
+
+# The metrics for this process. Worker processes send a snapshot back with their scan results.
+metrics = MetricsRegistry()
@@ -0,0 +1,235 @@
+# Package/Modules
+from dataclasses import asdict
+from email.message import EmailMessage
+import logging
+import smtplib
+import ssl
+import time
+from typing import Union
+from ictoolkit.directors.email_director import send_email
+
+# Exceptions
+from fexception import FCustomException
+
+# Local Package/Modules
+from certmonitor.metrics.registry import metrics
+from certmonitor.notify.state import AlertState
+
+# Local Dataclasses
+from certmonitor.dataclasses.common import EmailSettings, AlertSettings
+
+# Local Exceptions
+from certmonitor.exceptions.exceptions import CertMonitorError
+
+__author__ = "IncognitoCoding"
+__copyright__ = "Copyright 2023, digest"
+__credits__ = ["IncognitoCoding"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "IncognitoCoding"
+__status__ = "Beta"
+
+# Seconds to wait on the SMTP server before the digest send fails.
+SMTP_TIMEOUT = 60
+
+
+def build_digest_messages(alerts: list[tuple[str, str]], max_entries: int) -> list[tuple[str, str]]:
+    """Builds the digest emails for the collected alerts.
+
+    Alerts are grouped by their subject. Each digest email holds at most max_entries alerts.
+
+    Parameters
+    ----------
+    alerts : list[tuple[str, str]]
+        `summary`: The collected (subject, body) alerts.
+    max_entries : int
+        `summary`: The maximum number of alerts in a single digest email.
+
+    Returns
+    -------
+    list[tuple[str, str]]
+        `summary`: The (subject, body) digest emails.
+    """
+    # Groups the alerts by subject while keeping the order the subjects were first seen.
+    grouped_alerts: dict[str, list[str]] = {}
+    for subject, body in alerts:
+        grouped_alerts.setdefault(subject, []).append(body)
+    ordered_alerts = [(subject, body) for subject, bodies in grouped_alerts.items() for body in bodies]
+
+    batches = [ordered_alerts[index : index + max_entries] for index in range(0, len(ordered_alerts), max_entries)]
+    messages: list[tuple[str, str]] = []
+    for batch_number, batch in enumerate(batches, start=1):
+        subject = f"CertMonitor - {len(alerts)} Certificate Alert(s)"
+        if len(batches) > 1:
+            subject = f"{subject} (Part {batch_number} of {len(batches)})"
+
+        lines: list[str] = []
+        current_subject = None
+        for alert_subject, body in batch:
+            if alert_subject != current_subject:
+                if lines:
+                    lines.append("")
+                lines.append(f"{alert_subject} ({len(grouped_alerts[alert_subject])})")
+                current_subject = alert_subject
+            lines.append(f"  - {body}")
+        messages.append((subject, "\n".join(lines)))
+    return messages
+
+
+def send_digest(email_settings: EmailSettings, messages: list[tuple[str, str]]) -> None:
+    """Sends every digest email over a single SMTP session.
+
+    The SMTP port follows the standard port 25 or TLS port 587 setting. A "host:port" smtp value overrides the port.
+
+    Parameters
+    ----------
+    email_settings : EmailSettings
+        `summary`: The email settings.
+    messages : list[tuple[str, str]]
+        `summary`: The (subject, body) emails.
+
+    Raises
+    ------
+    CertMonitorError : fexception
+        `summary`: A failure occurred while sending the alert digest.
+    """
+    logger = logging.getLogger(__name__)
+
+    if not messages:
+        return
+
+    port = 0 if ":" in email_settings.smtp else (587 if email_settings.use_tls else 25)
+    try:
+        with smtplib.SMTP(email_settings.smtp, port, timeout=SMTP_TIMEOUT) as smtp:
+            if email_settings.use_tls:
+                smtp.starttls(context=ssl.create_default_context())
+            if email_settings.authentication_required:
+                smtp.login(email_settings.username, email_settings.password)
+            for subject, body in messages:
+                message = EmailMessage()
+                message["From"] = email_settings.from_email
+                message["To"] = email_settings.to_email
+                message["Subject"] = subject
+                message.set_content(body)
+                smtp.send_message(message)
+        logger.debug(f"Sent {len(messages)} digest email(s) over one SMTP session")
+    except Exception as exc:
+        exc_args = {
+            "main_message": "A failure occurred while sending the alert digest.",
+            "custom_type": CertMonitorError,
+            "returned_result": {exc},
+            "suggested_resolution": "Please verify the email settings in the YAML file.",
+        }
+        raise CertMonitorError(FCustomException(message_args=exc_args))
+
+
+class AlertDispatcher(object):
+    """Sends the alerts from a sweep.
+
+    Alerts are emailed one at a time, or collected and sent as digest emails over one SMTP session when the
+    digest is enabled. When an alert state is set, alerts that were already sent for the same site URL and severity
+    are skipped until the re-notify interval passes.
+
+    Parameters
+    ----------
+    email_settings : EmailSettings
+        `summary`: The email settings.
+    alert_settings : AlertSettings
+        `summary`: The alert settings.
+    alert_state : Union[AlertState, None], optional
+        `summary`: The alert state used to skip repeated alerts. Every alert is sent when not set. Defaults to None.
+    """
+
+    def __init__(
+        self, email_settings: EmailSettings, alert_settings: AlertSettings, alert_state: Union[AlertState, None] = None
+    ) -> None:
+        self._email_settings = email_settings
+        self._alert_settings = alert_settings
+        self._alert_state = alert_state
+        # Converts the dataclass to a dictionary once for the whole sweep.
+        self._email_settings_asdict: dict = asdict(email_settings)
+        self._alerts: list[tuple[str, str]] = []
+        # The (site URL, severity, time) of the digest alerts. The state is recorded once the digest is sent.
+        self._pending_records: list[tuple[str, str, float]] = []
+        self._resolved_urls: list[str] = []
+        # The alerts sent and skipped by this dispatcher, used for the sweep summary.
+        self.sent = 0
+        self.suppressed = 0
+
+    def add(
+        self, subject: str, body: str, site_url: Union[str, None] = None, severity: Union[str, None] = None
+    ) -> None:
+        """Sends or collects an alert.
+
+        Parameters
+        ----------
+        subject : str
+            `summary`: The alert subject.
+        body : str
+            `summary`: The alert body.
+        site_url : Union[str, None], optional
+            `summary`: The site URL the alert is for. Alerts without a site URL are always sent. Defaults to None.
+        severity : Union[str, None], optional
+            `summary`: The alert severity. The subject is used when not set. Defaults to None.
+        """
+        logger = logging.getLogger(__name__)
+
+        severity = severity or subject
+        now = time.time()
+        if self._alert_state and site_url:
+            if not self._alert_state.should_send(site_url, severity, now):
+                logger.debug(f"Skipping the '{severity}' alert for {site_url} because it was already sent")
+                self.suppressed += 1
+                metrics.increment("certmonitor_alerts_total", result="suppressed")
+                return
+
+        if self._alert_settings.digest:
+            self._alerts.append((subject, body))
+            if site_url:
+                self._pending_records.append((site_url, severity, now))
+        else:
+            with metrics.time("certmonitor_phase_seconds", phase="alert"):
+                send_email(
+                    email_settings=self._email_settings_asdict,
+                    subject=subject,
+                    body=body,
+                )
+            self.sent += 1
+            metrics.increment("certmonitor_alerts_total", result="sent")
+            if self._alert_state and site_url:
+                self._alert_state.record_many([(site_url, severity, now)])
+
+    def resolve(self, site_url: str) -> None:
+        """Clears the alert state for a site URL that is healthy again.
+
+        Parameters
+        ----------
+        site_url : str
+            `summary`: The site URL.
+        """
+        if self._alert_state:
+            self._resolved_urls.append(site_url)
+
+    def flush(self) -> None:
+        """Sends the collected alerts as digest emails and saves the alert state."""
+        logger = logging.getLogger(__name__)
+
+        if self.suppressed:
+            logger.info(f"Skipped {self.suppressed} alert(s) that were already sent")
+        if self._alert_state:
+            self._alert_state.clear_many(self._resolved_urls)
+            self._resolved_urls = []
+
+        if not self._alerts:
+            return
+        alert_count = len(self._alerts)
+        messages = build_digest_messages(self._alerts, self._alert_settings.digest_max_entries)
+        logger.info(f"Sending {alert_count} alert(s) in {len(messages)} digest email(s)")
+        self._alerts = []
+        pending_records, self._pending_records = self._pending_records, []
+        with metrics.time("certmonitor_phase_seconds", phase="alert"):
+            send_digest(self._email_settings, messages)
+        self.sent += alert_count
+        metrics.increment("certmonitor_alerts_total", alert_count, result="sent")
+        if self._alert_state:
+            self._alert_state.record_many(pending_records)
@@ -0,0 +1,154 @@
+# Package/Modules
+import logging
+import os
+import sqlite3
+from typing import Iterable
+
+# Exceptions
+from fexception import FCustomException
+
+# Local Exceptions
+from certmonitor.exceptions.exceptions import CertMonitorError
+
+__author__ = "IncognitoCoding"
+__copyright__ = "Copyright 2023, state"
+__credits__ = ["IncognitoCoding"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "IncognitoCoding"
+__status__ = "Beta"
+
+_CREATE_TABLE = """
+CREATE TABLE IF NOT EXISTS alert_state (
+    site_url TEXT PRIMARY KEY,
+    severity TEXT NOT NULL,
+    sent_at REAL NOT NULL
+)
+"""
+
+
+class AlertState(object):
+    """Remembers the last alert sent for each site URL in a local SQLite database.
+
+    The state survives restarts, so the same alert is not sent again on every loop. An alert is sent again when the
+    severity changes or the re-notify interval has passed.
+
+    Parameters
+    ----------
+    path : str
+        `summary`: The SQLite database path. The parent directory is created if it does not exist.
+    renotify_interval : int
+        `summary`: Seconds before the same alert is sent again. 0 only sends again when the severity changes.
+
+    Raises
+    ------
+    CertMonitorError : fexception
+        `summary`: The alert state could not be opened.
+    """
+
+    def __init__(self, path: str, renotify_interval: int) -> None:
+        logger = logging.getLogger(__name__)
+
+        self._renotify_interval = renotify_interval
+        try:
+            parent_path = os.path.dirname(os.path.abspath(path))
+            if not os.path.exists(parent_path):
+                os.makedirs(parent_path)
+            self._connection = sqlite3.connect(path)
+            self._connection.execute(_CREATE_TABLE)
+            self._connection.commit()
+            # The state is small, so it is loaded once and looked up in memory for the sweep.
+            self._last_alerts: dict[str, tuple[str, float]] = {
+                site_url: (severity, sent_at)
+                for site_url, severity, sent_at in self._connection.execute("SELECT * FROM alert_state")
+            }
+        except Exception as exc:
+            exc_args = {
+                "main_message": f"The alert state could not be opened at '{path}'.",
+                "custom_type": CertMonitorError,
+                "returned_result": {exc},
+                "suggested_resolution": "Please verify the 'state_path' value in the 'alerts' section of the YAML file.",
+            }
+            raise CertMonitorError(FCustomException(message_args=exc_args))
+        logger.debug(f"Opened the alert state at '{path}' with {len(self._last_alerts)} site(s)")
+
+    def __enter__(self) -> "AlertState":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Closes the SQLite connection."""
+        self._connection.close()
+
+    def should_send(self, site_url: str, severity: str, now: float) -> bool:
+        """Checks if an alert needs to be sent.
+
+        Parameters
+        ----------
+        site_url : str
+            `summary`: The site URL the alert is for.
+        severity : str
+            `summary`: The alert severity.
+        now : float
+            `summary`: The current epoch time.
+
+        Returns
+        -------
+        bool
+            `summary`: True when the site has no alert, the severity changed, or the re-notify interval has passed.
+        """
+        last_alert = self._last_alerts.get(site_url)
+        if last_alert is None or last_alert[0] != severity:
+            return True
+        return bool(self._renotify_interval) and now - last_alert[1] >= self._renotify_interval
+
+    def record_many(self, sent_alerts: list[tuple[str, str, float]]) -> None:
+        """Records the sent alerts.
+
+        Parameters
+        ----------
+        sent_alerts : list[tuple[str, str, float]]
+            `summary`: The (site URL, severity, sent epoch time) of each sent alert.
+        """
+        if not sent_alerts:
+            return
+        for site_url, severity, sent_at in sent_alerts:
+            self._last_alerts[site_url] = (severity, sent_at)
+        with self._connection:
+            self._connection.executemany("INSERT OR REPLACE INTO alert_state VALUES (?, ?, ?)", sent_alerts)
+
+    def clear_many(self, site_urls: list[str]) -> None:
+        """Clears the alert state for recovered or removed site URLs, so the next problem is alerted right away.
+
+        Parameters
+        ----------
+        site_urls : list[str]
+            `summary`: The site URLs to clear.
+        """
+        site_urls = [site_url for site_url in site_urls if site_url in self._last_alerts]
+        if not site_urls:
+            return
+        for site_url in site_urls:
+            del self._last_alerts[site_url]
+        with self._connection:
+            self._connection.executemany("DELETE FROM alert_state WHERE site_url = ?", [(url,) for url in site_urls])
+
+    def get_unlisted(self, site_urls: Iterable[str]) -> set[str]:
+        """Gets the site URLs with a sent alert that are not in the listed site URLs.
+
+        The result only holds site URLs with a sent alert, so the caller can drop the site URLs a sweep sees from it
+        and clear the rest without keeping every inventory site URL in memory.
+
+        Parameters
+        ----------
+        site_urls : Iterable[str]
+            `summary`: The site URLs that are still configured.
+
+        Returns
+        -------
+        set[str]
+            `summary`: The site URLs with a sent alert that are not listed.
+        """
+        return set(self._last_alerts).difference(site_urls)
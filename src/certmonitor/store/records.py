@@ -0,0 +1,95 @@
+# Package/Modules
+import datetime
+from typing import Union
+
+# Local Package/Modules
+from certmonitor.check.check import get_outcome
+
+# Local Dataclasses
+from certmonitor.dataclasses.common import ScanResult
+
+__author__ = "IncognitoCoding"
+__copyright__ = "Copyright 2023, records"
+__credits__ = ["IncognitoCoding"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "IncognitoCoding"
+__status__ = "Beta"
+
+# The fields of each result record in the CSV column order.
+RECORD_FIELDS = (
+    "target",
+    "status",
+    "severity",
+    "expiration_days_away",
+    "not_after",
+    "subject",
+    "issuer",
+    "fingerprint",
+    "error",
+    "chain_error",
+)
+
+
+def _format_name(name: Union[str, tuple, None]) -> Union[str, None]:
+    """Formats a getpeercert() subject or issuer as "commonName=example.com, organizationName=Example"."""
+    if name is None or isinstance(name, str):
+        return name
+    return ", ".join(f"{attribute}={value}" for relative_name in name for attribute, value in relative_name)
+
+
+def summarize_error(error: Union[str, None]) -> Union[str, None]:
+    """Condenses a formatted exception into one line with the main message and the returned result.
+
+    Parameters
+    ----------
+    error : Union[str, None]
+        `summary`: The formatted exception message.
+
+    Returns
+    -------
+    Union[str, None]
+        `summary`: The one line message. Empty messages are returned unchanged.
+    """
+    if not error:
+        return error
+    lines = error.splitlines()
+    summary = [lines[0].strip()]
+    if "Returned Result:" in lines:
+        for line in lines[lines.index("Returned Result:") + 1 :]:
+            if not line.startswith("  - "):
+                break
+            summary.append(line[4:])
+    return " ".join(summary)
+
+
+def build_record(scan_result: ScanResult) -> dict:
+    """Builds the output record of one scan result.
+
+    Parameters
+    ----------
+    scan_result : ScanResult
+        `summary`: The scan result.
+
+    Returns
+    -------
+    dict
+        `summary`: The record with the RECORD_FIELDS keys. Missing values are None.
+    """
+    expiration_msg = scan_result.expiration_msg
+    ssl_return = scan_result.ssl_return
+    not_after: Union[str, None] = None
+    if scan_result.not_after_epoch is not None:
+        not_after = datetime.datetime.fromtimestamp(scan_result.not_after_epoch, datetime.timezone.utc).isoformat()
+    return {
+        "target": scan_result.site_url,
+        "status": get_outcome(scan_result),
+        "severity": expiration_msg.severity.value if expiration_msg else None,
+        "expiration_days_away": expiration_msg.expiration_days_away if expiration_msg else None,
+        "not_after": not_after,
+        "subject": _format_name(ssl_return.subject) if ssl_return else None,  # type: ignore
+        "issuer": _format_name(ssl_return.issuer) if ssl_return else None,  # type: ignore
+        "fingerprint": scan_result.fingerprint,
+        "error": summarize_error(scan_result.error),
+        "chain_error": scan_result.chain_error,
+    }
@@ -0,0 +1,295 @@
+# Package/Modules
+import json
+import logging
+import os
+import sqlite3
+from typing import Any, Union
+
+# Exceptions
+from fexception import FCustomException
+
+# Local Package/Modules
+from certmonitor.check.certificate import evaluate_expiration_epochs
+from certmonitor.check.targets import parse_target
+
+# Local Dataclasses
+from certmonitor.dataclasses.common import SSLReturn, ScanResult, StoredResult
+
+# Local Exceptions
+from certmonitor.exceptions.exceptions import CertMonitorError
+
+__author__ = "IncognitoCoding"
+__copyright__ = "Copyright 2023, results"
+__credits__ = ["IncognitoCoding"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "IncognitoCoding"
+__status__ = "Beta"
+
+# SQLite limits the number of bound parameters, so bulk lookups are split.
+_LOOKUP_CHUNK_SIZE = 500
+
+_CREATE_TABLE = """
+CREATE TABLE IF NOT EXISTS certificates (
+    site_url TEXT PRIMARY KEY,
+    subject TEXT,
+    issuer TEXT,
+    version TEXT,
+    not_before TEXT,
+    not_after TEXT,
+    subject_alt_name TEXT,
+    ocsp TEXT,
+    ca_issuers TEXT,
+    crl_distribution_points TEXT,
+    fingerprint TEXT,
+    not_after_epoch REAL NOT NULL,
+    checked_at REAL NOT NULL
+)
+"""
+
+_SSL_RETURN_FIELDS = (
+    "subject",
+    "issuer",
+    "version",
+    "notBefore",
+    "notAfter",
+    "subjectAltName",
+    "ocsp",
+    "caIssuers",
+    "crlDistributionPoints",
+)
+
+
+def _to_tuples(value: Any) -> Any:
+    """Converts the JSON lists back into the nested tuples returned by getpeercert()."""
+    if isinstance(value, list):
+        return tuple(_to_tuples(item) for item in value)
+    return value
+
+
+class ResultStore(object):
+    """Keeps the last check result of each site URL in a local SQLite database.
+
+    The store survives restarts, so one-shot runs and restarted programs can skip sites that were checked recently
+    and detect certificate changes by comparing fingerprints.
+
+    Parameters
+    ----------
+    path : str
+        `summary`: The SQLite database path. The parent directory is created if it does not exist.
+
+    Raises
+    ------
+    CertMonitorError : fexception
+        `summary`: The result store could not be opened.
+    """
+
+    def __init__(self, path: str) -> None:
+        logger = logging.getLogger(__name__)
+
+        try:
+            parent_path = os.path.dirname(os.path.abspath(path))
+            if not os.path.exists(parent_path):
+                os.makedirs(parent_path)
+            self._connection = sqlite3.connect(path)
+            self._connection.execute(_CREATE_TABLE)
+            self._connection.commit()
+        except Exception as exc:
+            exc_args = {
+                "main_message": f"The result store could not be opened at '{path}'.",
+                "custom_type": CertMonitorError,
+                "returned_result": {exc},
+                "suggested_resolution": "Please verify the 'path' value in the 'store' section of the YAML file.",
+            }
+            raise CertMonitorError(FCustomException(message_args=exc_args))
+        logger.debug(f"Opened the result store at '{path}'")
+
+    def __enter__(self) -> "ResultStore":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Closes the SQLite connection."""
+        self._connection.close()
+
+    def get_many(self, site_urls: list[str]) -> dict[str, StoredResult]:
+        """Gets the stored results for the site URLs.
+
+        Parameters
+        ----------
+        site_urls : list[str]
+            `summary`: The site URLs to look up.
+
+        Returns
+        -------
+        dict[str, StoredResult]
+            `summary`: The stored results keyed by site URL. Site URLs without a stored result are not included.
+        """
+        stored_results: dict[str, StoredResult] = {}
+        for index in range(0, len(site_urls), _LOOKUP_CHUNK_SIZE):
+            chunk = site_urls[index : index + _LOOKUP_CHUNK_SIZE]
+            rows = self._connection.execute(
+                f"SELECT * FROM certificates WHERE site_url IN ({','.join('?' * len(chunk))})", chunk
+            )
+            for row in rows:
+                site_url, *ssl_values, fingerprint, not_after_epoch, checked_at = row
+                ssl_return = SSLReturn(
+                    **{
+                        field: _to_tuples(json.loads(value)) if value is not None else None
+                        for field, value in zip(_SSL_RETURN_FIELDS, ssl_values)
+                    }
+                )
+                stored_results[site_url] = StoredResult(
+                    site_url=site_url,
+                    ssl_return=ssl_return,
+                    fingerprint=fingerprint,
+                    not_after_epoch=not_after_epoch,
+                    checked_at=checked_at,
+                )
+        return stored_results
+
+    def save_many(self, scan_results: list[ScanResult], checked_at: float) -> None:
+        """Saves the certificate results from a sweep. Failed and cached results are not saved.
+
+        Results with a chain that failed verification in probe mode are not saved either, so they are probed again
+        each sweep instead of being reused as trusted.
+
+        Parameters
+        ----------
+        scan_results : list[ScanResult]
+            `summary`: The scan results from the sweep.
+        checked_at : float
+            `summary`: The epoch time of the sweep.
+        """
+        rows = []
+        for scan_result in scan_results:
+            ssl_return = scan_result.ssl_return
+            if scan_result.cached or not ssl_return or scan_result.not_after_epoch is None or scan_result.chain_error:
+                continue
+            rows.append(
+                (
+                    scan_result.site_url,
+                    *(
+                        json.dumps(getattr(ssl_return, field)) if getattr(ssl_return, field) is not None else None
+                        for field in _SSL_RETURN_FIELDS
+                    ),
+                    scan_result.fingerprint,
+                    # The earliest expiration across the presented chain, so a stored result is not reused past an expiring intermediate.
+                    scan_result.not_after_epoch,
+                    checked_at,
+                )
+            )
+        with self._connection:
+            self._connection.executemany(
+                f"INSERT OR REPLACE INTO certificates VALUES ({','.join('?' * 13)})",
+                rows,
+            )
+
+
+def get_reusable_results(
+    stored_results: dict[str, StoredResult],
+    now: float,
+    buffer_days: int,
+    recheck_after: int,
+    skip_margin_days: int,
+) -> dict[str, StoredResult]:
+    """Gets the stored results that are recent and far enough from expiration to skip the network check.
+
+    Parameters
+    ----------
+    stored_results : dict[str, StoredResult]
+        `summary`: The stored results keyed by site URL.
+    now : float
+        `summary`: The current epoch time.
+    buffer_days : int
+        `summary`: Days to buffer certificate expiring before notifying.
+    recheck_after : int
+        `summary`: Seconds before a stored result is checked again.
+    skip_margin_days : int
+        `summary`: Days past the buffer days a stored certificate must have left before the check is skipped.
+
+    Returns
+    -------
+    dict[str, StoredResult]
+        `summary`: The reusable stored results keyed by site URL.
+    """
+    min_not_after = now + (buffer_days + skip_margin_days) * 86400
+    return {
+        site_url: stored_result
+        for site_url, stored_result in stored_results.items()
+        if now - stored_result.checked_at < recheck_after and stored_result.not_after_epoch > min_not_after
+    }
+
+
+def build_cached_results(stored_results: list[StoredResult], buffer_days: int, time_zone: str) -> list[ScanResult]:
+    """Evaluates the stored results in one batch without connecting to the sites.
+
+    The stored expiration epoch seconds are used directly, so the certificate dates are not parsed again.
+
+    Parameters
+    ----------
+    stored_results : list[StoredResult]
+        `summary`: The stored results to evaluate.
+    buffer_days : int
+        `summary`: Days to buffer certificate expiring before notifying.
+    time_zone : str
+        `summary`: Time zone the program is running.
+
+    Returns
+    -------
+    list[ScanResult]
+        `summary`: The scan results evaluated from the stored certificates.
+    """
+    expiration_msgs = evaluate_expiration_epochs(
+        site_urls=[parse_target(stored_result.site_url).name for stored_result in stored_results],
+        not_after_epochs=[stored_result.not_after_epoch for stored_result in stored_results],
+        buffer_days=buffer_days,
+        time_zone=time_zone,
+    )
+    return [
+        ScanResult(
+            site_url=stored_result.site_url,
+            expiration_msg=expiration_msg,
+            error=None,
+            checked=True,
+            resolved=True,
+            reachable=True,
+            ssl_return=stored_result.ssl_return,
+            fingerprint=stored_result.fingerprint,
+            not_after_epoch=stored_result.not_after_epoch,
+            cached=True,
+            source="url",
+            chain_error=None,
+        )
+        for stored_result, expiration_msg in zip(stored_results, expiration_msgs)
+    ]
+
+
+def get_changed_certificate(
+    stored_result: Union[StoredResult, None], scan_result: ScanResult
+) -> Union[tuple[str, str], None]:
+    """Compares the stored fingerprint with the fingerprint from the sweep.
+
+    Parameters
+    ----------
+    stored_result : Union[StoredResult, None]
+        `summary`: The stored result for the site URL.
+    scan_result : ScanResult
+        `summary`: The scan result for the site URL.
+
+    Returns
+    -------
+    Union[tuple[str, str], None]
+        `summary`: The old and new fingerprints when the certificate changed. None is returned when it did not change.
+    """
+    if (
+        stored_result
+        and stored_result.fingerprint
+        and scan_result.fingerprint
+        and not scan_result.cached
+        and stored_result.fingerprint != scan_result.fingerprint
+    ):
+        return stored_result.fingerprint, scan_result.fingerprint
+    return None
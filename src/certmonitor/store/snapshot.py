@@ -0,0 +1,370 @@
+# Package/Modules
+import logging
+import math
+import sys
+import threading
+from array import array
+from typing import Any, Iterable, Iterator, Union
+
+# Local Dataclasses
+from certmonitor.dataclasses.common import ExpirationMsg, SSLReturn, ScanResult, Severity
+
+__author__ = "IncognitoCoding"
+__copyright__ = "Copyright 2023, snapshot"
+__credits__ = ["IncognitoCoding"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "IncognitoCoding"
+__status__ = "Beta"
+
+# The SSLReturn fields kept as interned value IDs.
+_SSL_RETURN_FIELDS: tuple[str, ...] = SSLReturn.__slots__  # type: ignore
+
+# The severity codes saved in the severity column. -1 is saved for results without an expiration message.
+_SEVERITIES = tuple(Severity)
+_SEVERITY_CODES = {severity: code for code, severity in enumerate(_SEVERITIES)}
+
+# The flag bits saved for each row.
+_CHECKED = 1
+_RESOLVED = 2
+_CACHED = 4
+_HAS_FINGERPRINT = 8
+_HAS_SSL_RETURN = 16
+_REACHABLE = 32
+
+# The SHA-256 fingerprint length in bytes.
+_FINGERPRINT_SIZE = 32
+_EMPTY_FINGERPRINT = bytes(_FINGERPRINT_SIZE)
+
+
+def _intern_value(value: Any) -> Any:
+    """Interns the strings inside a getpeercert() value, so the attribute names and CA URLs are held once."""
+    if isinstance(value, str):
+        return sys.intern(value)
+    if isinstance(value, tuple):
+        return tuple(_intern_value(item) for item in value)
+    return value
+
+
+class ResultSnapshot(object):
+    """Keeps the latest scan result of every site URL and certificate file in compact columns.
+
+    Each result is one row. The SSLReturn fields and the result source are saved as IDs into one pool of interned
+    values, so the issuer, CA URL, and CRL tuples that most certificates share are held once. The expiration
+    timestamps, days, severities, and flags are saved in typed arrays, and the fingerprints in one byte array. Error
+    messages, chain verification failures, and chain certificate labels are only kept for the rows that have them.
+    Values no longer used by any row are dropped from the pool when the columns are compacted.
+
+    Rows are read back as ScanResult and SSLReturn objects that are built when requested. The snapshot can be read
+    from other threads while a sweep updates it.
+    """
+
+    def __init__(self) -> None:
+        # The API server reads the snapshot while the sweep updates it.
+        self._lock = threading.RLock()
+        self._rows: dict[str, int] = {}
+        # Removed rows hold None until the columns are compacted.
+        self._site_urls: list[Union[str, None]] = []
+        self._values: list[Any] = [None]
+        self._value_ids: dict[Any, int] = {}
+        # Replaced rows leave their old values in the pool, so the pool is compacted when it reaches this size.
+        self._compact_size = 1024
+        self._ssl_columns: dict[str, array] = {field: array("I") for field in _SSL_RETURN_FIELDS}
+        self._sources = array("I")
+        self._not_after_epochs = array("d")
+        self._expiration_days = array("q")
+        self._severities = array("b")
+        self._flags = array("B")
+        self._generations = array("I")
+        self._fingerprints = bytearray()
+        self._errors: dict[int, str] = {}
+        self._chain_errors: dict[int, str] = {}
+        self._expiration_labels: dict[int, str] = {}
+        self._generation = 0
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, site_url: str) -> bool:
+        return site_url in self._rows
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            return iter(list(self._rows))
+
+    @property
+    def interned_count(self) -> int:
+        """The number of unique values held in the value pool."""
+        return len(self._values) - 1
+
+    def _intern(self, value: Any) -> int:
+        """Gets the pool ID of a value and adds the value when it is new. 0 is returned for None."""
+        if value is None:
+            return 0
+        value_id = self._value_ids.get(value)
+        if value_id is None:
+            value_id = len(self._values)
+            value = _intern_value(value)
+            self._values.append(value)
+            self._value_ids[value] = value_id
+        return value_id
+
+    def start_sweep(self) -> None:
+        """Starts a new sweep. Certificate file and inventory rows not added again are removed by remove_stale()."""
+        with self._lock:
+            self._generation += 1
+
+    def add(self, scan_result: ScanResult) -> None:
+        """Adds a scan result or replaces the earlier result of the same site URL.
+
+        The values of a replaced result stay in the pool, so the columns are compacted once the pool doubles in size.
+
+        Parameters
+        ----------
+        scan_result : ScanResult
+            `summary`: The scan result.
+        """
+        with self._lock:
+            expiration_msg = scan_result.expiration_msg
+            ssl_return = scan_result.ssl_return
+            flags = (
+                (_CHECKED if scan_result.checked else 0)
+                | (_RESOLVED if scan_result.resolved else 0)
+                | (_REACHABLE if scan_result.reachable else 0)
+                | (_CACHED if scan_result.cached else 0)
+                | (_HAS_FINGERPRINT if scan_result.fingerprint else 0)
+                | (_HAS_SSL_RETURN if ssl_return is not None else 0)
+            )
+            fingerprint = bytes.fromhex(scan_result.fingerprint) if scan_result.fingerprint else _EMPTY_FINGERPRINT
+            not_after_epoch = math.nan if scan_result.not_after_epoch is None else scan_result.not_after_epoch
+            severity = _SEVERITY_CODES[expiration_msg.severity] if expiration_msg else -1
+            expiration_days = expiration_msg.expiration_days_away if expiration_msg else 0
+
+            row = self._rows.get(scan_result.site_url)
+            if row is None:
+                row = self._rows[scan_result.site_url] = len(self._site_urls)
+                self._site_urls.append(scan_result.site_url)
+                for field, column in self._ssl_columns.items():
+                    column.append(self._intern(getattr(ssl_return, field)) if ssl_return else 0)
+                self._sources.append(self._intern(scan_result.source))
+                self._not_after_epochs.append(not_after_epoch)
+                self._expiration_days.append(expiration_days)
+                self._severities.append(severity)
+                self._flags.append(flags)
+                self._generations.append(self._generation)
+                self._fingerprints += fingerprint
+            else:
+                for field, column in self._ssl_columns.items():
+                    column[row] = self._intern(getattr(ssl_return, field)) if ssl_return else 0
+                self._sources[row] = self._intern(scan_result.source)
+                self._not_after_epochs[row] = not_after_epoch
+                self._expiration_days[row] = expiration_days
+                self._severities[row] = severity
+                self._flags[row] = flags
+                self._generations[row] = self._generation
+                self._fingerprints[row * _FINGERPRINT_SIZE : (row + 1) * _FINGERPRINT_SIZE] = fingerprint
+
+            if scan_result.error:
+                self._errors[row] = scan_result.error
+            else:
+                self._errors.pop(row, None)
+            if scan_result.chain_error:
+                self._chain_errors[row] = scan_result.chain_error
+            else:
+                self._chain_errors.pop(row, None)
+            if expiration_msg and expiration_msg.site_url != scan_result.site_url:
+                self._expiration_labels[row] = expiration_msg.site_url
+            else:
+                self._expiration_labels.pop(row, None)
+            if len(self._values) > self._compact_size:
+                self._compact()
+
+    def add_many(self, scan_results: Iterable[ScanResult]) -> None:
+        """Adds many scan results.
+
+        Parameters
+        ----------
+        scan_results : Iterable[ScanResult]
+            `summary`: The scan results.
+        """
+        for scan_result in scan_results:
+            self.add(scan_result)
+
+    def remove_many(self, site_urls: Iterable[str]) -> None:
+        """Removes the results of site URLs. The columns are compacted once half of the rows are removed.
+
+        Parameters
+        ----------
+        site_urls : Iterable[str]
+            `summary`: The site URLs to remove. Site URLs without a result are ignored.
+        """
+        with self._lock:
+            for site_url in site_urls:
+                row = self._rows.pop(site_url, None)
+                if row is not None:
+                    self._site_urls[row] = None
+                    self._errors.pop(row, None)
+                    self._chain_errors.pop(row, None)
+                    self._expiration_labels.pop(row, None)
+            if len(self._site_urls) > 2 * len(self._rows):
+                self._compact()
+
+    def remove_stale(self, site_urls: list[str], inventory_swept: bool = True) -> None:
+        """Removes site URLs that are no longer configured and the certificate file and inventory rows that were
+        not added in the current sweep.
+
+        Parameters
+        ----------
+        site_urls : list[str]
+            `summary`: The configured site URLs.
+        inventory_swept : bool, optional
+            `summary`: False keeps the inventory rows when the sweep did not read the inventory files. Defaults to True.
+        """
+        with self._lock:
+            configured = set(site_urls)
+            url_source = self._value_ids.get("url")
+            inventory_source = None if inventory_swept else self._value_ids.get("inventory")
+            self.remove_many(
+                [
+                    site_url
+                    for site_url, row in self._rows.items()
+                    if (
+                        site_url not in configured
+                        if self._sources[row] == url_source
+                        else self._sources[row] != inventory_source and self._generations[row] != self._generation
+                    )
+                ]
+            )
+
+    def _compact(self) -> None:
+        """Drops the removed rows and the pool values no longer used by any row."""
+        logger = logging.getLogger(__name__)
+
+        live_rows = [row for row, site_url in enumerate(self._site_urls) if site_url is not None]
+        values = self._values
+        self._values = [None]
+        self._value_ids = {}
+        for field, column in self._ssl_columns.items():
+            self._ssl_columns[field] = array("I", (self._intern(values[column[row]]) for row in live_rows))
+        self._sources = array("I", (self._intern(values[self._sources[row]]) for row in live_rows))
+        self._not_after_epochs = array("d", (self._not_after_epochs[row] for row in live_rows))
+        self._expiration_days = array("q", (self._expiration_days[row] for row in live_rows))
+        self._severities = array("b", (self._severities[row] for row in live_rows))
+        self._flags = array("B", (self._flags[row] for row in live_rows))
+        self._generations = array("I", (self._generations[row] for row in live_rows))
+        self._fingerprints = bytearray().join(
+            self._fingerprints[row * _FINGERPRINT_SIZE : (row + 1) * _FINGERPRINT_SIZE] for row in live_rows
+        )
+        new_rows = {old_row: new_row for new_row, old_row in enumerate(live_rows)}
+        self._errors = {new_rows[row]: error for row, error in self._errors.items()}
+        self._chain_errors = {new_rows[row]: chain_error for row, chain_error in self._chain_errors.items()}
+        self._expiration_labels = {new_rows[row]: label for row, label in self._expiration_labels.items()}
+        self._site_urls = [self._site_urls[row] for row in live_rows]
+        self._rows = {site_url: row for row, site_url in enumerate(self._site_urls)}  # type: ignore
+        self._compact_size = max(2 * len(self._values), 1024)
+        logger.debug(f"Compacted the result snapshot to {len(self._rows)} row(s) and {self.interned_count} value(s)")
+
+    def get_ssl_return(self, site_url: str) -> Union[SSLReturn, None]:
+        """Gets the SSL certificate return information of a site URL.
+
+        Parameters
+        ----------
+        site_url : str
+            `summary`: The site URL or certificate file path.
+
+        Returns
+        -------
+        Union[SSLReturn, None]
+            `summary`: The SSL certificate return information. None is returned when the site URL has no result or the check failed.
+        """
+        with self._lock:
+            row = self._rows.get(site_url)
+            if row is None or not self._flags[row] & _HAS_SSL_RETURN:
+                return None
+            return SSLReturn(**{field: self._values[column[row]] for field, column in self._ssl_columns.items()})
+
+    def get(self, site_url: str) -> Union[ScanResult, None]:
+        """Gets the latest scan result of a site URL.
+
+        Parameters
+        ----------
+        site_url : str
+            `summary`: The site URL or certificate file path.
+
+        Returns
+        -------
+        Union[ScanResult, None]
+            `summary`: The scan result. None is returned when the site URL has no result.
+        """
+        with self._lock:
+            row = self._rows.get(site_url)
+            if row is None:
+                return None
+            flags = self._flags[row]
+            severity = self._severities[row]
+            not_after_epoch = self._not_after_epochs[row]
+            return ScanResult(
+                site_url=site_url,
+                expiration_msg=(
+                    ExpirationMsg(
+                        site_url=self._expiration_labels.get(row, site_url),
+                        severity=_SEVERITIES[severity],
+                        expiration_days_away=self._expiration_days[row],
+                    )
+                    if severity >= 0
+                    else None
+                ),
+                error=self._errors.get(row),
+                checked=bool(flags & _CHECKED),
+                resolved=bool(flags & _RESOLVED),
+                reachable=bool(flags & _REACHABLE),
+                ssl_return=self.get_ssl_return(site_url),
+                fingerprint=(
+                    self._fingerprints[row * _FINGERPRINT_SIZE : (row + 1) * _FINGERPRINT_SIZE].hex()
+                    if flags & _HAS_FINGERPRINT
+                    else None
+                ),
+                not_after_epoch=None if math.isnan(not_after_epoch) else not_after_epoch,
+                cached=bool(flags & _CACHED),
+                source=self._values[self._sources[row]],
+                chain_error=self._chain_errors.get(row),
+            )
+
+    def count_by_severity(self) -> dict[str, int]:
+        """Counts the results by certificate severity.
+
+        Returns
+        -------
+        dict[str, int]
+            `summary`: The result count for each severity value. Results without a certificate are counted as "none".
+        """
+        with self._lock:
+            counts = [0] * (len(_SEVERITIES) + 1)
+            for row in self._rows.values():
+                counts[self._severities[row]] += 1
+            severity_counts = {severity.value: counts[code] for code, severity in enumerate(_SEVERITIES)}
+            severity_counts["none"] = counts[-1]
+            return severity_counts
+
+    def get_expiring(self, before_epoch: float) -> list[str]:
+        """Gets the site URLs whose certificate expires before a time.
+
+        Parameters
+        ----------
+        before_epoch : float
+            `summary`: The epoch time.
+
+        Returns
+        -------
+        list[str]
+            `summary`: The site URLs in expiration order. Results without a certificate are not included.
+        """
+        with self._lock:
+            not_after_epochs = self._not_after_epochs
+            # NaN never compares lower, so rows without a certificate are skipped.
+            expiring = [
+                (not_after_epochs[row], site_url)
+                for site_url, row in self._rows.items()
+                if not_after_epochs[row] < before_epoch
+            ]
+            return [site_url for _, site_url in sorted(expiring)]
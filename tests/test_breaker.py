@@ -0,0 +1,115 @@
+# Package/Modules
+import sqlite3
+import pytest
+
+# Local Package/Modules
+from certmonitor.check.breaker import CircuitBreaker
+
+# Local Dataclasses
+from certmonitor.dataclasses.common import RetrySettings
+
+# Local Exceptions
+from certmonitor.exceptions.exceptions import CertMonitorError
+
+__author__ = "IncognitoCoding"
+__copyright__ = "Copyright 2023, test_breaker"
+__credits__ = ["IncognitoCoding"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "IncognitoCoding"
+__status__ = "Beta"
+
+
+def _get_retry_settings(state_path: str) -> RetrySettings:
+    """Builds retry settings that open the circuit after three failures."""
+    return RetrySettings(enabled=True, failure_threshold=3, base_delay=60, max_delay=600, state_path=state_path)
+
+
+def test_backoff_and_open(tmp_path) -> None:
+    """Tests that each failure doubles the delay up to the max delay and the threshold opens the circuit once."""
+    with CircuitBreaker(_get_retry_settings(str(tmp_path / "state.db"))) as breaker:
+        assert breaker.record_failure("https://a", "refused", now=0) == (False, 60)
+        assert breaker.record_failure("https://a", "refused", now=100) == (False, 220)
+        assert breaker.record_failure("https://a", "refused", now=200) == (True, 440)
+        assert breaker.record_failure("https://a", "refused", now=300) == (False, 780)
+        assert breaker.record_failure("https://a", "refused", now=400) == (False, 1000)
+        assert breaker.get_failures("https://a") == 5
+        assert breaker.get_failures("https://b") == 0
+        assert breaker.open_count == 1
+
+
+def test_split_due(tmp_path) -> None:
+    """Tests that waiting sites are held back and open sites are probed once their retry time passes."""
+    with CircuitBreaker(_get_retry_settings(str(tmp_path / "state.db"))) as breaker:
+        breaker.record_failure("https://failing", "timeout", now=0)
+        for _ in range(3):
+            breaker.record_failure("https://open", "timeout", now=0)
+        site_urls = ["https://healthy", "https://failing", "https://open"]
+
+        check_urls, probe_urls, waiting = breaker.split_due(site_urls, now=10)
+        assert check_urls == ["https://healthy"]
+        assert probe_urls == []
+        assert waiting == {"https://failing": 60, "https://open": 240}
+
+        check_urls, probe_urls, waiting = breaker.split_due(site_urls, now=1000)
+        assert check_urls == ["https://healthy", "https://failing"]
+        assert probe_urls == ["https://open"]
+        assert waiting == {}
+
+
+def test_record_success(tmp_path) -> None:
+    """Tests that a success clears the failures and only reports the recovery of an open circuit."""
+    with CircuitBreaker(_get_retry_settings(str(tmp_path / "state.db"))) as breaker:
+        assert breaker.record_success("https://healthy") is None
+        breaker.record_failure("https://failing", "timeout", now=0)
+        assert breaker.record_success("https://failing") is None
+        for now in range(4):
+            breaker.record_failure("https://open", "timeout", now=now)
+        assert breaker.record_success("https://open") == (4, 2)
+        assert breaker.get_failures("https://open") == 0
+        assert breaker.open_count == 0
+
+
+def test_state_survives_restart(tmp_path) -> None:
+    """Tests that failures are written on close and recoveries are deleted."""
+    retry_settings = _get_retry_settings(str(tmp_path / "nested" / "state.db"))
+    with CircuitBreaker(retry_settings) as breaker:
+        for _ in range(3):
+            breaker.record_failure("https://open", "refused", now=0)
+        breaker.record_failure("https://recovered", "refused", now=0)
+
+    with CircuitBreaker(retry_settings) as breaker:
+        assert breaker.get_failures("https://open") == 3
+        assert breaker.open_count == 1
+        breaker.record_success("https://recovered")
+
+    with CircuitBreaker(retry_settings) as breaker:
+        assert breaker.get_failures("https://open") == 3
+        assert breaker.get_failures("https://recovered") == 0
+
+
+def test_prune_deletes_saved_rows(tmp_path) -> None:
+    """Tests that a pruned site URL's saved row is deleted on close and not loaded again."""
+    retry_settings = _get_retry_settings(str(tmp_path / "state.db"))
+    with CircuitBreaker(retry_settings) as breaker:
+        breaker.record_failure("https://kept", "refused", now=0)
+        breaker.record_failure("https://pruned", "refused", now=0)
+
+    with CircuitBreaker(retry_settings) as breaker:
+        assert breaker.get_failures("https://pruned") == 1
+        breaker.prune(["https://kept"])
+
+    connection = sqlite3.connect(retry_settings.state_path)
+    try:
+        assert connection.execute("SELECT site_url FROM host_failures").fetchall() == [("https://kept",)]
+    finally:
+        connection.close()
+    with CircuitBreaker(retry_settings) as breaker:
+        assert breaker.get_failures("https://kept") == 1
+        assert breaker.get_failures("https://pruned") == 0
+
+
+def test_invalid_state_path(tmp_path) -> None:
+    """Tests that a state path that cannot be opened raises CertMonitorError."""
+    with pytest.raises(CertMonitorError):
+        CircuitBreaker(_get_retry_settings(str(tmp_path)))
@@ -0,0 +1,98 @@
+# Package/Modules
+import pytest
+
+# Local Package/Modules
+from certmonitor.check.certificate import SECONDS_IN_DAY, evaluate_expiration_epochs, evaluate_expirations
+
+# Local Dataclasses
+from certmonitor.dataclasses.common import ExpirationMsg, Severity, SSLReturn
+
+__author__ = "IncognitoCoding"
+__copyright__ = "Copyright 2023, test_certificate"
+__credits__ = ["IncognitoCoding"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "IncognitoCoding"
+__status__ = "Beta"
+
+# A fixed current time, 2024-01-01 00:00:00 UTC.
+NOW = 1704067200
+
+
+@pytest.mark.parametrize(
+    "not_after_epoch, expected_days, expected_severity",
+    [
+        (NOW + 90 * SECONDS_IN_DAY, 90, Severity.INFO),
+        (NOW + 31 * SECONDS_IN_DAY - 1, 30, Severity.WARNING),
+        (NOW + 30 * SECONDS_IN_DAY, 30, Severity.WARNING),
+        (NOW + 3600, 0, Severity.WARNING),
+        (NOW, 0, Severity.WARNING),
+        (NOW - 1, -1, Severity.EXPIRED),
+        (NOW - 10 * SECONDS_IN_DAY, -10, Severity.EXPIRED),
+    ],
+)
+def test_evaluate_expiration_epochs(not_after_epoch: float, expected_days: int, expected_severity: Severity) -> None:
+    """Tests the expiration days and severity around the buffer days and the expiration time."""
+    (expiration_msg,) = evaluate_expiration_epochs(
+        site_urls=["https://example.com"], not_after_epochs=[not_after_epoch], buffer_days=30, time_zone="UTC", now=NOW
+    )
+    assert expiration_msg.site_url == "https://example.com"
+    assert expiration_msg.expiration_days_away == expected_days
+    assert expiration_msg.severity is expected_severity
+
+
+def test_evaluate_expiration_epochs_messages() -> None:
+    """Tests the rendered messages, which keep the status prefixes the notifications match on."""
+    expiration_msgs = evaluate_expiration_epochs(
+        site_urls=["https://a", "https://b", "https://c", "https://d"],
+        not_after_epochs=[NOW + 90 * SECONDS_IN_DAY, NOW + 5 * SECONDS_IN_DAY, NOW + 60, NOW - 2 * SECONDS_IN_DAY],
+        buffer_days=30,
+        time_zone="cst",
+        now=NOW,
+    )
+    assert [expiration_msg.status_message for expiration_msg in expiration_msgs] == [
+        "Info: Certificate for https://a is good. The certificate does not expire for 90 days.",
+        "Warning: Certificate for https://b is expring soon. The certificate will expire in 5 days.",
+        "Warning: Certificate for https://c is expring soon. The certificate will expire tomorrow.",
+        "Error: Certificate for https://d has expired! The certificate has been expired for 2 days.",
+    ]
+    assert (
+        expiration_msgs[1].message
+        == "Certificate for https://b is expring soon. The certificate will expire in 5 days."
+    )
+
+
+def test_evaluate_expiration_epochs_invalid_time_zone() -> None:
+    """Tests that an unsupported time zone raises ValueError."""
+    with pytest.raises(ValueError):
+        evaluate_expiration_epochs(["https://example.com"], [NOW], buffer_days=30, time_zone="GMT", now=NOW)
+
+
+def test_evaluate_expirations() -> None:
+    """Tests that the notAfter dates match the epoch results and a missing date raises ValueError."""
+    ssl_return = SSLReturn(
+        subject=None,
+        issuer=None,
+        version=None,
+        notBefore=None,
+        notAfter="Jan 11 00:00:00 2024 GMT",
+        subjectAltName=None,
+        ocsp=None,
+        caIssuers=None,
+        crlDistributionPoints=None,
+    )
+    (expiration_msg,) = evaluate_expirations(
+        ["https://example.com"], [ssl_return], buffer_days=5, time_zone="UTC", now=NOW
+    )
+    assert (expiration_msg.expiration_days_away, expiration_msg.severity) == (10, Severity.INFO)
+    with pytest.raises(ValueError):
+        evaluate_expirations(["https://example.com"], [None], buffer_days=5, time_zone="UTC", now=NOW)
+
+
+def test_expiration_msg_status_message() -> None:
+    """Tests that messages built with a status message keep it and read the severity from its prefix."""
+    expiration_msg = ExpirationMsg(status_message="Warning: Custom text.", expiration_days_away=3)
+    assert expiration_msg.severity is Severity.WARNING
+    assert expiration_msg.status_message == "Warning: Custom text."
+    assert expiration_msg.message == "Custom text."
+    assert ExpirationMsg(status_message="Error: Expired.").severity is Severity.EXPIRED
@@ -0,0 +1,72 @@
+# Package/Modules
+import hashlib
+import os
+import ssl
+import pytest
+
+# Local Package/Modules
+from certmonitor.files.der import parse_certificate
+
+__author__ = "IncognitoCoding"
+__copyright__ = "Copyright 2023, test_der"
+__credits__ = ["IncognitoCoding"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "IncognitoCoding"
+__status__ = "Beta"
+
+# The test chain was generated with the openssl command line tool. The root and intermediate use GeneralizedTime
+# dates past 2049, and the leaf has DNS, wildcard, IPv4, and IPv6 names with OCSP, CA issuer, and CRL URLs.
+CERTIFICATE_DIRECTORY = os.path.join(os.path.dirname(__file__), "certificates")
+CERTIFICATE_NAMES = ("root", "intermediate", "leaf", "legacy")
+
+
+def _read_der(name: str) -> bytes:
+    """Reads a test certificate as DER."""
+    with open(os.path.join(CERTIFICATE_DIRECTORY, f"{name}.pem"), "r") as pem_file:
+        return ssl.PEM_cert_to_DER_cert(pem_file.read())
+
+
+@pytest.mark.parametrize("name", CERTIFICATE_NAMES)
+def test_matches_getpeercert(name: str) -> None:
+    """Tests that the parsed certificate equals the dictionary the ssl module decodes from the same certificate."""
+    der_certificate = _read_der(name)
+    certificate, not_after_epoch, fingerprint = parse_certificate(der_certificate)
+    assert certificate == ssl._ssl._test_decode_cert(os.path.join(CERTIFICATE_DIRECTORY, f"{name}.pem"))
+    assert not_after_epoch == ssl.cert_time_to_seconds(certificate["notAfter"])
+    assert fingerprint == hashlib.sha256(der_certificate).hexdigest()
+
+
+def test_offsets_and_buffers() -> None:
+    """Tests that a certificate is parsed from an offset inside a larger buffer and from a memoryview."""
+    der_certificate = _read_der("leaf")
+    expected = parse_certificate(der_certificate)
+    data = b"\x00" * 7 + der_certificate + _read_der("root")
+    assert parse_certificate(data, start=7, end=7 + len(der_certificate)) == expected
+    assert parse_certificate(memoryview(data), start=7) == expected
+    assert parse_certificate(bytearray(der_certificate)) == expected
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        b"",
+        b"\x30\x00",
+        b"\x02\x01\x00",
+        b"\x30\x82\x10\x00\x30",
+        b"\x30\x03\x02\x01\x00",
+    ],
+)
+def test_invalid_data(data: bytes) -> None:
+    """Tests that data that is not a certificate raises ValueError."""
+    with pytest.raises(ValueError):
+        parse_certificate(data)
+
+
+def test_truncated_certificate() -> None:
+    """Tests that a certificate cut short or bounded by a smaller end raises ValueError."""
+    der_certificate = _read_der("leaf")
+    with pytest.raises(ValueError):
+        parse_certificate(der_certificate[:-20])
+    with pytest.raises(ValueError):
+        parse_certificate(der_certificate + b"\x00" * 4, end=len(der_certificate) - 1)
@@ -0,0 +1,48 @@
+# Local Package/Modules
+from certmonitor.notify.digest import build_digest_messages
+
+__author__ = "IncognitoCoding"
+__copyright__ = "Copyright 2023, test_digest"
+__credits__ = ["IncognitoCoding"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "IncognitoCoding"
+__status__ = "Beta"
+
+
+def test_no_alerts() -> None:
+    """Tests that no digest email is built without alerts."""
+    assert build_digest_messages([], max_entries=10) == []
+
+
+def test_groups_by_subject() -> None:
+    """Tests that alerts are grouped by subject in the order the subjects were first seen."""
+    alerts = [
+        ("Certificate Expiring", "a.example.com expires in 5 days"),
+        ("Website Unreachable", "b.example.com timed out"),
+        ("Certificate Expiring", "c.example.com expires in 2 days"),
+    ]
+    assert build_digest_messages(alerts, max_entries=10) == [
+        (
+            "CertMonitor - 3 Certificate Alert(s)",
+            "Certificate Expiring (2)\n"
+            "  - a.example.com expires in 5 days\n"
+            "  - c.example.com expires in 2 days\n"
+            "\n"
+            "Website Unreachable (1)\n"
+            "  - b.example.com timed out",
+        )
+    ]
+
+
+def test_splits_into_parts() -> None:
+    """Tests that each digest email holds at most max_entries alerts and the group totals cover every part."""
+    alerts = [("Certificate Expiring", f"site-{index}") for index in range(5)] + [("Website Unreachable", "site-5")]
+    messages = build_digest_messages(alerts, max_entries=2)
+    assert [subject for subject, _ in messages] == [
+        "CertMonitor - 6 Certificate Alert(s) (Part 1 of 3)",
+        "CertMonitor - 6 Certificate Alert(s) (Part 2 of 3)",
+        "CertMonitor - 6 Certificate Alert(s) (Part 3 of 3)",
+    ]
+    assert messages[0][1] == "Certificate Expiring (5)\n  - site-0\n  - site-1"
+    assert messages[2][1] == "Certificate Expiring (5)\n  - site-4\n\nWebsite Unreachable (1)\n  - site-5"
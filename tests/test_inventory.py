@@ -0,0 +1,99 @@
+# Package/Modules
+import bz2
+import gzip
+import io
+import lzma
+import sys
+import pytest
+
+# Local Package/Modules
+from certmonitor.check.inventory import iter_chunks, iter_inventories, iter_inventory
+
+__author__ = "IncognitoCoding"
+__copyright__ = "Copyright 2023, test_inventory"
+__credits__ = ["IncognitoCoding"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "IncognitoCoding"
+__status__ = "Beta"
+
+_TEXT_INVENTORY = "\ufeffhttps://a.example.com\n\n# Comment\n  https://b.example.com  \r\nc.example.com:8443\n"
+
+
+def test_text_inventory(tmp_path) -> None:
+    """Tests that text files skip blank and comment lines and strip the byte order mark and whitespace."""
+    path = tmp_path / "sites.txt"
+    path.write_text(_TEXT_INVENTORY, encoding="utf-8")
+    assert list(iter_inventory(str(path), "site_url")) == [
+        "https://a.example.com",
+        "https://b.example.com",
+        "c.example.com:8443",
+    ]
+
+
+@pytest.mark.parametrize(
+    "extension, compress", [(".gz", gzip.compress), (".bz2", bz2.compress), (".xz", lzma.compress)]
+)
+def test_compressed_inventory(tmp_path, extension: str, compress) -> None:
+    """Tests that compressed files are decompressed while read."""
+    path = tmp_path / f"sites.TXT{extension.upper()}"
+    path.write_bytes(compress(_TEXT_INVENTORY.encode("utf-8")))
+    assert list(iter_inventory(str(path), "site_url")) == [
+        "https://a.example.com",
+        "https://b.example.com",
+        "c.example.com:8443",
+    ]
+
+
+def test_csv_inventory(tmp_path) -> None:
+    """Tests that CSV files read the header column and fall back to the first column without the header."""
+    path = tmp_path / "sites.csv"
+    path.write_text(
+        'owner,site_url\nweb,https://a.example.com\n"ops, team",https://b.example.com\nshort\n', encoding="utf-8"
+    )
+    assert list(iter_inventory(str(path), "site_url")) == ["https://a.example.com", "https://b.example.com"]
+
+    path.write_text(
+        "https://a.example.com,web\n#https://skipped.example.com,ops\nhttps://b.example.com,ops\n", encoding="utf-8"
+    )
+    assert list(iter_inventory(str(path), "site_url")) == ["https://a.example.com", "https://b.example.com"]
+
+    gzip_path = tmp_path / "sites.csv.gz"
+    gzip_path.write_bytes(gzip.compress(b"site_url\nhttps://c.example.com\n"))
+    assert list(iter_inventory(str(gzip_path), "site_url")) == ["https://c.example.com"]
+
+    path.write_text("", encoding="utf-8")
+    assert list(iter_inventory(str(path), "site_url")) == []
+
+
+def test_stdin_inventory(monkeypatch) -> None:
+    """Tests that "-" reads stdin and leaves it open for later reads."""
+    stdin = io.TextIOWrapper(io.BytesIO(b"https://a.example.com\nhttps://b.example.com\n"), encoding="utf-8")
+    monkeypatch.setattr(sys, "stdin", stdin)
+    assert list(iter_inventory("-", "site_url")) == ["https://a.example.com", "https://b.example.com"]
+    assert not stdin.buffer.closed
+
+    inventory = iter_inventory("-", "site_url")
+    next(inventory, None)
+    inventory.close()
+    assert not stdin.buffer.closed
+
+
+def test_iter_inventories_skips_unreadable_files(tmp_path, caplog) -> None:
+    """Tests that a missing or corrupt inventory is logged and the other files are still read."""
+    first_path = tmp_path / "first.txt"
+    first_path.write_text("https://a.example.com\n", encoding="utf-8")
+    corrupt_path = tmp_path / "corrupt.txt.gz"
+    corrupt_path.write_bytes(b"not gzip data")
+    last_path = tmp_path / "last.txt"
+    last_path.write_text("https://b.example.com\n", encoding="utf-8")
+    paths = [str(first_path), str(tmp_path / "missing.txt"), str(corrupt_path), str(last_path)]
+    assert list(iter_inventories(paths, "site_url")) == ["https://a.example.com", "https://b.example.com"]
+    assert "missing.txt' could not be read" in caplog.text
+    assert "corrupt.txt.gz' could not be read" in caplog.text
+
+
+def test_iter_chunks() -> None:
+    """Tests that the site URLs are split into lists of up to chunk_size entries."""
+    assert list(iter_chunks(iter(range(5)), 2)) == [[0, 1], [2, 3], [4]]  # type: ignore
+    assert list(iter_chunks([], 2)) == []
@@ -0,0 +1,163 @@
+# Package/Modules
+import asyncio
+import pytest
+
+# Local Package/Modules
+from certmonitor.check import politeness
+from certmonitor.check.politeness import PolitenessLimiter, get_network, get_registered_domain, split_limits
+
+# Local Dataclasses
+from certmonitor.dataclasses.common import ScanSettings
+
+__author__ = "IncognitoCoding"
+__copyright__ = "Copyright 2023, test_politeness"
+__credits__ = ["IncognitoCoding"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "IncognitoCoding"
+__status__ = "Beta"
+
+
+def _get_scan_settings(
+    ip_rate: float = 0,
+    ip_burst: int = 1,
+    network_rate: float = 0,
+    network_burst: int = 1,
+    domain_rate: float = 0,
+    domain_burst: int = 1,
+) -> ScanSettings:
+    """Builds scan settings with only the politeness limits set."""
+    return ScanSettings(
+        concurrency=100,
+        workers=1,
+        dns_timeout=5,
+        connect_timeout=5,
+        handshake_timeout=5,
+        read_timeout=5,
+        sweep_deadline=0,
+        probe_mode=False,
+        session_cache=False,
+        session_max_age=3600,
+        dns_cache_ttl=0,
+        ip_rate=ip_rate,
+        ip_burst=ip_burst,
+        network_rate=network_rate,
+        network_burst=network_burst,
+        domain_rate=domain_rate,
+        domain_burst=domain_burst,
+    )
+
+
+@pytest.mark.parametrize(
+    "host, expected",
+    [
+        ("www.example.com", "example.com"),
+        ("WWW.Example.COM.", "example.com"),
+        ("example.com", "example.com"),
+        ("a.b.example.co.uk", "example.co.uk"),
+        ("www.example.de", "example.de"),
+        ("localhost", "localhost"),
+        ("192.0.2.1", None),
+        ("2001:db8::1", None),
+    ],
+)
+def test_get_registered_domain_heuristic(monkeypatch, host: str, expected) -> None:
+    """Tests the registered domain heuristic used when publicsuffixlist is not installed."""
+    monkeypatch.setattr(politeness, "PublicSuffixList", None)
+    assert get_registered_domain(host) == expected
+
+
+@pytest.mark.skipif(politeness.PublicSuffixList is None, reason="publicsuffixlist is not installed")
+def test_get_registered_domain_public_suffix_list() -> None:
+    """Tests that hosts under shared public suffixes get their own registered domain."""
+    assert get_registered_domain("user.github.io") == "user.github.io"
+    assert get_registered_domain("www.example.co.uk") == "example.co.uk"
+    assert get_registered_domain("github.io") == "github.io"
+
+
+@pytest.mark.parametrize(
+    "ip, expected",
+    [
+        ("192.0.2.77", "192.0.2.0/24"),
+        ("2001:db8:1:2:3::4", "2001:db8:1:2::/64"),
+        ("fe80::1%eth0", "fe80::/64"),
+        ("not-an-ip", "not-an-ip"),
+    ],
+)
+def test_get_network(ip: str, expected: str) -> None:
+    """Tests that addresses are grouped by their IPv4 /24 or IPv6 /64 network."""
+    assert get_network(ip) == expected
+
+
+def test_split_limits() -> None:
+    """Tests that the rates and bursts are divided across the worker processes."""
+    scan_settings = _get_scan_settings(
+        ip_rate=8, ip_burst=4, network_rate=4, network_burst=1, domain_rate=2, domain_burst=6
+    )
+    assert split_limits(scan_settings, 1) is scan_settings
+    split_settings = split_limits(scan_settings, 4)
+    assert (split_settings.ip_rate, split_settings.ip_burst) == (2, 1)
+    assert (split_settings.network_rate, split_settings.network_burst) == (1, 1)
+    assert (split_settings.domain_rate, split_settings.domain_burst) == (0.5, 1)
+    assert split_settings.concurrency == scan_settings.concurrency
+
+
+def test_reserve_ip_bucket() -> None:
+    """Tests that the burst connects right away and later connections are spaced by the rate."""
+    limiter = PolitenessLimiter(_get_scan_settings(ip_rate=1, ip_burst=2))
+    assert limiter.reserve("192.0.2.1", "a.example.com", now=0) == (0, None)
+    assert limiter.reserve("192.0.2.1", "a.example.com", now=0) == (0, None)
+    assert limiter.reserve("192.0.2.1", "a.example.com", now=0) == (1, "ip")
+    assert limiter.reserve("192.0.2.1", "a.example.com", now=0) == (2, "ip")
+    # Other addresses have their own bucket.
+    assert limiter.reserve("192.0.2.2", "a.example.com", now=0) == (0, None)
+    # The bucket refills at the rate.
+    assert limiter.reserve("192.0.2.1", "a.example.com", now=10) == (0, None)
+
+
+def test_reserve_network_and_domain_buckets() -> None:
+    """Tests that addresses in one network and hosts in one domain share their bucket."""
+    limiter = PolitenessLimiter(_get_scan_settings(network_rate=2))
+    assert limiter.reserve("192.0.2.1", "a.example.com", now=0) == (0, None)
+    assert limiter.reserve("192.0.2.2", "b.example.net", now=0) == (0.5, "network")
+    assert limiter.reserve("198.51.100.1", "c.example.org", now=0) == (0, None)
+
+    limiter = PolitenessLimiter(_get_scan_settings(domain_rate=1))
+    assert limiter.reserve("192.0.2.1", "www.example.com", now=0) == (0, None)
+    assert limiter.reserve("198.51.100.1", "api.example.com", now=0) == (1, "domain")
+    # IP address hosts do not have a domain bucket.
+    assert limiter.reserve("192.0.2.1", "192.0.2.1", now=0) == (0, None)
+    assert limiter.reserve("192.0.2.1", "192.0.2.1", now=0) == (0, None)
+
+
+def test_reserve_deadline() -> None:
+    """Tests that no tokens are taken when the wait would pass the deadline."""
+    limiter = PolitenessLimiter(_get_scan_settings(ip_rate=1, domain_rate=10))
+    assert limiter.reserve("192.0.2.1", "example.com", now=0) == (0, None)
+    assert limiter.reserve("192.0.2.1", "example.com", now=0, deadline=0.5) == (None, "ip")
+    # The domain token was not taken by the connection that passed the deadline.
+    assert limiter.reserve("192.0.2.9", "example.com", now=0) == (pytest.approx(0.1), "domain")
+    assert limiter.reserve("192.0.2.1", "example.com", now=0, deadline=1) == (1, "ip")
+
+
+def test_disabled_limits() -> None:
+    """Tests that the limiter does not wait or keep buckets when every rate is 0."""
+    limiter = PolitenessLimiter(_get_scan_settings())
+    for _ in range(10):
+        assert asyncio.run(limiter.acquire("192.0.2.1", "example.com")) is True
+    assert limiter.reserve("192.0.2.1", "example.com", now=0) == (0, None)
+    assert limiter._full_times == {}
+
+
+def test_acquire_deadline() -> None:
+    """Tests that acquire returns False right away when the wait would pass the deadline."""
+    limiter = PolitenessLimiter(_get_scan_settings(ip_rate=0.001))
+
+    async def acquire_twice() -> tuple[bool, bool]:
+        deadline = asyncio.get_running_loop().time() + 1
+        return (
+            await limiter.acquire("192.0.2.1", "example.com", deadline),
+            await limiter.acquire("192.0.2.1", "example.com", deadline),
+        )
+
+    assert asyncio.run(acquire_twice()) == (True, False)
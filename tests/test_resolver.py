@@ -0,0 +1,149 @@
+# Package/Modules
+import asyncio
+import socket
+import threading
+import time
+import pytest
+
+# Local Package/Modules
+from certmonitor.check import resolver
+from certmonitor.check.resolver import RESOLVER_THREADS_MAX, resolve_hosts
+
+# Local Dataclasses
+from certmonitor.dataclasses.common import ScanSettings
+
+__author__ = "IncognitoCoding"
+__copyright__ = "Copyright 2023, test_resolver"
+__credits__ = ["IncognitoCoding"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "IncognitoCoding"
+__status__ = "Beta"
+
+
+def _get_scan_settings(dns_timeout: float, dns_cache_ttl: int = 0, concurrency: int = 1000) -> ScanSettings:
+    """Builds scan settings with only the resolver settings set."""
+    return ScanSettings(
+        concurrency=concurrency,
+        workers=1,
+        dns_timeout=dns_timeout,
+        connect_timeout=5,
+        handshake_timeout=5,
+        read_timeout=5,
+        sweep_deadline=0,
+        probe_mode=False,
+        session_cache=False,
+        session_max_age=3600,
+        dns_cache_ttl=dns_cache_ttl,
+        ip_rate=0,
+        ip_burst=1,
+        network_rate=0,
+        network_burst=1,
+        domain_rate=0,
+        domain_burst=1,
+    )
+
+
+def _get_answer(host: str) -> list:
+    """Builds the getaddrinfo() answer of a host."""
+    return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", (f"192.0.2.{len(host)}", 0))]
+
+
+@pytest.fixture(autouse=True)
+def clear_dns_cache():
+    """Clears the process DNS cache around each test."""
+    resolver._dns_cache.clear()
+    yield
+    resolver._dns_cache.clear()
+
+
+def test_queued_hosts_do_not_time_out(monkeypatch) -> None:
+    """Tests that the DNS timeout starts when a thread picks up the lookup, not when the host is queued."""
+    in_flight = 0
+    most_in_flight = 0
+    lock = threading.Lock()
+
+    def slow_getaddrinfo(host, *args) -> list:
+        nonlocal in_flight, most_in_flight
+        with lock:
+            in_flight += 1
+            most_in_flight = max(most_in_flight, in_flight)
+        time.sleep(0.2)
+        with lock:
+            in_flight -= 1
+        return _get_answer(host)
+
+    monkeypatch.setattr(socket, "getaddrinfo", slow_getaddrinfo)
+    # Three rounds of lookups take 0.6 seconds, which is longer than the timeout of any single lookup.
+    hosts = [f"host-{index}.example.com" for index in range(3 * RESOLVER_THREADS_MAX)]
+    resolutions = asyncio.run(resolve_hosts(hosts, _get_scan_settings(dns_timeout=0.4)))
+    assert resolutions == {host: _get_answer(host) for host in hosts}
+    assert most_in_flight == RESOLVER_THREADS_MAX
+
+
+def test_answers_are_cached(monkeypatch) -> None:
+    """Tests that answers are reused until the TTL runs out and duplicate hosts are resolved once."""
+    lookups: list[str] = []
+
+    def counting_getaddrinfo(host, *args) -> list:
+        lookups.append(host)
+        return _get_answer(host)
+
+    monkeypatch.setattr(socket, "getaddrinfo", counting_getaddrinfo)
+    scan_settings = _get_scan_settings(dns_timeout=5, dns_cache_ttl=60)
+    hosts = ["a.example.com", "b.example.com", "a.example.com"]
+    assert asyncio.run(resolve_hosts(hosts, scan_settings)) == {host: _get_answer(host) for host in hosts}
+    assert sorted(lookups) == ["a.example.com", "b.example.com"]
+    assert asyncio.run(resolve_hosts(hosts, scan_settings)) == {host: _get_answer(host) for host in hosts}
+    assert len(lookups) == 2
+
+    # Expired answers are dropped and resolved again.
+    resolver._dns_cache["a.example.com"] = (time.monotonic() - 1, _get_answer("a.example.com"))
+    asyncio.run(resolve_hosts(hosts, scan_settings))
+    assert sorted(lookups) == ["a.example.com", "a.example.com", "b.example.com"]
+
+
+def test_failures_and_disabled_cache_are_not_cached(monkeypatch) -> None:
+    """Tests that failed lookups are returned as the exception and every lookup repeats without a TTL."""
+    lookups: list[str] = []
+
+    def failing_getaddrinfo(host, *args) -> list:
+        lookups.append(host)
+        if host.startswith("missing"):
+            raise socket.gaierror(socket.EAI_NONAME, "Name or service not known")
+        return _get_answer(host)
+
+    monkeypatch.setattr(socket, "getaddrinfo", failing_getaddrinfo)
+    resolutions = asyncio.run(
+        resolve_hosts(["missing.example.com", "a.example.com"], _get_scan_settings(dns_timeout=5, dns_cache_ttl=60))
+    )
+    assert isinstance(resolutions["missing.example.com"], socket.gaierror)
+    assert resolutions["a.example.com"] == _get_answer("a.example.com")
+    assert list(resolver._dns_cache) == ["a.example.com"]
+
+    resolver._dns_cache.clear()
+    scan_settings = _get_scan_settings(dns_timeout=5)
+    asyncio.run(resolve_hosts(["a.example.com"], scan_settings))
+    asyncio.run(resolve_hosts(["a.example.com"], scan_settings))
+    assert lookups.count("a.example.com") == 3
+    assert resolver._dns_cache == {}
+
+
+def test_lookup_timeout(monkeypatch) -> None:
+    """Tests that a slow lookup times out without holding up the other hosts."""
+
+    def slow_getaddrinfo(host, *args) -> list:
+        if host.startswith("slow"):
+            time.sleep(0.5)
+        return _get_answer(host)
+
+    monkeypatch.setattr(socket, "getaddrinfo", slow_getaddrinfo)
+    start = time.monotonic()
+    resolutions = asyncio.run(
+        resolve_hosts(["slow.example.com", "a.example.com"], _get_scan_settings(dns_timeout=0.1, dns_cache_ttl=60))
+    )
+    assert time.monotonic() - start < 0.4
+    assert isinstance(resolutions["slow.example.com"], TimeoutError)
+    assert str(resolutions["slow.example.com"]) == "The DNS resolution timed out after 0.1 seconds."
+    assert resolutions["a.example.com"] == _get_answer("a.example.com")
+    assert "slow.example.com" not in resolver._dns_cache
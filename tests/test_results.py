@@ -0,0 +1,172 @@
+# Package/Modules
+import dataclasses
+from typing import Union
+
+# Local Package/Modules
+from certmonitor.store.results import (
+    ResultStore,
+    build_cached_results,
+    get_changed_certificate,
+    get_reusable_results,
+)
+
+# Local Dataclasses
+from certmonitor.dataclasses.common import ScanResult, Severity, SSLReturn, StoredResult
+
+__author__ = "IncognitoCoding"
+__copyright__ = "Copyright 2023, test_results"
+__credits__ = ["IncognitoCoding"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "IncognitoCoding"
+__status__ = "Beta"
+
+NOW = 1704067200.0
+DAY = 86400
+
+
+def _get_scan_result(site_url: str, not_after_epoch: Union[float, None] = NOW + 90 * DAY, **changes) -> ScanResult:
+    """Builds a checked scan result with a certificate."""
+    scan_result = ScanResult(
+        site_url=site_url,
+        expiration_msg=None,
+        error=None,
+        checked=True,
+        resolved=True,
+        reachable=True,
+        ssl_return=SSLReturn(
+            subject=((("commonName", "www.example.com"),),),
+            issuer=((("countryName", "US"),), (("commonName", "Example CA"),)),
+            version=3,
+            notBefore="Jan  1 00:00:00 2024 GMT",
+            notAfter="Mar 31 00:00:00 2024 GMT",
+            subjectAltName=(("DNS", "www.example.com"), ("IP Address", "192.0.2.10")),
+            ocsp=("http://ocsp.example.com",),
+            caIssuers=None,
+            crlDistributionPoints=None,
+        ),
+        fingerprint="ab" * 32,
+        not_after_epoch=not_after_epoch,
+        cached=False,
+        source="url",
+        chain_error=None,
+    )
+    return dataclasses.replace(scan_result, **changes)
+
+
+def test_save_and_get_many(tmp_path) -> None:
+    """Tests that the saved results read back with the getpeercert() tuples and survive a reopen."""
+    path = str(tmp_path / "nested" / "results.db")
+    scan_result = _get_scan_result("https://www.example.com")
+    with ResultStore(path) as result_store:
+        result_store.save_many([scan_result], checked_at=NOW)
+
+    with ResultStore(path) as result_store:
+        stored_results = result_store.get_many(["https://www.example.com", "https://missing.example.com"])
+    assert list(stored_results) == ["https://www.example.com"]
+    stored_result = stored_results["https://www.example.com"]
+    assert stored_result.ssl_return == scan_result.ssl_return
+    assert isinstance(stored_result.ssl_return.subject, tuple)
+    assert (stored_result.fingerprint, stored_result.not_after_epoch, stored_result.checked_at) == (
+        scan_result.fingerprint,
+        scan_result.not_after_epoch,
+        NOW,
+    )
+
+
+def test_save_many_skips_unusable_results(tmp_path) -> None:
+    """Tests that failed, cached, and untrusted chain results are not saved, and later results replace earlier ones."""
+    with ResultStore(str(tmp_path / "results.db")) as result_store:
+        result_store.save_many(
+            [
+                _get_scan_result("https://failed", error="refused", ssl_return=None, not_after_epoch=None),
+                _get_scan_result("https://cached", cached=True),
+                _get_scan_result("https://untrusted", chain_error="self-signed certificate"),
+                _get_scan_result("https://replaced", not_after_epoch=NOW),
+            ],
+            checked_at=NOW,
+        )
+        result_store.save_many([_get_scan_result("https://replaced", fingerprint="cd" * 32)], checked_at=NOW + 1)
+        stored_results = result_store.get_many(
+            ["https://failed", "https://cached", "https://untrusted", "https://replaced"]
+        )
+    assert list(stored_results) == ["https://replaced"]
+    assert stored_results["https://replaced"].fingerprint == "cd" * 32
+    assert stored_results["https://replaced"].checked_at == NOW + 1
+
+
+def test_get_many_chunks(tmp_path) -> None:
+    """Tests that lookups past the SQLite parameter chunk size return every stored result."""
+    site_urls = [f"https://{index}.example.com" for index in range(1200)]
+    with ResultStore(str(tmp_path / "results.db")) as result_store:
+        result_store.save_many([_get_scan_result(site_url) for site_url in site_urls], checked_at=NOW)
+        assert sorted(result_store.get_many(site_urls)) == sorted(site_urls)
+
+
+def test_get_reusable_results() -> None:
+    """Tests that only recent results far enough from expiration skip the network check."""
+    ssl_return = _get_scan_result("https://a").ssl_return
+
+    def stored(not_after_days: float, checked_hours_ago: float) -> StoredResult:
+        return StoredResult(
+            site_url="",
+            ssl_return=ssl_return,  # type: ignore
+            fingerprint=None,
+            not_after_epoch=NOW + not_after_days * DAY,
+            checked_at=NOW - checked_hours_ago * 3600,
+        )
+
+    stored_results = {
+        "https://fresh": stored(90, 1),
+        "https://old": stored(90, 30),
+        "https://in-margin": stored(40, 1),
+        "https://in-buffer": stored(20, 1),
+    }
+    reusable = get_reusable_results(stored_results, NOW, buffer_days=30, recheck_after=DAY, skip_margin_days=14)
+    assert list(reusable) == ["https://fresh"]
+
+
+def test_build_cached_results() -> None:
+    """Tests that stored results are evaluated without a connection and marked cached."""
+    stored_results = [
+        StoredResult(
+            site_url=site_url,
+            ssl_return=_get_scan_result(site_url).ssl_return,  # type: ignore
+            fingerprint="ab" * 32,
+            not_after_epoch=not_after_epoch,
+            checked_at=NOW,
+        )
+        for site_url, not_after_epoch in (("https://far.example.com:8443/", 4102444800.0), ("near.example.com", 0.0))
+    ]
+    cached_results = build_cached_results(stored_results, buffer_days=30, time_zone="UTC")
+    assert [scan_result.site_url for scan_result in cached_results] == [
+        "https://far.example.com:8443/",
+        "near.example.com",
+    ]
+    assert all(scan_result.cached and scan_result.reachable and not scan_result.error for scan_result in cached_results)
+    assert cached_results[0].expiration_msg.severity is Severity.INFO  # type: ignore
+    assert cached_results[0].expiration_msg.site_url == "far.example.com:8443"  # type: ignore
+    assert cached_results[1].expiration_msg.severity is Severity.EXPIRED  # type: ignore
+    assert cached_results[1].ssl_return == stored_results[1].ssl_return
+
+
+def test_get_changed_certificate() -> None:
+    """Tests that only a new, checked fingerprint that differs from the stored one is a change."""
+    stored_result = StoredResult(
+        site_url="https://a",
+        ssl_return=_get_scan_result("https://a").ssl_return,  # type: ignore
+        fingerprint="ab" * 32,
+        not_after_epoch=NOW,
+        checked_at=NOW,
+    )
+    assert get_changed_certificate(stored_result, _get_scan_result("https://a")) is None
+    assert get_changed_certificate(stored_result, _get_scan_result("https://a", fingerprint="cd" * 32)) == (
+        "ab" * 32,
+        "cd" * 32,
+    )
+    assert (
+        get_changed_certificate(stored_result, _get_scan_result("https://a", fingerprint="cd" * 32, cached=True))
+        is None
+    )
+    assert get_changed_certificate(stored_result, _get_scan_result("https://a", fingerprint=None)) is None
+    assert get_changed_certificate(None, _get_scan_result("https://a")) is None
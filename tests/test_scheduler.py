@@ -0,0 +1,93 @@
+# Package/Modules
+import pytest
+
+# Local Package/Modules
+from certmonitor.check.scheduler import SECONDS_IN_DAY, HostScheduler, get_check_interval
+
+__author__ = "IncognitoCoding"
+__copyright__ = "Copyright 2023, test_scheduler"
+__credits__ = ["IncognitoCoding"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "IncognitoCoding"
+__status__ = "Beta"
+
+
+@pytest.mark.parametrize(
+    "expiration_days_away, buffer_days, monitor_sleep, expected",
+    [
+        (None, 30, 7 * SECONDS_IN_DAY, SECONDS_IN_DAY),
+        (10, 30, 7 * SECONDS_IN_DAY, SECONDS_IN_DAY),
+        (30, 30, 7 * SECONDS_IN_DAY, SECONDS_IN_DAY),
+        (33, 30, 7 * SECONDS_IN_DAY, 3 * SECONDS_IN_DAY),
+        (31, 30, 7 * SECONDS_IN_DAY, SECONDS_IN_DAY),
+        (90, 30, 7 * SECONDS_IN_DAY, 7 * SECONDS_IN_DAY),
+        (None, 30, 3600, 3600),
+    ],
+)
+def test_get_check_interval(expiration_days_away, buffer_days: int, monitor_sleep: int, expected: int) -> None:
+    """Tests that failed and expiring sites are checked daily and healthy sites wake before the buffer days."""
+    assert get_check_interval(expiration_days_away, buffer_days, monitor_sleep) == expected
+
+
+def test_sync_and_pop_due() -> None:
+    """Tests that new site URLs are due now and removed site URLs are never returned."""
+    scheduler = HostScheduler()
+    added, removed = scheduler.sync(["a", "b", "c", "a"], now=100)
+    assert added == ["a", "b", "c"]
+    assert removed == []
+    assert len(scheduler) == 3
+
+    added, removed = scheduler.sync(["a", "c", "d"], now=200)
+    assert added == ["d"]
+    assert removed == ["b"]
+    assert "b" not in scheduler
+
+    assert scheduler.pop_due(now=150) == ["a", "c"]
+    assert scheduler.pop_due(now=250) == ["d"]
+    assert len(scheduler) == 0
+    assert scheduler.pop_due(now=1000) == []
+
+
+def test_schedule_replaces_earlier_time() -> None:
+    """Tests that rescheduling a site URL drops its earlier heap entry."""
+    scheduler = HostScheduler()
+    scheduler.schedule("a", 100)
+    scheduler.schedule("b", 150)
+    scheduler.schedule("a", 300)
+    assert scheduler.next_check_time() == 150
+    assert scheduler.pop_due(now=200) == ["b"]
+    assert scheduler.pop_due(now=299) == []
+    assert scheduler.pop_due(now=300) == ["a"]
+    assert scheduler.next_check_time() is None
+
+
+def test_heap_is_rebuilt() -> None:
+    """Tests that the heap does not keep growing when the same site URLs are rescheduled."""
+    scheduler = HostScheduler()
+    for check_time in range(1000):
+        scheduler.schedule(f"site-{check_time % 10}", check_time)
+    assert len(scheduler._heap) <= 2 * len(scheduler) + 64
+    assert scheduler.pop_due(now=989) == []
+    assert sorted(scheduler.pop_due(now=999)) == [f"site-{index}" for index in range(10)]
+
+
+def test_inventory_schedule() -> None:
+    """Tests that the inventory is due until it is scheduled and wakes the sleep at its own time."""
+    scheduler = HostScheduler()
+    assert scheduler.is_inventory_due(now=0)
+    assert scheduler.next_inventory_time() is None
+
+    scheduler.schedule_inventory(500)
+    assert not scheduler.is_inventory_due(now=499)
+    assert scheduler.is_inventory_due(now=500)
+    assert scheduler.next_check_time() == 500
+
+    scheduler.schedule("a", 400)
+    assert scheduler.next_check_time() == 400
+    scheduler.schedule("a", 600)
+    assert scheduler.next_check_time() == 500
+
+    scheduler.schedule_inventory(None)
+    assert scheduler.is_inventory_due(now=0)
+    assert scheduler.next_check_time() == 600
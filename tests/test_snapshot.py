@@ -0,0 +1,164 @@
+# Package/Modules
+import pickle
+from typing import Union
+
+# Local Package/Modules
+from certmonitor.store.snapshot import ResultSnapshot
+
+# Local Dataclasses
+from certmonitor.dataclasses.common import ExpirationMsg, ScanResult, Severity, SSLReturn
+
+__author__ = "IncognitoCoding"
+__copyright__ = "Copyright 2023, test_snapshot"
+__credits__ = ["IncognitoCoding"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "IncognitoCoding"
+__status__ = "Beta"
+
+_ISSUER = ((("countryName", "US"),), (("organizationName", "Example CA"),), (("commonName", "Example CA R1"),))
+
+
+def _get_ssl_return(host: str, not_after: str = "Jan  1 00:00:00 2030 GMT") -> SSLReturn:
+    """Builds the getpeercert() output of a certificate for a host."""
+    return SSLReturn(
+        subject=((("commonName", host),),),
+        issuer=_ISSUER,
+        version=3,
+        notBefore="Jan  1 00:00:00 2024 GMT",
+        notAfter=not_after,
+        subjectAltName=(("DNS", host),),
+        ocsp=("http://ocsp.example.com",),
+        caIssuers=("http://ca.example.com/r1.crt",),
+        crlDistributionPoints=None,
+    )
+
+
+def _get_scan_result(
+    site_url: str,
+    days: Union[int, None] = 90,
+    severity: Severity = Severity.INFO,
+    error: Union[str, None] = None,
+    source: str = "url",
+    not_after: str = "Jan  1 00:00:00 2030 GMT",
+) -> ScanResult:
+    """Builds a scan result. A days value of None builds a failed check."""
+    checked = days is not None
+    return ScanResult(
+        site_url=site_url,
+        expiration_msg=(
+            ExpirationMsg(site_url=site_url, severity=severity, expiration_days_away=days) if checked else None
+        ),
+        error=error,
+        checked=checked,
+        resolved=True,
+        reachable=checked,
+        ssl_return=_get_ssl_return(site_url, not_after) if checked else None,
+        fingerprint=("ab" * 32) if checked else None,
+        not_after_epoch=1000.0 + days if checked else None,  # type: ignore
+        cached=False,
+        source=source,
+        chain_error=None,
+    )
+
+
+def test_round_trip() -> None:
+    """Tests that the scan results read back equal to the results added."""
+    snapshot = ResultSnapshot()
+    scan_results = [
+        _get_scan_result("https://a.example.com"),
+        _get_scan_result("https://b.example.com", days=5, severity=Severity.WARNING),
+        _get_scan_result("https://c.example.com", days=None, error="Connection refused"),
+    ]
+    snapshot.add_many(scan_results)
+    assert len(snapshot) == 3
+    assert "https://b.example.com" in snapshot
+    assert list(snapshot) == [scan_result.site_url for scan_result in scan_results]
+    for scan_result in scan_results:
+        stored = snapshot.get(scan_result.site_url)
+        assert stored is not None
+        assert stored.ssl_return == scan_result.ssl_return
+        assert (stored.error, stored.checked, stored.reachable) == (
+            scan_result.error,
+            scan_result.checked,
+            scan_result.reachable,
+        )
+        assert (stored.fingerprint, stored.not_after_epoch) == (scan_result.fingerprint, scan_result.not_after_epoch)
+        if scan_result.expiration_msg:
+            assert stored.expiration_msg.status_message == scan_result.expiration_msg.status_message  # type: ignore
+        else:
+            assert stored.expiration_msg is None
+    assert snapshot.get("https://missing.example.com") is None
+    assert snapshot.get_ssl_return("https://c.example.com") is None
+
+
+def test_shared_values_are_interned() -> None:
+    """Tests that the values certificates share are held once in the pool."""
+    snapshot = ResultSnapshot()
+    for index in range(100):
+        snapshot.add(_get_scan_result(f"https://{index}.example.com"))
+    # Each site has its own subject and subject alternative name. The issuer, dates, URLs, and source are shared.
+    assert snapshot.interned_count == 2 * 100 + 7
+    first = snapshot.get_ssl_return("https://0.example.com")
+    second = snapshot.get_ssl_return("https://1.example.com")
+    assert first.issuer is second.issuer  # type: ignore
+
+
+def test_replace_keeps_pool_bounded() -> None:
+    """Tests that the values of replaced results are dropped from the pool."""
+    snapshot = ResultSnapshot()
+    for index in range(20000):
+        snapshot.add(_get_scan_result(f"https://{index % 10}.example.com", not_after=f"Jan  1 00:00:{index} 2030 GMT"))
+    assert len(snapshot) == 10
+    assert snapshot.interned_count <= 1024
+    assert snapshot.get_ssl_return("https://9.example.com").notAfter == "Jan  1 00:00:19999 2030 GMT"  # type: ignore
+
+
+def test_remove_many_and_compact() -> None:
+    """Tests that removed rows are dropped and the remaining rows keep their results after a compaction."""
+    snapshot = ResultSnapshot()
+    snapshot.add_many(_get_scan_result(f"https://{index}.example.com", days=index) for index in range(10))
+    snapshot.remove_many(f"https://{index}.example.com" for index in range(8))
+    assert list(snapshot) == ["https://8.example.com", "https://9.example.com"]
+    assert snapshot.interned_count == 2 * 2 + 7
+    assert snapshot.get("https://9.example.com").expiration_msg.expiration_days_away == 9  # type: ignore
+    snapshot.add(_get_scan_result("https://0.example.com", days=1))
+    assert snapshot.get("https://0.example.com").expiration_msg.expiration_days_away == 1  # type: ignore
+
+
+def test_remove_stale() -> None:
+    """Tests that unconfigured site URLs and rows not added in the sweep are removed."""
+    snapshot = ResultSnapshot()
+    snapshot.start_sweep()
+    snapshot.add(_get_scan_result("https://kept.example.com"))
+    snapshot.add(_get_scan_result("https://unlisted.example.com"))
+    snapshot.add(_get_scan_result("https://inventory.example.com", source="inventory"))
+    snapshot.add(_get_scan_result("/certs/old.pem", source="file"))
+
+    snapshot.start_sweep()
+    snapshot.add(_get_scan_result("/certs/new.pem", source="file"))
+    snapshot.remove_stale(["https://kept.example.com"], inventory_swept=False)
+    assert list(snapshot) == ["https://kept.example.com", "https://inventory.example.com", "/certs/new.pem"]
+
+    snapshot.remove_stale(["https://kept.example.com"])
+    assert list(snapshot) == ["https://kept.example.com", "/certs/new.pem"]
+
+
+def test_count_by_severity_and_get_expiring() -> None:
+    """Tests the severity counts and the expiration order of the results with a certificate."""
+    snapshot = ResultSnapshot()
+    snapshot.add(_get_scan_result("https://a.example.com", days=90))
+    snapshot.add(_get_scan_result("https://b.example.com", days=5, severity=Severity.WARNING))
+    snapshot.add(_get_scan_result("https://c.example.com", days=-2, severity=Severity.EXPIRED))
+    snapshot.add(_get_scan_result("https://d.example.com", days=None, error="Timed out"))
+    assert snapshot.count_by_severity() == {"info": 1, "warning": 1, "expired": 1, "none": 1}
+    assert snapshot.get_expiring(1010) == ["https://c.example.com", "https://b.example.com"]
+    assert snapshot.get_expiring(0) == []
+
+
+def test_read_back_results_pickle() -> None:
+    """Tests that the results read back can be sent to other processes."""
+    snapshot = ResultSnapshot()
+    snapshot.add(_get_scan_result("https://a.example.com", days=5, severity=Severity.WARNING))
+    stored = snapshot.get("https://a.example.com")
+    assert pickle.loads(pickle.dumps(stored)).expiration_msg.severity is Severity.WARNING
@@ -0,0 +1,57 @@
+# Package/Modules
+import pytest
+
+# Local Package/Modules
+from certmonitor.notify.state import AlertState
+
+# Local Exceptions
+from certmonitor.exceptions.exceptions import CertMonitorError
+
+__author__ = "IncognitoCoding"
+__copyright__ = "Copyright 2023, test_state"
+__credits__ = ["IncognitoCoding"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "IncognitoCoding"
+__status__ = "Beta"
+
+
+def test_should_send(tmp_path) -> None:
+    """Tests that an alert is sent again only when the severity changes or the re-notify interval passes."""
+    with AlertState(str(tmp_path / "alerts.db"), renotify_interval=3600) as alert_state:
+        assert alert_state.should_send("https://a", "warning", now=0)
+        alert_state.record_many([("https://a", "warning", 0)])
+        assert not alert_state.should_send("https://a", "warning", now=3599)
+        assert alert_state.should_send("https://a", "warning", now=3600)
+        assert alert_state.should_send("https://a", "expired", now=1)
+
+    with AlertState(str(tmp_path / "no-renotify.db"), renotify_interval=0) as alert_state:
+        alert_state.record_many([("https://a", "warning", 0)])
+        assert not alert_state.should_send("https://a", "warning", now=10**9)
+
+
+def test_state_survives_restart(tmp_path) -> None:
+    """Tests that sent alerts are remembered across restarts and cleared site URLs alert again."""
+    path = str(tmp_path / "nested" / "alerts.db")
+    with AlertState(path, renotify_interval=0) as alert_state:
+        alert_state.record_many([("https://a", "warning", 0), ("https://b", "expired", 0), ("https://c", "error", 0)])
+        alert_state.clear_many(["https://c", "https://never-sent"])
+
+    with AlertState(path, renotify_interval=0) as alert_state:
+        assert not alert_state.should_send("https://a", "warning", now=1)
+        assert not alert_state.should_send("https://b", "expired", now=1)
+        assert alert_state.should_send("https://c", "error", now=1)
+
+
+def test_get_unlisted(tmp_path) -> None:
+    """Tests that only alerted site URLs missing from the listed site URLs are returned."""
+    with AlertState(str(tmp_path / "alerts.db"), renotify_interval=0) as alert_state:
+        alert_state.record_many([("https://a", "warning", 0), ("https://b", "expired", 0)])
+        assert alert_state.get_unlisted(iter(["https://a", "https://other"])) == {"https://b"}
+        assert alert_state.get_unlisted([]) == {"https://a", "https://b"}
+
+
+def test_invalid_state_path(tmp_path) -> None:
+    """Tests that a state path that cannot be opened raises CertMonitorError."""
+    with pytest.raises(CertMonitorError):
+        AlertState(str(tmp_path), renotify_interval=0)
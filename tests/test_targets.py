@@ -0,0 +1,112 @@
+# Package/Modules
+import pytest
+
+# Local Package/Modules
+from certmonitor.check.targets import canonicalize_targets, expand_results, parse_target
+
+# Local Dataclasses
+from certmonitor.dataclasses.common import ScanResult, ScanTarget
+
+# Local Exceptions
+from certmonitor.exceptions.exceptions import CertMonitorError
+
+__author__ = "IncognitoCoding"
+__copyright__ = "Copyright 2023, test_targets"
+__credits__ = ["IncognitoCoding"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "IncognitoCoding"
+__status__ = "Beta"
+
+
+@pytest.mark.parametrize(
+    "site_url, expected",
+    [
+        ("example.com", ScanTarget(host="example.com", port=443, server_name="example.com")),
+        ("example.com:8443", ScanTarget(host="example.com", port=8443, server_name="example.com")),
+        (
+            "https://WWW.Example.COM./path?x=1#top",
+            ScanTarget(host="www.example.com", port=443, server_name="www.example.com"),
+        ),
+        ("https://user@example.com:443/", ScanTarget(host="example.com", port=443, server_name="example.com")),
+        (
+            "https://10.0.0.5:8443/?sni=www.example.com",
+            ScanTarget(host="10.0.0.5", port=8443, server_name="www.example.com"),
+        ),
+        ("https://[::0001]/", ScanTarget(host="::1", port=443, server_name="::1")),
+        (
+            "https://bücher.example/",
+            ScanTarget(host="xn--bcher-kva.example", port=443, server_name="xn--bcher-kva.example"),
+        ),
+    ],
+)
+def test_parse_target(site_url: str, expected: ScanTarget) -> None:
+    """Tests that site URLs written in different ways parse into the canonical target."""
+    assert parse_target(site_url) == expected
+
+
+@pytest.mark.parametrize(
+    "site_url",
+    [
+        "http://example.com",
+        "https://example.com:0/",
+        "https://example.com:70000/",
+        "https://example.com:abc/",
+        "https://:443/",
+    ],
+)
+def test_parse_target_invalid(site_url: str) -> None:
+    """Tests that unsupported schemes, bad ports, and missing hosts raise CertMonitorError."""
+    with pytest.raises(CertMonitorError):
+        parse_target(site_url)
+
+
+def test_canonicalize_targets() -> None:
+    """Tests that duplicate site URLs share one target in first seen order."""
+    site_urls = [
+        "https://example.com",
+        "example.com:443",
+        "https://EXAMPLE.com/other",
+        "https://example.com:8443",
+        "https://example.com/?sni=www.example.com",
+    ]
+    targets, target_indexes = canonicalize_targets(site_urls)
+    assert targets == [
+        ScanTarget(host="example.com", port=443, server_name="example.com"),
+        ScanTarget(host="example.com", port=8443, server_name="example.com"),
+        ScanTarget(host="example.com", port=443, server_name="www.example.com"),
+    ]
+    assert target_indexes == [0, 0, 0, 1, 2]
+
+
+def test_canonicalize_targets_invalid() -> None:
+    """Tests that one invalid site URL raises CertMonitorError."""
+    with pytest.raises(CertMonitorError):
+        canonicalize_targets(["https://example.com", "ftp://example.com"])
+
+
+def test_expand_results() -> None:
+    """Tests that each site URL gets a copy of its target result with its own site URL."""
+    site_urls = ["https://example.com", "example.com", "https://example.com:8443"]
+    _, target_indexes = canonicalize_targets(site_urls)
+    scan_results = [
+        ScanResult(
+            site_url=f"target-{index}",
+            expiration_msg=None,
+            error=None,
+            checked=True,
+            resolved=True,
+            reachable=True,
+            ssl_return=None,
+            fingerprint=None,
+            not_after_epoch=float(index),
+            cached=False,
+            source="url",
+            chain_error=None,
+        )
+        for index in range(2)
+    ]
+    expanded = expand_results(site_urls, target_indexes, scan_results)
+    assert [scan_result.site_url for scan_result in expanded] == site_urls
+    assert [scan_result.not_after_epoch for scan_result in expanded] == [0.0, 0.0, 1.0]
+    assert scan_results[0].site_url == "target-0"
@@ -0,0 +1,129 @@
+# Package/Modules
+import os
+import ssl
+import pytest
+
+# Local Package/Modules
+from certmonitor.check import verify
+from certmonitor.check.verify import _match_host, _verify_names, verify_chain
+from certmonitor.files.der import parse_certificate
+
+__author__ = "IncognitoCoding"
+__copyright__ = "Copyright 2023, test_verify"
+__credits__ = ["IncognitoCoding"]
+__license__ = "MIT"
+__version__ = "0.1"
+__maintainer__ = "IncognitoCoding"
+__status__ = "Beta"
+
+CERTIFICATE_DIRECTORY = os.path.join(os.path.dirname(__file__), "certificates")
+
+
+def _read_der(name: str) -> bytes:
+    """Reads a test certificate as DER."""
+    with open(os.path.join(CERTIFICATE_DIRECTORY, f"{name}.pem"), "r") as pem_file:
+        return ssl.PEM_cert_to_DER_cert(pem_file.read())
+
+
+ROOT = parse_certificate(_read_der("root"))
+INTERMEDIATE = parse_certificate(_read_der("intermediate"))
+LEAF = parse_certificate(_read_der("leaf"))
+LEGACY = parse_certificate(_read_der("legacy"))
+# A time inside the validity period of every test certificate.
+NOW = ssl.cert_time_to_seconds(LEAF[0]["notBefore"]) + 86400
+
+
+@pytest.fixture
+def trust_root(monkeypatch) -> None:
+    """Replaces the trust store with the test root."""
+    monkeypatch.setattr(verify, "_trusted_certificates", {ROOT[2]: ROOT})
+    monkeypatch.setattr(verify, "_trusted_subjects", {ROOT[0]["subject"]})
+    monkeypatch.setattr(verify, "_signature_store", None)
+
+
+@pytest.fixture
+def trust_nothing(monkeypatch) -> None:
+    """Replaces the trust store with an empty one."""
+    monkeypatch.setattr(verify, "_trusted_certificates", {})
+    monkeypatch.setattr(verify, "_trusted_subjects", set())
+    monkeypatch.setattr(verify, "_signature_store", None)
+
+
+@pytest.mark.parametrize(
+    "host, expected",
+    [
+        ("www.example.com", True),
+        ("WWW.EXAMPLE.COM.", True),
+        ("example.com", False),
+        ("api.www.example.com", False),
+        ("api.example.net", True),
+        ("example.net", False),
+        ("a.b.example.net", False),
+        ("192.0.2.10", True),
+        ("192.0.2.11", False),
+        ("2001:db8::1", True),
+        ("2001:0db8:0:0::1", True),
+        ("2001:db8::2", False),
+    ],
+)
+def test_match_host(host: str, expected: bool) -> None:
+    """Tests the DNS, wildcard, and IP address matching against the subject alternative names."""
+    assert _match_host(LEAF[0], host) is expected
+
+
+def test_match_host_common_name() -> None:
+    """Tests that the common name is only used when the certificate has no DNS names."""
+    assert _match_host(LEGACY[0], "legacy.example.com")
+    assert not _match_host(LEGACY[0], "other.example.com")
+    # Only DNS names replace the common name, as in OpenSSL, so an IP address name keeps the common name.
+    leaf_without_dns = dict(LEAF[0], subjectAltName=(("IP Address", "192.0.2.10"),))
+    assert _match_host(leaf_without_dns, "www.example.com")
+
+
+@pytest.mark.usefixtures("trust_root")
+@pytest.mark.parametrize(
+    "chain",
+    [
+        (INTERMEDIATE,),
+        (INTERMEDIATE, ROOT),
+        (ROOT, LEGACY, INTERMEDIATE),
+    ],
+)
+def test_verify_names_trusted(chain: tuple) -> None:
+    """Tests that the issuer walk finds the trusted root in any order and ignores extra certificates."""
+    assert _verify_names("www.example.com", LEAF, chain, NOW) is None
+    assert _verify_names("legacy.example.com", LEGACY, chain, NOW) is None
+
+
+@pytest.mark.usefixtures("trust_root")
+def test_verify_names_failures() -> None:
+    """Tests the OpenSSL reasons for host mismatches, missing intermediates, and certificate dates."""
+    assert _verify_names("example.org", LEAF, (INTERMEDIATE,), NOW) == (
+        "Hostname mismatch, certificate is not valid for 'example.org'."
+    )
+    assert _verify_names("www.example.com", LEAF, (), NOW) == "unable to get local issuer certificate"
+    assert _verify_names("www.example.com", LEAF, (LEGACY,), NOW) == "unable to get local issuer certificate"
+    assert _verify_names("www.example.com", LEAF, (INTERMEDIATE,), LEAF[1] + 1) == "certificate has expired"
+    assert _verify_names("www.example.com", LEAF, (INTERMEDIATE,), NOW - 2 * 86400) == "certificate is not yet valid"
+
+
+@pytest.mark.usefixtures("trust_nothing")
+def test_verify_names_untrusted_root() -> None:
+    """Tests that a chain that ends at an untrusted root is reported as self-signed."""
+    assert _verify_names("www.example.com", LEAF, (INTERMEDIATE, ROOT), NOW) == (
+        "self-signed certificate in certificate chain"
+    )
+    assert _verify_names("www.example.com", LEAF, (INTERMEDIATE,), NOW) == "unable to get local issuer certificate"
+
+
+@pytest.mark.usefixtures("trust_root")
+def test_verify_chain() -> None:
+    """Tests the presented DER chain verification used by the handshake-only probes."""
+    der_chain = [_read_der("leaf"), _read_der("intermediate")]
+    assert verify_chain("www.example.com", der_chain, NOW) is None
+    assert verify_chain("www.example.com", der_chain, NOW, leaf=LEAF, chain=(INTERMEDIATE,)) is None
+    assert verify_chain("www.example.com", der_chain[:1], NOW) == "unable to get local issuer certificate"
+    assert verify_chain("www.example.com", [], NOW) == "The site did not present a certificate."
+    assert verify_chain("www.example.com", [b"\x30\x00"], NOW).startswith(  # type: ignore
+        "The presented certificate could not be read."
+    )